@@ -1,12 +1,13 @@
 from decimal import Decimal
 from typing import List
 
+from bson import ObjectId
+
 from app.crud.asset_crud import AssetCRUD
 from app.crud.asset_type_crud import AssetTypeCRUD
-from app.crud.currency_crud import CurrencyCRUD
 from app.crud.currency_exchange_crud import CurrencyExchangeCRUD
 from app.crud.user_app_data_crud import UserAppDataCRUD
-from models.models import Asset, Currency, User
+from models.models import Asset, User
 from models.schemas import AssetCreateSchema, AssetFilterSchema, AssetUpdateSchema
 
 
@@ -26,8 +27,8 @@ class AssetController:
 
     @classmethod
     async def get_all_assets(cls, user_id: str) -> List[dict]:
-        assets: List[Asset] = await AssetCRUD.get_all_by_user_id(user_id)
-        return [asset.to_dict() for asset in assets]
+        assets = await AssetCRUD.get_all_raw_by_user_id(user_id)
+        return [Asset.son_to_dict(asset) for asset in assets]
 
     @classmethod
     async def update_asset(
@@ -46,22 +47,28 @@ class AssetController:
 
     @classmethod
     async def calculate_total_asset_value(cls, user: User) -> Decimal:
-        all_user_assets = await AssetCRUD.get_all_by_user_id(user.id)
-        base_currency = await cls._get_base_currency(user.id)
-        total_value = Decimal(0)
-        for asset in all_user_assets:
-            total_value += await cls._calculate_asset_value(
-                asset, base_currency, user.id
-            )
+        base_currency_id = await UserAppDataCRUD.get_base_currency_id_by_user_id(
+            user.id
+        )
+        total_value = await cls.get_total_asset_value(user.id, base_currency_id)
         await cls._update_user_app_data_assets_value(user.id, total_value)
         return total_value
 
+    @classmethod
+    async def get_total_asset_value(
+        cls, user_id: str, base_currency_id: ObjectId
+    ) -> Decimal:
+        totals_by_currency = await AssetCRUD.get_value_totals_by_currency(user_id)
+        return await CurrencyExchangeCRUD.convert_totals_to_base_currency(
+            totals_by_currency, base_currency_id, user_id
+        )
+
     @classmethod
     async def filter_assets(
         cls, filters: AssetFilterSchema, user_id: str
     ) -> List[dict]:
-        assets = await AssetCRUD.get_filtered_assets(filters, user_id)
-        return [asset.to_dict() for asset in assets]
+        assets = await AssetCRUD.get_filtered_raw_assets(filters, user_id)
+        return [Asset.son_to_dict(asset) for asset in assets]
 
     @classmethod
     async def calculate_asset_value_difference_in_update(
@@ -76,7 +83,9 @@ class AssetController:
         cls, asset_schema: AssetCreateSchema, user_id: str
     ) -> None:
         if asset_schema.asset_type_id:
-            await AssetTypeCRUD.get_one_by_user(asset_schema.asset_type_id, user_id)
+            await AssetTypeCRUD.get_one_by_user_cached(
+                asset_schema.asset_type_id, user_id
+            )
 
     @classmethod
     def _create_asset_obj_to_create(
@@ -106,24 +115,3 @@ class AssetController:
         user_app_data = await UserAppDataCRUD.get_one_by_user_id(user_id)
         user_app_data.assets_value = total_value
         await UserAppDataCRUD.update_one_by_id(user_app_data.id, user_app_data)
-
-    @classmethod
-    async def _get_base_currency(cls, user_id: str) -> Currency:
-        user_app_data = await UserAppDataCRUD.get_one_by_user_id(user_id)
-        base_currency_id = user_app_data.base_currency_id.pk
-        base_currency = await CurrencyCRUD.get_one_by_user(base_currency_id, user_id)
-        return base_currency
-
-    @classmethod
-    async def _calculate_asset_value(
-        cls, asset: Asset, base_currency: Currency, user_id: str
-    ) -> Decimal:
-        if asset.currency_id.id == base_currency.id:
-            return asset.value
-        else:
-            return await CurrencyExchangeCRUD.convert_value_to_base_currency(
-                asset.value,
-                asset.currency_id,
-                base_currency.id,
-                user_id,
-            )
\ No newline at end of file
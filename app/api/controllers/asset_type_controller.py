@@ -22,8 +22,8 @@ class AssetTypeController:
 
     @classmethod
     async def get_all_asset_types(cls, user_id: str) -> List[Dict]:
-        asset_types: List[AssetType] = await AssetTypeCRUD.get_all_by_user_id(user_id)
-        return [asset_type.to_dict() for asset_type in asset_types]
+        asset_types = await AssetTypeCRUD.get_all_raw_by_user_id(user_id)
+        return [AssetType.son_to_dict(asset_type) for asset_type in asset_types]
 
     @classmethod
     async def update_asset_type(
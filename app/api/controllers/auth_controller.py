@@ -9,11 +9,17 @@ from dotenv import load_dotenv
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
-from passlib.context import CryptContext
-from zxcvbn import zxcvbn
 
 from app.crud.user_app_data_crud import UserAppDataCRUD
+from app.crud.user_cache import UserCache
 from app.crud.user_crud import UserCRUD
+from commons.password_executor import (
+    check_password_strength,
+    hash_password,
+    password_executor,
+    verify_password,
+)
+from database.async_database import TransactionContext, run_in_transaction
 from models.enums import RoleEnum
 from models.models import User, UserAppData
 from models.schemas import UserSchema
@@ -30,7 +36,6 @@ APP_NAME = os.getenv("APP_NAME") or "FastAPI"
 class AuthController:
 
     user_crud = UserCRUD()
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
     @classmethod
     async def login_user(cls, username: str, password: str) -> str:
@@ -41,18 +46,17 @@ class AuthController:
                 detail="Incorrect username or password",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = cls.create_access_token(
-            data={"sub": user.username}, expires_delta=access_token_expires
-        )
-        return access_token
+        return cls.__issue_access_token(user)
 
     @classmethod
     async def register_user(cls, user_schema: UserSchema) -> str:
         await cls.__check_password_strength(user_schema.password, user_schema.username)
-        hashed_password = cls.pwd_context.hash(user_schema.password)
-        await cls.__create_user_model_atomic(user_schema, hashed_password)
-        return await cls.login_user(user_schema.username, user_schema.password)
+        hashed_password = await password_executor.run(
+            hash_password, user_schema.password
+        )
+        user = await cls.__create_user_model_atomic(user_schema, hashed_password)
+        # The password was just hashed, so the token is issued without a login
+        return cls.__issue_access_token(user)
 
     @classmethod
     async def update_user_credentials(
@@ -61,28 +65,35 @@ class AuthController:
         updated_fields = update_data
         if "password" in updated_fields:
             await cls.__check_password_strength(updated_fields["password"], current_user.username)
-            updated_fields["hashed_password"] = cls.pwd_context.hash(
-                updated_fields.pop("password")
+            updated_fields["hashed_password"] = await password_executor.run(
+                hash_password, updated_fields.pop("password")
             )
         try:
             return await cls.user_crud.update_one(current_user.username, updated_fields)
         except Exception as e:
             raise e
+        finally:
+            UserCache.invalidate(current_user.username)
 
     @classmethod
     async def delete_user(cls, current_user: User) -> None:
-        await cls.user_crud.delete_one(current_user.username)
+        try:
+            await cls.user_crud.delete_one(current_user.username)
+        finally:
+            UserCache.invalidate(current_user.username)
 
     @classmethod
     async def authenticate_user(cls, username: str, password: str) -> Optional[User]:
         user = await cls.user_crud.get_one_by_username_optional(username)
-        if not user or not cls.verify_password(password, user.hashed_password):
+        if not user or not await cls.verify_password(password, user.hashed_password):
             return None
         return user
 
     @classmethod
-    def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
-        return cls.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
+        return await password_executor.run(
+            verify_password, plain_password, hashed_password
+        )
 
     @classmethod
     def create_access_token(
@@ -104,32 +115,43 @@ class AuthController:
         encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
         return encoded_jwt
 
+    @classmethod
+    def __issue_access_token(cls, user: User) -> str:
+        access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+        return cls.create_access_token(
+            data={"sub": user.username}, expires_delta=access_token_expires
+        )
+
     @classmethod
     async def __create_user_model_atomic(
         cls, user_schema: UserSchema, hashed_password: str
-    ) -> None:
+    ) -> User:
         user_model = User(
             username=user_schema.username,
             hashed_password=hashed_password,
             email=user_schema.email,
             role=RoleEnum.USER.value,
         )
-        user_in_db = await cls.user_crud.create_one(user_model)
-        try:
+
+        async def create(context: TransactionContext) -> User:
+            user_in_db = await cls.user_crud.create_one(user_model, context.session)
+            context.on_rollback(UserCRUD.delete_one, user_in_db.username)
             user_app_data = UserAppData(
                 user_id=user_in_db, base_currency_id=user_schema.base_currency_id
             )
-            await UserAppDataCRUD.create_one(user_app_data)
-        except Exception as e:
-            await UserCRUD.delete_one(user_in_db)
-            raise e
+            await UserAppDataCRUD.create_one(user_app_data, context.session)
+            return user_in_db
+
+        return await run_in_transaction(create)
 
     @classmethod
     async def __check_password_strength(cls, password: str, username: str) -> None:
         password_policy = await cls.__check_password_policy(password)
         if not password_policy["status"]:
             raise HTTPException(status_code=400, detail=password_policy["message"])
-        result = zxcvbn(password, user_inputs=[username])
+        result = await password_executor.run(
+            check_password_strength, password, [username]
+        )
         if result["score"] < MINIMUM_PASSWORD_STRENGTH:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -179,7 +201,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
             raise credentials_exception
     except InvalidTokenError:
         raise credentials_exception
-    user = await AuthController.user_crud.get_one_by_username_optional(username)
+    user = await UserCache.get_user(username)
     if user is None:
         raise credentials_exception
     return user
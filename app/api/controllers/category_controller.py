@@ -22,8 +22,8 @@ class CategoryController:
 
     @classmethod
     async def get_all_categories(cls, user_id: str) -> List[Dict]:
-        categories: List[Category] = await CategoryCRUD.get_all_by_user_id(user_id)
-        return [category.to_dict() for category in categories]
+        categories = await CategoryCRUD.get_all_raw_by_user_id(user_id)
+        return [Category.son_to_dict(category) for category in categories]
 
     @classmethod
     async def update_category(
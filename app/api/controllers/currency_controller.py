@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from mongoengine import ValidationError
 
@@ -24,8 +24,8 @@ class CurrencyController:
 
     @classmethod
     async def get_all_currencies(cls, user_id: str) -> List[Dict]:
-        currencies: List[Currency] = await CurrencyCRUD.get_all_by_user_id(user_id)
-        return [currency.to_dict() for currency in currencies]
+        currencies = await CurrencyCRUD.get_all_raw_by_user_id(user_id)
+        return [Currency.son_to_dict(currency) for currency in currencies]
 
     @classmethod
     async def update_currency(
@@ -49,9 +49,10 @@ class CurrencyController:
         return True
 
     @classmethod
-    async def get_predefined_currencies(cls) -> List[Dict]:
-        predefined_currencies: List[Currency] = await CurrencyCRUD.get_all_predefined()
-        return [currency.to_dict() for currency in predefined_currencies]
+    async def get_predefined_currencies(cls) -> Tuple[List[Dict], str]:
+        """Returns the predefined currencies and the ETag identifying them."""
+        predefined_currencies = await CurrencyCRUD.get_all_predefined()
+        return list(predefined_currencies.dicts), predefined_currencies.etag
 
     @classmethod
     async def _validate_currency_for_update(
@@ -25,10 +25,8 @@ class CurrencyExchangeController:
 
     @classmethod
     async def get_all_currency_exchanges(cls, user_id: str) -> List[Dict]:
-        exchanges: List[CurrencyExchange] = (
-            await CurrencyExchangeCRUD.get_all_by_user_id(user_id)
-        )
-        return [exchange.to_dict() for exchange in exchanges]
+        exchanges = await CurrencyExchangeCRUD.get_all_raw_by_user_id(user_id)
+        return [CurrencyExchange.son_to_dict(exchange) for exchange in exchanges]
 
     @classmethod
     async def update_currency_exchange(
@@ -0,0 +1,32 @@
+from typing import Any, Dict
+
+from commons.password_executor import password_executor
+from database.pool_metrics import get_pool_metrics
+from database.readiness import Readiness
+
+
+class HealthController:
+
+    @classmethod
+    async def get_readiness(cls) -> Dict[str, bool]:
+        """Checks whether this worker can serve traffic.
+
+        Returns:
+            Dict[str, bool]: Whether the database answered a ping within the
+                deadline, and whether each startup step completed.
+        """
+        return await Readiness.check()
+
+    @classmethod
+    def get_metrics(cls) -> Dict[str, Any]:
+        """Collects the runtime metrics of this worker.
+
+        Returns:
+            Dict[str, Any]: The connection pool counters of the mongoengine and
+                async MongoDB clients per server, and the password executor
+                metrics.
+        """
+        return {
+            "db_pools": get_pool_metrics(),
+            "password_executor": password_executor.metrics(),
+        }
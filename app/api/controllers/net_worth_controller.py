@@ -0,0 +1,36 @@
+from app.api.controllers.asset_controller import AssetController
+from app.api.controllers.wallet_controller import WalletController
+from app.crud.user_app_data_crud import UserAppDataCRUD
+from models.models import User, UserAppData
+
+
+class NetWorthController:
+
+    @classmethod
+    async def calculate_net_worth(cls, user: User) -> UserAppData:
+        """Recalculates wallets value, assets value and net worth of a user.
+
+        Balances and assets are summed per currency by two aggregation queries,
+        rates come from the cached exchange-rate graph and the results are
+        stored with a single save, so the number of round-trips doesn't grow
+        with the number of wallets, balances or assets.
+
+        Args:
+            user (User): The user to calculate the net worth for.
+
+        Returns:
+            UserAppData: The updated user app data.
+        """
+        user_app_data = await UserAppDataCRUD.get_one_by_user_id(user.id)
+        base_currency_id = user_app_data.base_currency_id.pk
+
+        wallets_value = await WalletController.get_total_wallet_value(
+            user.id, base_currency_id
+        )
+        assets_value = await AssetController.get_total_asset_value(
+            user.id, base_currency_id
+        )
+
+        return await UserAppDataCRUD.set_user_app_data_values(
+            user_app_data, wallets_value, assets_value
+        )
@@ -1,15 +1,43 @@
+import csv
+import io
+import json
 from datetime import datetime
 from decimal import Decimal
-from typing import Dict, List, Optional, Tuple
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
 
-from mongoengine import ValidationError
+from bson import ObjectId
+from fastapi import HTTPException, status
+from mongoengine import DoesNotExist, ValidationError
+from mongoengine.context_managers import no_dereference
 
+from app.crud.balance_crud import BalanceCRUD
 from app.crud.category_crud import CategoryCRUD
 from app.crud.transaction_crud import TransactionCRUD
+from app.crud.wallet_aggregate import WalletAggregate
 from app.crud.wallet_crud import WalletCRUD
+from commons.pagination import DEFAULT_PAGE_SIZE
+from database.async_database import TransactionContext, run_in_transaction
+from models.enums import ExportFormatEnum as E
 from models.enums import TransactionTypeEnum as T
 from models.models import Transaction, User, Wallet
-from models.schemas import TransactionCreateSchema, TransactionUpdateSchema
+from models.schemas import (
+    TransactionCreateSchema,
+    TransactionImportSchema,
+    TransactionUpdateSchema,
+)
+
+EXPORT_BATCH_SIZE = 500
+EXPORT_COLUMNS = (
+    "_id",
+    "date",
+    "type",
+    "amount",
+    "currency_id",
+    "from_wallet_id",
+    "to_wallet_id",
+    "category_id",
+    "description",
+)
 
 
 class TransactionController:
@@ -19,9 +47,9 @@ class TransactionController:
     ) -> Transaction:
         """Creates a new transaction and adjusts wallet balances.
 
-        Validates the transaction data, creates the transaction object,
-        saves it to the database, and adjusts the wallet balances accordingly.
-        If an error occurs during balance adjustment, the transaction is rolled back.
+        Validates the transaction data, then inserts the transaction and
+        adjusts the wallet balances in one database transaction, so either
+        all of the writes are committed or none.
 
         Args:
             transaction_schema (TransactionCreateSchema): The data for the new transaction.
@@ -36,13 +64,64 @@ class TransactionController:
         """
         await cls._validate_transaction_data(transaction_schema, user.id)
         transaction = cls._create_transaction_obj_to_create(transaction_schema, user.id)
-        transaction_in_db: Transaction = await TransactionCRUD.create_one(transaction)
-        try:
-            await cls._adjust_wallet_balances(transaction_in_db, user.id)
-            return transaction_in_db
-        except Exception as e:
-            await TransactionCRUD.delete_one_by_user(transaction_in_db.id, user.id)
-            raise e
+
+        async def create(context: TransactionContext) -> Transaction:
+            await TransactionCRUD.create_one(transaction, context.session)
+            context.on_rollback(
+                TransactionCRUD.delete_one_by_user, transaction.id, user.id
+            )
+            await cls._adjust_wallet_balances(transaction, user.id, context)
+            return transaction
+
+        return await run_in_transaction(create)
+
+    @classmethod
+    async def import_transactions(
+        cls, import_schema: TransactionImportSchema, user: User
+    ) -> List[Transaction]:
+        """Creates a batch of transactions and adjusts wallet balances once per balance.
+
+        The whole batch is validated against the user's wallets, balances and
+        categories, each loaded with one query, before anything is written.
+        Transactions are inserted with a single insert_many and every
+        (wallet, currency) pair gets one increment of the summed amount, all in
+        one database transaction.
+
+        Args:
+            import_schema (TransactionImportSchema): The transactions to create.
+            user (User): The user creating the transactions.
+
+        Returns:
+            List[Transaction]: The created transaction objects.
+
+        Raises:
+            ValidationError: If a currency isn't in a wallet or a balance would become negative.
+            DoesNotExist: If a category does not exist for the user.
+            HTTPException: If a wallet does not exist for the user.
+        """
+        transaction_schemas = import_schema.transactions
+        await cls._validate_import_categories(transaction_schemas, user.id)
+        wallet_ids = set(await WalletCRUD.get_ids_by_user(user.id))
+        balances = await BalanceCRUD.get_amounts_by_wallet_ids(list(wallet_ids))
+
+        transactions = [
+            cls._create_transaction_obj_to_create(transaction_schema, user.id)
+            for transaction_schema in transaction_schemas
+        ]
+        deltas = cls._sum_balance_adjustments(transactions)
+        cls._validate_import_balances(deltas, wallet_ids, balances, user.id)
+
+        async def create(context: TransactionContext) -> List[Transaction]:
+            await TransactionCRUD.create_many(transactions, context.session)
+            context.on_rollback(
+                TransactionCRUD.delete_many_by_user,
+                [transaction.id for transaction in transactions],
+                user.id,
+            )
+            await cls._apply_balance_deltas(deltas, context)
+            return transactions
+
+        return await run_in_transaction(create)
 
     @classmethod
     async def get_transaction(cls, transaction_id: str, user_id: str) -> Dict:
@@ -62,19 +141,27 @@ class TransactionController:
         return transaction.to_dict()
 
     @classmethod
-    async def get_all_transactions(cls, user_id: str) -> List[Dict]:
-        """Retrieves all transactions for a user.
+    async def get_all_transactions(
+        cls,
+        user_id: str,
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """Retrieves a page of transactions for a user, newest first.
 
         Args:
             user_id (str): The ID of the user.
+            limit (int): The maximum number of transactions to return.
+            cursor (Optional[str]): The cursor returned with the previous page.
 
         Returns:
-            List[Dict]: A list of dictionaries representing the transactions.
+            Tuple[List[Dict], Optional[str]]: The transactions of the page and the
+            cursor of the next page, or None if this is the last page.
         """
-        transactions: List[Transaction] = await TransactionCRUD.get_all_by_user_id(
-            user_id
+        transactions, next_cursor = await TransactionCRUD.get_page(
+            user_id, limit, cursor
         )
-        return [transaction.to_dict() for transaction in transactions]
+        return [Transaction.son_to_dict(t) for t in transactions], next_cursor
 
     @classmethod
     async def update_transaction(
@@ -85,6 +172,8 @@ class TransactionController:
     ) -> Dict:
         """Updates an existing transaction and adjusts wallet balances if necessary.
 
+        The update and the balance adjustments are committed together.
+
         Args:
             transaction_id (str): The ID of the transaction to update.
             transaction_update_schema (TransactionUpdateSchema): The updated transaction data.
@@ -103,17 +192,23 @@ class TransactionController:
         updated_transaction = cls._create_transaction_obj_for_update(
             transaction_update_schema
         )
-        await TransactionCRUD.update_one_by_user(
-            user_id, transaction_id, updated_transaction
-        )
+        # Restored as a whole on rollback, so fields the update set are unset again
+        snapshot = Transaction._from_son(existing_transaction.to_mongo())
 
-        if updated_transaction.amount:
-            await cls._handle_amount_update(
-                existing_transaction,
-                updated_transaction.amount,
-                user_id,
-                transaction_id,
+        async def update(context: TransactionContext) -> None:
+            await TransactionCRUD.update_one_by_user(
+                user_id, transaction_id, updated_transaction, context.session
             )
+            context.on_rollback(TransactionCRUD.replace_one, snapshot)
+            if updated_transaction.amount:
+                await cls._handle_amount_update(
+                    existing_transaction,
+                    updated_transaction.amount,
+                    user_id,
+                    context,
+                )
+
+        await run_in_transaction(update)
 
         transaction_from_db = await TransactionCRUD.get_one_by_id(transaction_id)
         return transaction_from_db.to_dict()
@@ -122,6 +217,8 @@ class TransactionController:
     async def delete_transaction(cls, transaction_id: str, user_id: str) -> Transaction:
         """Deletes a transaction and reverses the wallet balance adjustments.
 
+        The deletion and the reversal are committed together.
+
         Args:
             transaction_id (str): The ID of the transaction to delete.
             user_id (str): The ID of the user.
@@ -133,13 +230,18 @@ class TransactionController:
             Exception: Any exception that occurs during balance adjustment reversal.
         """
         transaction = await TransactionCRUD.get_one_by_user(transaction_id, user_id)
-        await TransactionCRUD.delete_one_by_user(transaction_id, user_id)
-        try:
-            await cls._adjust_wallet_balances(transaction, user_id, multiplier=-1)
+
+        async def delete(context: TransactionContext) -> Transaction:
+            await TransactionCRUD.delete_one_by_user(
+                transaction_id, user_id, context.session
+            )
+            context.on_rollback(TransactionCRUD.create_one, transaction)
+            await cls._adjust_wallet_balances(
+                transaction, user_id, context, multiplier=-1
+            )
             return transaction
-        except Exception as e:
-            await TransactionCRUD.create_one(transaction)
-            raise e
+
+        return await run_in_transaction(delete)
 
     @classmethod
     async def filter_transactions(
@@ -151,9 +253,13 @@ class TransactionController:
         category_id: Optional[str] = None,
         from_wallet_id: Optional[str] = None,
         to_wallet_id: Optional[str] = None,
-    ) -> List[Dict]:
+        limit: int = DEFAULT_PAGE_SIZE,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Dict], Optional[str]]:
         """Filters transactions for a user based on provided criteria.
 
+        Results are returned newest first, one page at a time.
+
         Args:
             user_id (str): The ID of the user.
             start_date (Optional[datetime]): The start date for filtering.
@@ -162,12 +268,17 @@ class TransactionController:
             category_id (Optional[str]): The category ID to filter by.
             from_wallet_id (Optional[str]): The source wallet ID to filter by.
             to_wallet_id (Optional[str]): The destination wallet ID to filter by.
+            limit (int): The maximum number of transactions to return.
+            cursor (Optional[str]): The cursor returned with the previous page.
 
         Returns:
-            List[Dict]: A list of dictionaries representing the filtered transactions.
+            Tuple[List[Dict], Optional[str]]: The filtered transactions of the page
+            and the cursor of the next page, or None if this is the last page.
         """
-        transactions: List[Transaction] = await TransactionCRUD.filter_transactions(
+        transactions, next_cursor = await TransactionCRUD.get_page(
             user_id,
+            limit,
+            cursor,
             start_date,
             end_date,
             transaction_type,
@@ -175,7 +286,52 @@ class TransactionController:
             from_wallet_id,
             to_wallet_id,
         )
-        return [transaction.to_dict() for transaction in transactions]
+        return [Transaction.son_to_dict(t) for t in transactions], next_cursor
+
+    @classmethod
+    def export_transactions(
+        cls,
+        user_id: str,
+        export_format: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        category_id: Optional[str] = None,
+        from_wallet_id: Optional[str] = None,
+        to_wallet_id: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Streams the filtered transactions of a user as NDJSON or CSV.
+
+        Transactions are read from a database cursor and encoded in chunks of
+        `EXPORT_BATCH_SIZE` rows, so memory use doesn't depend on the number
+        of exported transactions.
+
+        Args:
+            user_id (str): The ID of the user.
+            export_format (str): The output format, ndjson or csv.
+            start_date (Optional[datetime]): The start date for filtering.
+            end_date (Optional[datetime]): The end date for filtering.
+            transaction_type (Optional[str]): The type of transactions to include.
+            category_id (Optional[str]): The category ID to filter by.
+            from_wallet_id (Optional[str]): The source wallet ID to filter by.
+            to_wallet_id (Optional[str]): The destination wallet ID to filter by.
+
+        Returns:
+            AsyncIterator[str]: The encoded chunks, newest transactions first.
+        """
+        transactions = TransactionCRUD.iter_filtered(
+            user_id,
+            EXPORT_BATCH_SIZE,
+            start_date,
+            end_date,
+            transaction_type,
+            category_id,
+            from_wallet_id,
+            to_wallet_id,
+        )
+        if export_format == E.CSV.value:
+            return cls._encode_csv(transactions)
+        return cls._encode_ndjson(transactions)
 
     @classmethod
     async def calculate_statistics(
@@ -183,6 +339,9 @@ class TransactionController:
     ) -> Dict[str, Decimal]:
         """Calculates total income, total expense, and net balance for a user.
 
+        The totals are computed by a `$group` aggregation in the database, so
+        only one row per transaction type is transferred.
+
         Args:
             user_id (str): The ID of the user.
             start_date (Optional[datetime]): The start date for the calculation.
@@ -191,10 +350,9 @@ class TransactionController:
         Returns:
             Dict[str, Decimal]: A dictionary containing total income, total expense, and net balance.
         """
-        transactions = await TransactionCRUD.filter_transactions(
-            user_id, start_date, end_date
-        )
-        total_income, total_expense = cls._calculate_income_expense(transactions)
+        totals = await TransactionCRUD.get_totals_by_type(user_id, start_date, end_date)
+        total_income = totals.get(T.INCOME.value, Decimal(0))
+        total_expense = totals.get(T.EXPENSE.value, Decimal(0))
         net_balance = total_income - total_expense
         return {
             "total_income": total_income,
@@ -202,6 +360,54 @@ class TransactionController:
             "net_balance": net_balance,
         }
 
+    @classmethod
+    async def calculate_statistics_series(
+        cls,
+        user_id: str,
+        interval: str,
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        split_by_category: bool = False,
+    ) -> List[Dict]:
+        """Calculates income, expense, and net balance per time bucket for a user.
+
+        Args:
+            user_id (str): The ID of the user.
+            interval (str): The bucket size, one of day, week or month.
+            start_date (Optional[datetime]): The start date for the calculation.
+            end_date (Optional[datetime]): The end date for the calculation.
+            split_by_category (bool): Whether to return one bucket per category.
+
+        Returns:
+            List[Dict]: The buckets ordered by period, each containing period,
+            total income, total expense, net balance and, if split, category ID.
+        """
+        rows = await TransactionCRUD.get_totals_by_period(
+            user_id, interval, start_date, end_date, split_by_category
+        )
+        buckets: Dict[Tuple, Dict] = {}
+        for row in rows:
+            key = (row["period"], row.get("category_id"))
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = {
+                    "period": row["period"],
+                    "total_income": Decimal(0),
+                    "total_expense": Decimal(0),
+                    "net_balance": Decimal(0),
+                }
+                if split_by_category:
+                    category_id = row.get("category_id")
+                    bucket["category_id"] = str(category_id) if category_id else None
+                buckets[key] = bucket
+            if row["type"] == T.INCOME.value:
+                bucket["total_income"] += row["total"]
+                bucket["net_balance"] += row["total"]
+            elif row["type"] == T.EXPENSE.value:
+                bucket["total_expense"] += row["total"]
+                bucket["net_balance"] -= row["total"]
+        return list(buckets.values())
+
     @classmethod
     async def _validate_transaction_data(
         cls, transaction_schema: TransactionCreateSchema, user_id: str
@@ -218,7 +424,9 @@ class TransactionController:
             ValidationError: If the validation fails.
         """
         if transaction_schema.category_id:
-            await CategoryCRUD.get_one_by_user(transaction_schema.category_id, user_id)
+            await CategoryCRUD.get_one_by_user_cached(
+                transaction_schema.category_id, user_id
+            )
         await cls._check_currency_in_wallets(transaction_schema, user_id)
 
     @classmethod
@@ -236,9 +444,12 @@ class TransactionController:
         """
         wallets = await cls._get_wallets_for_transaction(transaction_schema, user_id)
         currency_id = transaction_schema.currency_id
+        balance_keys = await BalanceCRUD.get_amounts_by_wallet_ids(
+            [wallet.id for wallet in wallets]
+        )
 
         for wallet in wallets:
-            if not cls._currency_exists_in_wallet(wallet, currency_id):
+            if not cls._currency_exists_in_wallet(wallet, currency_id, balance_keys):
                 raise ValidationError(
                     f"Currency does not exist in the wallet {wallet.id} for transaction type '{transaction_schema.type}'."
                 )
@@ -270,19 +481,25 @@ class TransactionController:
         return wallets
 
     @staticmethod
-    def _currency_exists_in_wallet(wallet: Wallet, currency_id: str) -> bool:
+    def _currency_exists_in_wallet(
+        wallet: Wallet,
+        currency_id: str,
+        balance_keys: Iterable[Tuple[ObjectId, ObjectId]],
+    ) -> bool:
         """Checks if a currency exists in a given wallet.
 
         Args:
             wallet (Wallet): The wallet to check.
             currency_id (str): The ID of the currency.
+            balance_keys (Iterable[Tuple[ObjectId, ObjectId]]): The (wallet ID,
+                currency ID) pairs of the balances of the checked wallets.
 
         Returns:
             bool: True if the currency exists in the wallet, False otherwise.
         """
         return any(
-            str(balance.currency_id.pk) == currency_id
-            for balance in wallet.balances_ids
+            wallet_id == wallet.id and str(balance_currency_id) == currency_id
+            for wallet_id, balance_currency_id in balance_keys
         )
 
     @classmethod
@@ -290,6 +507,7 @@ class TransactionController:
         cls,
         transaction: Transaction,
         user_id: str,
+        context: TransactionContext,
         amount: Decimal = None,
         multiplier: int = 1,
     ) -> None:
@@ -298,6 +516,7 @@ class TransactionController:
         Args:
             transaction (Transaction): The transaction affecting the balances.
             user_id (str): The ID of the user.
+            context (TransactionContext): The database transaction to write in.
             amount (Decimal, optional): The amount to adjust by. Defaults to transaction amount.
             multiplier (int, optional): Multiplier for reversing adjustments. Defaults to 1.
 
@@ -310,7 +529,7 @@ class TransactionController:
 
         adjustments = cls._get_balance_adjustments(transaction, amount)
         for wallet_id, currency_id, amt in adjustments:
-            await cls._adjust_wallet_balance(wallet_id, currency_id, amt, user_id)
+            await cls._adjust_wallet_balance(wallet_id, currency_id, amt, context)
 
     @classmethod
     def _get_balance_adjustments(
@@ -325,6 +544,13 @@ class TransactionController:
         Returns:
             List[Tuple[str, str, Decimal]]: A list of tuples with wallet ID, currency ID, and adjustment amount.
         """
+        with no_dereference(Transaction):
+            return cls._get_balance_adjustments_of_references(transaction, amount)
+
+    @staticmethod
+    def _get_balance_adjustments_of_references(
+        transaction: Transaction, amount: Decimal
+    ) -> List[Tuple[str, str, Decimal]]:
         adjustments = []
         if transaction.type == T.INCOME.value:
             adjustments.append(
@@ -344,43 +570,170 @@ class TransactionController:
         return adjustments
 
     @classmethod
-    async def _adjust_wallet_balance(
-        cls, wallet_id: str, currency_id: str, amount: Decimal, user_id: str
+    def _sum_balance_adjustments(
+        cls, transactions: List[Transaction]
+    ) -> Dict[Tuple[ObjectId, ObjectId], Decimal]:
+        """Sums the balance adjustments of transactions per wallet and currency.
+
+        Args:
+            transactions (List[Transaction]): The transactions to sum.
+
+        Returns:
+            Dict[Tuple[ObjectId, ObjectId], Decimal]: The summed adjustment per (wallet ID, currency ID).
+        """
+        deltas: Dict[Tuple[ObjectId, ObjectId], Decimal] = {}
+        for transaction in transactions:
+            adjustments = cls._get_balance_adjustments(transaction, transaction.amount)
+            for wallet_id, currency_id, amount in adjustments:
+                key = (wallet_id, currency_id)
+                deltas[key] = deltas.get(key, Decimal(0)) + amount
+        return deltas
+
+    @classmethod
+    async def _validate_import_categories(
+        cls, transaction_schemas: List[TransactionCreateSchema], user_id: str
     ) -> None:
-        """Adjusts the balance of a specific currency in a wallet.
+        """Checks that every category used by the imported transactions exists.
 
         Args:
-            wallet_id (str): The ID of the wallet to adjust.
-            currency_id (str): The ID of the currency.
-            amount (Decimal): The amount to adjust by.
+            transaction_schemas (List[TransactionCreateSchema]): The transactions to import.
             user_id (str): The ID of the user.
 
         Raises:
-            ValidationError: If the adjustment fails due to insufficient funds or missing currency.
+            DoesNotExist: If a category does not exist for the user.
         """
-        wallet = await WalletCRUD.get_one_by_user(wallet_id, user_id)
-        cls._adjust_balance(wallet, currency_id, amount)
-        await WalletCRUD.update_one_by_user(user_id, wallet_id, wallet)
+        category_ids = {
+            transaction_schema.category_id
+            for transaction_schema in transaction_schemas
+            if transaction_schema.category_id
+        }
+        if not category_ids:
+            return
+        existing_ids = await CategoryCRUD.get_existing_ids_by_user(
+            list(category_ids), user_id
+        )
+        missing_ids = sorted(
+            category_id
+            for category_id in category_ids
+            if ObjectId(category_id) not in existing_ids
+        )
+        if missing_ids:
+            raise DoesNotExist(
+                f"Categories {', '.join(missing_ids)} for user {user_id} do not exist"
+            )
+
+    @staticmethod
+    def _validate_import_balances(
+        deltas: Dict[Tuple[ObjectId, ObjectId], Decimal],
+        wallet_ids: Set[ObjectId],
+        balances: Dict[Tuple[ObjectId, ObjectId], Decimal],
+        user_id: str,
+    ) -> None:
+        """Checks the summed adjustments against the preloaded balances.
+
+        Args:
+            deltas (Dict[Tuple[ObjectId, ObjectId], Decimal]): The summed adjustment per (wallet ID, currency ID).
+            wallet_ids (Set[ObjectId]): The IDs of the user's wallets.
+            balances (Dict[Tuple[ObjectId, ObjectId], Decimal]): The current amount per (wallet ID, currency ID).
+            user_id (str): The ID of the user.
+
+        Raises:
+            HTTPException: If a wallet does not exist for the user.
+            ValidationError: If a currency isn't in a wallet or a balance would become negative.
+        """
+        for (wallet_id, currency_id), delta in deltas.items():
+            if wallet_id not in wallet_ids:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Wallet with id {wallet_id} for user {user_id} does not exist",
+                )
+            if (wallet_id, currency_id) not in balances:
+                raise ValidationError(
+                    f"Currency {currency_id} does not exist in the wallet {wallet_id}."
+                )
+            if balances[(wallet_id, currency_id)] + delta < 0:
+                raise ValidationError(
+                    f"Insufficient balance in the wallet {wallet_id}."
+                )
 
     @classmethod
-    def _adjust_balance(cls, wallet: Wallet, currency_id: str, amount: Decimal) -> None:
-        """Modifies the balance amount for a given currency in a wallet.
+    async def _apply_balance_deltas(
+        cls,
+        deltas: Dict[Tuple[ObjectId, ObjectId], Decimal],
+        context: TransactionContext,
+    ) -> None:
+        """Applies summed adjustments with one guarded increment per balance.
+
+        Wallet total values are then incremented in one batched update.
 
         Args:
-            wallet (Wallet): The wallet to adjust.
-            currency_id (str): The ID of the currency.
-            amount (Decimal): The amount to add or subtract.
+            deltas (Dict[Tuple[ObjectId, ObjectId], Decimal]): The summed adjustment per (wallet ID, currency ID).
+            context (TransactionContext): The database transaction to write in.
+
+        Raises:
+            ValidationError: If a balance would become negative.
+        """
+        wallet_deltas: Dict[ObjectId, Decimal] = {}
+        for (wallet_id, currency_id), delta in deltas.items():
+            if delta == 0:
+                continue
+            if not await BalanceCRUD.increment_amount(
+                wallet_id, currency_id, delta, context.session
+            ):
+                raise ValidationError(
+                    f"Insufficient balance in the wallet {wallet_id}."
+                )
+            context.on_rollback(
+                BalanceCRUD.increment_amount, wallet_id, currency_id, -delta
+            )
+            wallet_deltas[wallet_id] = wallet_deltas.get(wallet_id, Decimal(0)) + delta
+
+        await WalletAggregate.total_values_changed(wallet_deltas, context.session)
+        context.on_rollback(
+            WalletAggregate.total_values_changed,
+            {wallet_id: -delta for wallet_id, delta in wallet_deltas.items()},
+        )
+
+    @classmethod
+    async def _adjust_wallet_balance(
+        cls,
+        wallet_id: ObjectId,
+        currency_id: ObjectId,
+        amount: Decimal,
+        context: TransactionContext,
+    ) -> None:
+        """Adjusts the balance of a specific currency in a wallet.
+
+        The balance is changed with one conditional increment that only
+        matches if the rounded result isn't negative, then the wallet's total
+        value is incremented the same way.
+
+        Args:
+            wallet_id (ObjectId): The ID of the wallet to adjust.
+            currency_id (ObjectId): The ID of the currency.
+            amount (Decimal): The amount to adjust by.
+            context (TransactionContext): The database transaction to write in.
 
         Raises:
-            ValidationError: If the currency does not exist or insufficient funds.
+            ValidationError: If the adjustment fails due to insufficient funds or missing currency.
         """
-        for balance in wallet.balances_ids:
-            if balance.currency_id.pk == currency_id:
-                balance.amount += amount
-                if balance.amount < 0:
-                    raise ValidationError("Insufficient balance in the wallet.")
-                return
-        raise ValidationError("Currency does not exist in the wallet.")
+        session = context.session
+        if await BalanceCRUD.increment_amount(wallet_id, currency_id, amount, session):
+            context.on_rollback(
+                BalanceCRUD.increment_amount, wallet_id, currency_id, -amount
+            )
+            await WalletAggregate.total_values_changed({wallet_id: amount}, session)
+            context.on_rollback(
+                WalletAggregate.total_values_changed, {wallet_id: -amount}
+            )
+            return
+
+        balance = await BalanceCRUD.get_one_by_wallet_and_currency_id_optional(
+            wallet_id, currency_id, session
+        )
+        if balance is None:
+            raise ValidationError("Currency does not exist in the wallet.")
+        raise ValidationError("Insufficient balance in the wallet.")
 
     @classmethod
     def _create_transaction_obj_to_create(
@@ -432,7 +785,7 @@ class TransactionController:
         existing_transaction: Transaction,
         new_amount: Decimal,
         user_id: str,
-        transaction_id: str,
+        context: TransactionContext,
     ) -> None:
         """Handles wallet balance adjustments when a transaction amount is updated.
 
@@ -440,58 +793,66 @@ class TransactionController:
             existing_transaction (Transaction): The original transaction.
             new_amount (Decimal): The new transaction amount.
             user_id (str): The ID of the user.
-            transaction_id (str): The ID of the transaction.
+            context (TransactionContext): The database transaction to write in.
 
         Raises:
             Exception: Any exception that occurs during balance adjustment.
         """
         amount_difference = new_amount - existing_transaction.amount
         if amount_difference != 0:
-            try:
-                await cls._adjust_wallet_balances(
-                    existing_transaction, user_id, amount=amount_difference
-                )
-            except Exception as e:
-                await cls._rollback_transaction_update(
-                    user_id, transaction_id, existing_transaction
-                )
-                raise e
+            await cls._adjust_wallet_balances(
+                existing_transaction, user_id, context, amount=amount_difference
+            )
 
-    @classmethod
-    async def _rollback_transaction_update(
-        cls, user_id: str, transaction_id: str, existing_transaction: Transaction
-    ) -> None:
-        """Rolls back a transaction update in case of failure.
+    @staticmethod
+    async def _encode_ndjson(transactions: AsyncIterator[dict]) -> AsyncIterator[str]:
+        """Encodes raw transactions as newline-delimited JSON chunks.
 
         Args:
-            user_id (str): The ID of the user.
-            transaction_id (str): The ID of the transaction.
-            existing_transaction (Transaction): The original transaction data.
+            transactions (AsyncIterator[dict]): The raw transactions to encode.
 
-        Raises:
-            Exception: Any exception that occurs during rollback.
+        Yields:
+            str: Up to `EXPORT_BATCH_SIZE` JSON lines.
         """
-        await TransactionCRUD.update_one_by_user(
-            user_id, transaction_id, existing_transaction
-        )
+        lines = []
+        async for transaction in transactions:
+            lines.append(
+                json.dumps(
+                    Transaction.son_to_dict(transaction),
+                    default=lambda value: value.isoformat(),
+                )
+            )
+            if len(lines) == EXPORT_BATCH_SIZE:
+                yield "\n".join(lines) + "\n"
+                lines = []
+        if lines:
+            yield "\n".join(lines) + "\n"
 
     @staticmethod
-    def _calculate_income_expense(
-        transactions: List[Transaction],
-    ) -> Tuple[Decimal, Decimal]:
-        """Calculates total income and total expense from a list of transactions.
+    async def _encode_csv(transactions: AsyncIterator[dict]) -> AsyncIterator[str]:
+        """Encodes raw transactions as CSV chunks, starting with the header row.
 
         Args:
-            transactions (List[Transaction]): The transactions to calculate from.
+            transactions (AsyncIterator[dict]): The raw transactions to encode.
 
-        Returns:
-            Tuple[Decimal, Decimal]: Total income and total expense amounts.
+        Yields:
+            str: The header, then up to `EXPORT_BATCH_SIZE` rows per chunk.
         """
-        total_income = Decimal(0)
-        total_expense = Decimal(0)
-        for transaction in transactions:
-            if transaction.type == T.INCOME.value:
-                total_income += transaction.amount
-            elif transaction.type == T.EXPENSE.value:
-                total_expense += transaction.amount
-        return total_income, total_expense
+        buffer = io.StringIO()
+        writer = csv.DictWriter(
+            buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore"
+        )
+        writer.writeheader()
+        rows = 0
+        async for transaction in transactions:
+            row = Transaction.son_to_dict(transaction)
+            row["date"] = row["date"].isoformat()
+            writer.writerow(row)
+            rows += 1
+            if rows == EXPORT_BATCH_SIZE:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate(0)
+                rows = 0
+        if buffer.tell():
+            yield buffer.getvalue()
@@ -1,9 +1,11 @@
 from decimal import Decimal
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from bson import ObjectId
 from mongoengine import ValidationError
+from mongoengine.context_managers import no_dereference
 
+from app.crud.balance_crud import BalanceCRUD
 from app.crud.currency_crud import CurrencyCRUD
 from app.crud.currency_exchange_crud import CurrencyExchangeCRUD
 from app.crud.user_app_data_crud import UserAppDataCRUD
@@ -43,17 +45,6 @@ class UserAppDataController:
 
         return updated_currency.to_dict()
 
-    @classmethod
-    async def update_user_app_data_net_worth(
-        cls, user: User, net_worth: Decimal
-    ) -> Dict:
-        user_app_data = await UserAppDataCRUD.get_one_by_user_id(user.id)
-        user_app_data.net_worth = net_worth
-        updated_data = await UserAppDataCRUD.update_one_by_id(
-            user_app_data.id, user_app_data
-        )
-        return updated_data.to_dict()
-
     @classmethod
     async def handle_transaction_user_app_data_wallet_value_update(
         cls,
@@ -76,6 +67,37 @@ class UserAppDataController:
                 user, transaction_amount, transaction.currency_id.id
             )
 
+    @classmethod
+    async def handle_transactions_import_user_app_data_wallet_value_update(
+        cls, transactions: List[Transaction], user: User
+    ) -> None:
+        net_by_currency: Dict[ObjectId, Decimal] = {}
+        with no_dereference(Transaction):
+            for transaction in transactions:
+                if transaction.type == T.INCOME.value:
+                    amount = transaction.amount
+                elif transaction.type == T.EXPENSE.value:
+                    amount = -transaction.amount
+                else:
+                    continue
+                currency_id = transaction.currency_id.id
+                net_by_currency[currency_id] = (
+                    net_by_currency.get(currency_id, Decimal(0)) + amount
+                )
+
+        if not net_by_currency:
+            return
+
+        base_currency_id = await UserAppDataCRUD.get_base_currency_id_by_user_id(
+            user.id
+        )
+        net_amount = await CurrencyExchangeCRUD.convert_totals_to_base_currency(
+            net_by_currency, base_currency_id, user.id
+        )
+        await UserAppDataCRUD.add_amount_to_user_app_data_wallets_value(
+            user.id, net_amount
+        )
+
     @classmethod
     async def add_value_to_user_app_data_wallets_value(
         cls, user: User, amount: Decimal, currency_id: ObjectId
@@ -128,7 +150,7 @@ class UserAppDataController:
     async def _get_base_currency(cls, user: User) -> Currency:
         user_app_data = await UserAppDataCRUD.get_one_by_user_id(user.id)
         current_base_currency_id = user_app_data.base_currency_id.pk
-        current_base_currency = await CurrencyCRUD.get_one_by_user(
+        current_base_currency = await CurrencyCRUD.get_one_by_user_cached(
             current_base_currency_id, user.id
         )
 
@@ -138,7 +160,7 @@ class UserAppDataController:
     async def _retrieve_currency_to_set(
         cls, user_id: str, currency_id: str
     ) -> Currency:
-        return await CurrencyCRUD.get_one_by_user(currency_id, user_id)
+        return await CurrencyCRUD.get_one_by_user_cached(currency_id, user_id)
 
     @classmethod
     async def _validate_exchange_rates(
@@ -154,12 +176,9 @@ class UserAppDataController:
 
     @classmethod
     async def _get_held_currency_ids(cls, user_id: str) -> set:
-        wallets = await WalletCRUD.get_all_by_user_id_optional(user_id)
-        return {
-            balance.currency_id.id
-            for wallet in wallets
-            for balance in wallet.balances_ids
-        }
+        wallet_ids = await WalletCRUD.get_ids_by_user(user_id)
+        amounts = await BalanceCRUD.get_amounts_by_wallet_ids(wallet_ids)
+        return {currency_id for _, currency_id in amounts}
 
     @classmethod
     async def _validate_held_currencies_exchange_rates(
@@ -1,6 +1,7 @@
 from decimal import Decimal
 from typing import Dict, List
 
+from bson import ObjectId
 from fastapi import HTTPException, status
 
 from app.crud.balance_crud import BalanceCRUD
@@ -8,6 +9,7 @@ from app.crud.currency_crud import CurrencyCRUD
 from app.crud.currency_exchange_crud import CurrencyExchangeCRUD
 from app.crud.user_app_data_crud import UserAppDataCRUD
 from app.crud.wallet_crud import WalletCRUD
+from database.async_database import TransactionContext, run_in_transaction
 from models.models import Balance, Currency, User, Wallet
 from models.schemas import BalanceSchema, WalletCreateSchema, WalletUpdateSchema
 
@@ -18,28 +20,30 @@ class WalletController:
     async def create_wallet(cls, wallet_schema: WalletCreateSchema, user: User) -> Dict:
         wallet = await cls._create_wallet_obj(wallet_schema, user.id)
         balances = await cls._create_balance_objs_list(wallet_schema.balances_ids)
-        await cls._validate_balances_currency_type(balances, wallet.type)
+        await cls._validate_balances_currency_type(balances, wallet.type, user.id)
 
         wallet_in_db = await WalletCRUD.create_one(wallet)
         await cls._save_balances(wallet_in_db, balances)
 
         wallet_with_balances = await WalletCRUD.get_one_by_id(wallet_in_db.id)
+        balances = await WalletCRUD.get_balances(wallet_with_balances)
 
-        await cls._update_user_app_data_with_wallet_value(
-            user, wallet_with_balances, add=True
-        )
+        await cls._update_user_app_data_with_wallet_value(user, balances, add=True)
 
-        return wallet_with_balances.to_dict()
+        return wallet_with_balances.to_dict_with_balances(balances)
 
     @classmethod
     async def get_wallet(cls, wallet_id: str, user_id: str) -> Dict:
         wallet = await WalletCRUD.get_one_by_user(wallet_id, user_id)
-        return wallet.to_dict()
+        return await cls._to_dict(wallet)
 
     @classmethod
     async def get_all_wallets(cls, user_id: str) -> List[Dict]:
-        wallets: List[Wallet] = await WalletCRUD.get_all_by_user_id_optional(user_id)
-        return [wallet.to_dict() for wallet in wallets]
+        wallets = await WalletCRUD.get_all_raw_with_balances_by_user_id(user_id)
+        return [
+            Wallet.son_to_dict_with_balances(wallet, balances)
+            for wallet, balances in wallets
+        ]
 
     @classmethod
     async def update_wallet(
@@ -57,7 +61,7 @@ class WalletController:
 
         if updated_wallet.balances_ids:
             await cls._validate_balances_currency_type(
-                updated_wallet.balances_ids, current_wallet.type
+                updated_wallet.balances_ids, current_wallet.type, user.id
             )
 
         await WalletCRUD.update_one_by_user(user.id, wallet_id, updated_wallet)
@@ -65,14 +69,13 @@ class WalletController:
         await cls.calculate_total_wallet_value(user)
 
         wallet_from_db = await WalletCRUD.get_one_by_id(wallet_id)
-        return wallet_from_db.to_dict()
+        return await cls._to_dict(wallet_from_db)
 
     @classmethod
     async def delete_wallet(cls, wallet_id: str, user: User) -> bool:
         wallet_to_delete: Wallet = await WalletCRUD.get_one_by_user(wallet_id, user.id)
-        await cls._update_user_app_data_with_wallet_value(
-            user, wallet_to_delete, add=False
-        )
+        balances = await WalletCRUD.get_balances(wallet_to_delete)
+        await cls._update_user_app_data_with_wallet_value(user, balances, add=False)
         await WalletCRUD.delete_one_by_user(user.id, wallet_id)
         return True
 
@@ -82,21 +85,27 @@ class WalletController:
     ) -> Dict:
         wallet = await WalletCRUD.get_one_by_user(wallet_id, user.id)
         await cls._validate_currency_and_wallet_type_match(
-            balance_schema.currency_id, wallet.type
+            balance_schema.currency_id, wallet.type, user.id
         )
-        cls._check_existing_balance(wallet, balance_schema)
+        await cls._check_existing_balance(wallet, balance_schema)
         new_balance = cls._create_balance(balance_schema, wallet_id)
-
-        # TODO: should make these atomic
-        updated_wallet = await BalanceCRUD.create_one(new_balance)
         balance_value_to_add = await cls._calculate_balance_value(new_balance, user)
 
-        await UserAppDataCRUD.add_amount_to_user_app_data_wallets_value(
-            user.id, balance_value_to_add
-        )
+        async def add(context: TransactionContext) -> None:
+            await BalanceCRUD.create_one(new_balance, context.session)
+            context.on_rollback(
+                BalanceCRUD.delete_one_by_wallet_and_currency_id,
+                wallet_id,
+                balance_schema.currency_id,
+            )
+            await UserAppDataCRUD.increment_wallets_value(
+                user.id, balance_value_to_add, context.session
+            )
+
+        await run_in_transaction(add)
 
         updated_wallet = await WalletCRUD.get_one_by_user(wallet_id, user.id)
-        return updated_wallet.to_dict()
+        return await cls._to_dict(updated_wallet)
 
     @classmethod
     async def remove_balance(cls, wallet_id: str, currency_id: str, user: User) -> Dict:
@@ -104,45 +113,53 @@ class WalletController:
             user.id, wallet_id, currency_id
         )
 
-        # TODO: should make this atomic
         balance_value_to_remove = await cls._calculate_balance_value(
             balance_to_remove, user
         )
 
-        await UserAppDataCRUD.reduce_amount_from_user_app_data_wallets_value(
-            user.id, balance_value_to_remove
-        )
-        await BalanceCRUD.delete_one_by_wallet_and_currency_id(wallet_id, currency_id)
+        async def remove(context: TransactionContext) -> None:
+            await BalanceCRUD.delete_one_by_wallet_and_currency_id(
+                wallet_id, currency_id, context.session
+            )
+            context.on_rollback(BalanceCRUD.create_one, balance_to_remove)
+            await UserAppDataCRUD.increment_wallets_value(
+                user.id, -balance_value_to_remove, context.session
+            )
+
+        await run_in_transaction(remove)
 
         updated_wallet = await WalletCRUD.get_one_by_user(wallet_id, user.id)
-        return updated_wallet.to_dict()
+        return await cls._to_dict(updated_wallet)
 
     @classmethod
     async def calculate_total_wallet_value(cls, user: User) -> Decimal:
-        wallets = await WalletCRUD.get_all_by_user_id_optional(user.id)
         base_currency_id = await UserAppDataCRUD.get_base_currency_id_by_user_id(
             user.id
         )
-
-        total_value = Decimal(0)
-        for wallet in wallets:
-            total_value += await cls._calculate_wallet_value(
-                wallet, base_currency_id, user.id
-            )
+        total_value = await cls.get_total_wallet_value(user.id, base_currency_id)
 
         await UserAppDataCRUD.update_user_app_data_wallets_value(user.id, total_value)
 
         return total_value
 
+    @classmethod
+    async def get_total_wallet_value(
+        cls, user_id: str, base_currency_id: ObjectId
+    ) -> Decimal:
+        totals_by_currency = await WalletCRUD.get_balance_totals_by_currency(user_id)
+        return await CurrencyExchangeCRUD.convert_totals_to_base_currency(
+            totals_by_currency, base_currency_id, user_id
+        )
+
     @classmethod
     async def _update_user_app_data_with_wallet_value(
-        cls, user: User, wallet_with_balances: Wallet, add: bool
+        cls, user: User, balances: List[Balance], add: bool
     ) -> None:
         base_currency_id = await UserAppDataCRUD.get_base_currency_id_by_user_id(
             user.id
         )
         wallet_value = await cls._calculate_wallet_value(
-            wallet_with_balances, base_currency_id, user.id
+            balances, base_currency_id, user.id
         )
 
         if add:
@@ -156,15 +173,20 @@ class WalletController:
 
     @classmethod
     async def _calculate_wallet_value(
-        cls, wallet: Wallet, base_currency_id: str, user_id: str
+        cls, balances: List[Balance], base_currency_id: str, user_id: str
     ) -> Decimal:
         total_value = Decimal(0)
-        for balance in wallet.balances_ids:
+        for balance in balances:
             total_value += await cls._convert_balance_to_base_currency(
                 balance, base_currency_id, user_id
             )
         return total_value
 
+    @classmethod
+    async def _to_dict(cls, wallet: Wallet) -> Dict:
+        balances = await WalletCRUD.get_balances(wallet)
+        return wallet.to_dict_with_balances(balances)
+
     @classmethod
     async def _convert_balance_to_base_currency(
         cls, balance: Balance, base_currency_id: str, user_id: str
@@ -190,9 +212,8 @@ class WalletController:
 
     @classmethod
     async def _save_balances(cls, wallet: Wallet, balances: List[Balance]) -> None:
-        for balance in balances:
-            balance.wallet_id = wallet.id
-            await BalanceCRUD.create_one(balance)
+        if balances:
+            await BalanceCRUD.create_many(wallet.id, balances)
 
     @classmethod
     async def _create_balance_objs_list(
@@ -209,18 +230,20 @@ class WalletController:
 
     @classmethod
     async def _validate_balances_currency_type(
-        cls, balances: List[Balance], wallet_currency_type: str
+        cls, balances: List[Balance], wallet_currency_type: str, user_id: str
     ) -> None:
         for balance in balances:
             await cls._validate_currency_and_wallet_type_match(
-                balance.currency_id.pk, wallet_currency_type
+                balance.currency_id.pk, wallet_currency_type, user_id
             )
 
     @classmethod
     async def _validate_currency_and_wallet_type_match(
-        cls, b_currency_id: str, wallet_currency_type: str
+        cls, b_currency_id: str, wallet_currency_type: str, user_id: str
     ) -> None:
-        currency: Currency = await CurrencyCRUD.get_one_by_id(b_currency_id)
+        currency: Currency = await CurrencyCRUD.get_one_by_user_cached(
+            b_currency_id, user_id
+        )
         if currency.currency_type != wallet_currency_type:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -228,13 +251,15 @@ class WalletController:
             )
 
     @classmethod
-    def _check_existing_balance(
+    async def _check_existing_balance(
         cls, wallet: Wallet, new_balance: BalanceSchema
     ) -> None:
-        if any(
-            str(balance.currency_id.pk) == new_balance.currency_id
-            for balance in wallet.balances_ids
-        ):
+        existing_balance = (
+            await BalanceCRUD.get_one_by_wallet_and_currency_id_optional(
+                wallet.id, new_balance.currency_id
+            )
+        )
+        if existing_balance is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Balance with same currency already exists in the wallet",
@@ -4,6 +4,7 @@ from app.api.controllers.asset_controller import AssetController
 from app.api.controllers.auth_controller import has_role
 from app.api.controllers.user_app_data_controller import UserAppDataController
 from app.crud.asset_crud import AssetCRUD
+from commons.responses import ResponseSchemaRoute
 from models.enums import RoleEnum as R
 from models.models import User
 from models.schemas import (
@@ -14,7 +15,7 @@ from models.schemas import (
     ResponseSchema,
 )
 
-router = APIRouter(prefix="/assets", tags=["Asset"])
+router = APIRouter(prefix="/assets", tags=["Asset"], route_class=ResponseSchemaRoute)
 
 
 @router.post(
@@ -4,6 +4,7 @@ from fastapi import APIRouter, Depends, Path
 
 from app.api.controllers.asset_type_controller import AssetTypeController
 from app.api.controllers.auth_controller import has_role
+from commons.responses import ResponseSchemaRoute
 from models.enums import RoleEnum as R
 from models.schemas import (
     AssetTypeCreateSchema,
@@ -12,7 +13,9 @@ from models.schemas import (
     ResponseSchema,
 )
 
-router = APIRouter(prefix="/asset-types", tags=["AssetType"])
+router = APIRouter(
+    prefix="/asset-types", tags=["AssetType"], route_class=ResponseSchemaRoute
+)
 
 
 @router.post(
@@ -9,11 +9,12 @@ from app.api.controllers.auth_controller import (
     get_current_user,
     oauth2_scheme,
 )
+from commons.responses import ResponseSchemaRoute
 from models.schemas import ResponseSchema, Token, UpdateUserSchema, UserSchema
 
 load_dotenv()
 
-router = APIRouter(tags=["Authentication"])
+router = APIRouter(tags=["Authentication"], route_class=ResponseSchemaRoute)
 
 
 @router.post(
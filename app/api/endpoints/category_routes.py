@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, Path
 
 from app.api.controllers.auth_controller import has_role
 from app.api.controllers.category_controller import CategoryController
+from commons.responses import ResponseSchemaRoute
 from models.enums import RoleEnum as R
 from models.schemas import (
     CategoryCreateSchema,
@@ -10,7 +11,9 @@ from models.schemas import (
     ResponseSchema,
 )
 
-router = APIRouter(prefix="/categories", tags=["Category"])
+router = APIRouter(
+    prefix="/categories", tags=["Category"], route_class=ResponseSchemaRoute
+)
 
 
 @router.post(
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, Path
 
 from app.api.controllers.auth_controller import has_role
 from app.api.controllers.currency_exchange_controller import CurrencyExchangeController
+from commons.responses import ResponseSchemaRoute
 from models.enums import RoleEnum as R
 from models.schemas import (
     CurrencyExchangeCreateSchema,
@@ -10,7 +11,9 @@ from models.schemas import (
     ResponseSchema,
 )
 
-router = APIRouter(prefix="/currency-exchanges", tags=["CurrencyExchange"])
+router = APIRouter(
+    prefix="/currency-exchanges", tags=["CurrencyExchange"], route_class=ResponseSchemaRoute
+)
 
 
 @router.post(
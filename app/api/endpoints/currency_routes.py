@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, Path
+from fastapi import APIRouter, Depends, Path, Request, Response, status
 
 from app.api.controllers.auth_controller import has_role
 from app.api.controllers.currency_controller import CurrencyController
+from commons.responses import (
+    ResponseSchemaJSONResponse,
+    ResponseSchemaRoute,
+    etag_matches,
+)
 from models.enums import RoleEnum as R
 from models.schemas import (
     CurrencyCreateSchema,
@@ -10,21 +15,35 @@ from models.schemas import (
     ResponseSchema,
 )
 
-router = APIRouter(prefix="/currencies", tags=["Currency"])
+router = APIRouter(
+    prefix="/currencies", tags=["Currency"], route_class=ResponseSchemaRoute
+)
 
 
 @router.get("/predefined", response_model=ResponseSchema)
-async def read_predefined_currencies_route() -> ResponseSchema:
+async def read_predefined_currencies_route(request: Request) -> ResponseSchema:
     """
     Retrieve predefined currencies.
 
+    The response carries an ETag. A request whose If-None-Match matches it gets
+    an empty 304 Not Modified response instead.
+
+    Args:
+        request (Request): The incoming request, for its If-None-Match header.
+
     Returns:
         ResponseSchema: The response containing predefined currencies and a success message.
     """
-    currencies = await CurrencyController.get_predefined_currencies()
-    return ResponseSchema(
-        data={"currencies": currencies},
-        message="Predefined currencies retrieved successfully",
+    currencies, etag = await CurrencyController.get_predefined_currencies()
+    headers = {"ETag": etag}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return ResponseSchemaJSONResponse(
+        ResponseSchema(
+            data={"currencies": currencies},
+            message="Predefined currencies retrieved successfully",
+        ),
+        headers=headers,
     )
 
 
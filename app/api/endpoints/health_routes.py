@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, status
+
+from app.api.controllers.auth_controller import has_role
+from app.api.controllers.health_controller import HealthController
+from commons.responses import ResponseSchemaJSONResponse, ResponseSchemaRoute
+from models.enums import RoleEnum as R
+from models.schemas import ErrorResponseModel, ResponseSchema
+
+router = APIRouter(tags=["Health"], route_class=ResponseSchemaRoute)
+
+
+@router.get("/healthz", response_model=ResponseSchema)
+async def liveness_route() -> ResponseSchema:
+    """
+    Liveness probe, answered as long as the worker's event loop is running.
+
+    It doesn't touch the database, so a worker isn't restarted because the
+    database is unreachable.
+
+    Returns:
+        ResponseSchema: The response containing the worker status.
+    """
+    return ResponseSchema(data={"status": "alive"}, message="Service is alive")
+
+
+@router.get(
+    "/readyz",
+    response_model=ResponseSchema,
+    responses={
+        200: {"model": ResponseSchema, "description": "Ready to serve traffic"},
+        503: {"model": ResponseSchema, "description": "Not ready yet"},
+    },
+)
+async def readiness_route() -> ResponseSchema:
+    """
+    Readiness probe, successful once the database is reachable, its indexes are
+    ensured and the predefined entities are seeded.
+
+    Returns:
+        ResponseSchema: The response containing the result of every check, with
+            a 503 status code if any of them failed.
+    """
+    checks = await HealthController.get_readiness()
+    if all(checks.values()):
+        return ResponseSchema(data={"checks": checks}, message="Service is ready")
+    return ResponseSchemaJSONResponse(
+        ResponseSchema(data={"checks": checks}, message="Service is not ready"),
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
+
+@router.get(
+    "/metrics",
+    response_model=ResponseSchema,
+    responses={
+        200: {"model": ResponseSchema, "description": "Successful Response"},
+        403: {"model": ErrorResponseModel, "description": "Forbidden"},
+    },
+)
+async def read_metrics_route(user=Depends(has_role(R.ADMIN))) -> ResponseSchema:
+    """
+    Retrieve the runtime metrics of the worker serving the request.
+
+    Args:
+        user (User): The current user, injected by dependency. Must be an admin.
+
+    Returns:
+        ResponseSchema: The response containing the database connection pool and
+            password executor metrics.
+    """
+    metrics = HealthController.get_metrics()
+    return ResponseSchema(data=metrics, message="Metrics retrieved successfully")
@@ -1,20 +1,29 @@
 from fastapi import APIRouter, Depends, Path, Query
+from fastapi.responses import StreamingResponse
 
 from app.api.controllers.auth_controller import has_role
 from app.api.controllers.transaction_controller import TransactionController
 from app.api.controllers.user_app_data_controller import UserAppDataController
 from app.api.controllers.wallet_controller import WalletController
+from commons.responses import ResponseSchemaRoute
+from models.enums import ExportFormatEnum as E
 from models.enums import RoleEnum as R
 from models.schemas import (
     ErrorResponseModel,
+    PaginationParams,
     ResponseSchema,
     TransactionCreateSchema,
+    TransactionExportParams,
     TransactionFilterParams,
+    TransactionImportSchema,
+    TransactionSeriesParams,
     TransactionStatisticsParams,
     TransactionUpdateSchema,
 )
 
-router = APIRouter(prefix="/transactions", tags=["Transaction"])
+router = APIRouter(
+    prefix="/transactions", tags=["Transaction"], route_class=ResponseSchemaRoute
+)
 
 
 @router.post(
@@ -50,22 +59,55 @@ async def create_transaction_route(
     return ResponseSchema(data=data, message=message)
 
 
+@router.post(
+    "/import",
+    response_model=ResponseSchema,
+    responses={
+        200: {"model": ResponseSchema, "description": "Successful Response"},
+        400: {"model": ErrorResponseModel, "description": "Bad Request"},
+    },
+)
+async def import_transactions_route(
+    import_schema: TransactionImportSchema, user=Depends(has_role(R.USER))
+) -> ResponseSchema:
+    """
+    Create a batch of transactions at once and adjust wallet balances.
+
+    The batch is validated as a whole; if any transaction is invalid, none is created.
+
+    Args:
+        import_schema (TransactionImportSchema): The schema containing the transactions to create.
+        user (User): The current user, injected by dependency.
+
+    Returns:
+        ResponseSchema: The response containing the created transaction IDs and a success message.
+    """
+    transactions = await TransactionController.import_transactions(import_schema, user)
+    await UserAppDataController.handle_transactions_import_user_app_data_wallet_value_update(
+        transactions, user
+    )
+
+    message = "Transactions imported successfully"
+    data = {"ids": [str(transaction.id) for transaction in transactions]}
+    return ResponseSchema(data=data, message=message)
+
+
 @router.get("/filter", response_model=ResponseSchema)
 async def filter_transactions_route(
     params: TransactionFilterParams = Query(...),
     user=Depends(has_role(R.USER)),
 ) -> ResponseSchema:
     """
-    Retrieve transactions based on specified filters.
+    Retrieve a page of transactions based on specified filters, newest first.
 
     Args:
-        params (TransactionFilterParams): The filters to apply to the transaction retrieval.
+        params (TransactionFilterParams): The filters and pagination to apply to the transaction retrieval.
         user (User): The current user, injected by dependency.
 
     Returns:
-        ResponseSchema: The response containing the filtered transactions and a success message.
+        ResponseSchema: The response containing the filtered transactions, the next page cursor and a success message.
     """
-    transactions = await TransactionController.filter_transactions(
+    transactions, next_cursor = await TransactionController.filter_transactions(
         user.id,
         params.start_date,
         params.end_date,
@@ -73,13 +115,64 @@ async def filter_transactions_route(
         params.category_id,
         params.from_wallet_id,
         params.to_wallet_id,
+        params.limit,
+        params.cursor,
     )
     return ResponseSchema(
-        data={"transactions": transactions},
+        data={"transactions": transactions, "next_cursor": next_cursor},
         message="Filtered transactions retrieved successfully",
     )
 
 
+EXPORT_MEDIA_TYPES = {
+    E.NDJSON: "application/x-ndjson",
+    E.CSV: "text/csv",
+}
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in EXPORT_MEDIA_TYPES.values()},
+            "description": "The filtered transactions, newest first",
+        },
+    },
+)
+async def export_transactions_route(
+    params: TransactionExportParams = Query(...),
+    user=Depends(has_role(R.USER)),
+) -> StreamingResponse:
+    """
+    Export the filtered transactions of the user as a NDJSON or CSV stream.
+
+    Args:
+        params (TransactionExportParams): The filters and the export format.
+        user (User): The current user, injected by dependency.
+
+    Returns:
+        StreamingResponse: The streamed transactions as an attachment.
+    """
+    chunks = TransactionController.export_transactions(
+        user.id,
+        params.format.value,
+        params.start_date,
+        params.end_date,
+        params.transaction_type,
+        params.category_id,
+        params.from_wallet_id,
+        params.to_wallet_id,
+    )
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[params.format],
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{params.format.value}"'
+        },
+    )
+
+
 @router.get("/statistics", response_model=ResponseSchema)
 async def transaction_statistics_route(
     params: TransactionStatisticsParams = Query(...),
@@ -104,6 +197,36 @@ async def transaction_statistics_route(
     )
 
 
+@router.get("/statistics/series", response_model=ResponseSchema)
+async def transaction_statistics_series_route(
+    params: TransactionSeriesParams = Query(...),
+    user=Depends(has_role(R.USER)),
+) -> ResponseSchema:
+    """
+    Calculate income, expense and net balance series bucketed by day, week or month.
+
+    Periods are labelled as YYYY-MM-DD, YYYY-Www (ISO week) or YYYY-MM in UTC.
+
+    Args:
+        params (TransactionSeriesParams): The date range, interval and category split.
+        user (User): The current user, injected by dependency.
+
+    Returns:
+        ResponseSchema: The response containing the statistics series and a success message.
+    """
+    series = await TransactionController.calculate_statistics_series(
+        user.id,
+        params.interval.value,
+        params.start_date,
+        params.end_date,
+        params.split_by_category,
+    )
+    return ResponseSchema(
+        data={"series": series},
+        message="Transaction statistics series retrieved successfully",
+    )
+
+
 @router.get("/{transaction_id}", response_model=ResponseSchema)
 async def read_transaction_route(
     transaction_id: str = Path(
@@ -128,19 +251,28 @@ async def read_transaction_route(
 
 
 @router.get("", response_model=ResponseSchema)
-async def read_all_transactions_route(user=Depends(has_role(R.USER))) -> ResponseSchema:
+async def read_all_transactions_route(
+    params: PaginationParams = Query(...),
+    user=Depends(has_role(R.USER)),
+) -> ResponseSchema:
     """
-    Retrieve all transactions for the user.
+    Retrieve a page of the user's transactions, newest first.
+
+    Pass the returned next_cursor as cursor to get the following page; it is
+    null on the last page.
 
     Args:
+        params (PaginationParams): The page size and cursor.
         user (User): The current user, injected by dependency.
 
     Returns:
-        ResponseSchema: The response containing all transactions and a success message.
+        ResponseSchema: The response containing the transactions, the next page cursor and a success message.
     """
-    transactions = await TransactionController.get_all_transactions(user.id)
+    transactions, next_cursor = await TransactionController.get_all_transactions(
+        user.id, params.limit, params.cursor
+    )
     return ResponseSchema(
-        data={"transactions": transactions},
+        data={"transactions": transactions, "next_cursor": next_cursor},
         message="Transactions retrieved successfully",
     )
 
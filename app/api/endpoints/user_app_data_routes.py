@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, Path
 
-from app.api.controllers.asset_controller import AssetController
 from app.api.controllers.auth_controller import has_role
+from app.api.controllers.net_worth_controller import NetWorthController
 from app.api.controllers.user_app_data_controller import UserAppDataController
-from app.api.controllers.wallet_controller import WalletController
+from commons.responses import ResponseSchemaRoute
 from models.enums import RoleEnum as R
 from models.schemas import ResponseSchema
 
-router = APIRouter(prefix="/user-app-data", tags=["UserAppData"])
+router = APIRouter(
+    prefix="/user-app-data", tags=["UserAppData"], route_class=ResponseSchemaRoute
+)
 
 
 @router.post("/change-base-currency/{currency_id}", response_model=ResponseSchema)
@@ -29,13 +31,10 @@ async def change_base_currency_by_id_route(
     """
     await UserAppDataController.change_base_currency_by_id(user, currency_id)
 
-    total_wallets_value = await WalletController.calculate_total_wallet_value(user)
-    total_assets_value = await AssetController.calculate_total_asset_value(user)
-    net_worth = total_wallets_value + total_assets_value
-    result = await UserAppDataController.update_user_app_data_net_worth(user, net_worth)
+    user_app_data = await NetWorthController.calculate_net_worth(user)
 
     return ResponseSchema(
-        data=result,
+        data=user_app_data.to_dict(),
         message="Base currency changed successfully",
     )
 
@@ -51,14 +50,10 @@ async def calculate_net_worth_route(user=Depends(has_role(R.USER))) -> ResponseS
     Returns:
         ResponseSchema: The response containing the calculated net worth and a success message.
     """
-    total_wallets_value = await WalletController.calculate_total_wallet_value(user)
-    total_assets_value = await AssetController.calculate_total_asset_value(user)
-    net_worth = total_wallets_value + total_assets_value
-
-    await UserAppDataController.update_user_app_data_net_worth(user, net_worth)
+    user_app_data = await NetWorthController.calculate_net_worth(user)
 
     return ResponseSchema(
-        data={"net_worth": net_worth},
+        data={"net_worth": user_app_data.net_worth},
         message="Net worth calculated successfully",
     )
 
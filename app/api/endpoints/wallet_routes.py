@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, Path
 
 from app.api.controllers.auth_controller import has_role
 from app.api.controllers.wallet_controller import WalletController
+from commons.responses import ResponseSchemaRoute
 from models.enums import RoleEnum as R
 from models.schemas import (
     BalanceSchema,
@@ -11,7 +12,7 @@ from models.schemas import (
     WalletUpdateSchema,
 )
 
-router = APIRouter(prefix="/wallets", tags=["Wallet"])
+router = APIRouter(prefix="/wallets", tags=["Wallet"], route_class=ResponseSchemaRoute)
 
 
 @router.post(
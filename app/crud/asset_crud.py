@@ -1,8 +1,12 @@
 from datetime import datetime, timezone
-from typing import List
+from decimal import Decimal
+from typing import Dict, List
 
-from mongoengine import DoesNotExist, Q, QuerySet
+from bson import ObjectId
+from mongoengine import DoesNotExist, Q
 
+from database.async_database import aggregate, find_documents, get_document
+from database.db_executor import run_in_db_executor
 from models.models import Asset
 from models.schemas import AssetFilterSchema
 
@@ -12,16 +16,37 @@ class AssetCRUD:
     @classmethod
     async def create_one(cls, asset: Asset) -> Asset:
         asset.clean()
-        asset.save()
+        await run_in_db_executor(asset.save)
         return asset
 
     @classmethod
     async def get_one_by_user(cls, asset_id: str, user_id: str) -> Asset:
-        return Asset.objects.get(id=asset_id, user_id=user_id)
+        return await get_document(Asset.objects(id=asset_id, user_id=user_id))
 
     @classmethod
-    async def get_all_by_user_id(cls, user_id: str) -> QuerySet:
-        return Asset.objects(user_id=user_id)
+    async def get_all_raw_by_user_id(cls, user_id: str) -> List[dict]:
+        """Read-only: the user's assets as raw dicts, for serialization."""
+        return await find_documents(Asset.objects(user_id=user_id).as_pymongo())
+
+    @classmethod
+    async def get_value_totals_by_currency(
+        cls, user_id: str
+    ) -> Dict[ObjectId, Decimal]:
+        """Sum the values of all the user's assets per currency in one query."""
+        pipeline = [
+            {"$match": Asset.objects(user_id=user_id)._query},
+            {
+                "$group": {
+                    "_id": "$currency_id",
+                    "total": {"$sum": {"$toDecimal": "$value"}},
+                }
+            },
+        ]
+        value_field = Asset._fields["value"]
+        return {
+            row["_id"]: value_field.to_python(row["total"])
+            for row in await aggregate(Asset, pipeline)
+        }
 
     @classmethod
     async def update_one_by_user(
@@ -31,11 +56,13 @@ class AssetCRUD:
         cls._update_asset_fields(asset, updated_asset)
         cls._update_timestamp(asset)
         asset.clean()
-        asset.save()
+        await run_in_db_executor(asset.save)
 
     @classmethod
     async def delete_one_by_user(cls, asset_id: str, user_id: str) -> bool:
-        result = Asset.objects(id=asset_id, user_id=user_id).delete()
+        result = await run_in_db_executor(
+            Asset.objects(id=asset_id, user_id=user_id).delete
+        )
         if result == 0:
             raise DoesNotExist(
                 f"Asset with id {asset_id} for user {user_id} does not exist"
@@ -43,9 +70,10 @@ class AssetCRUD:
         return result > 0
 
     @classmethod
-    async def get_filtered_assets(
+    async def get_filtered_raw_assets(
         cls, filters: AssetFilterSchema, user_id: str
-    ) -> List[Asset]:
+    ) -> List[dict]:
+        """Read-only: the matching assets as raw dicts, for serialization."""
         query = Q(user_id=user_id)
 
         if filters.name:
@@ -63,7 +91,7 @@ class AssetCRUD:
         if filters.updated_at_end:
             query &= Q(updated_at__lte=filters.updated_at_end)
 
-        return list(Asset.objects(query))
+        return await find_documents(Asset.objects(query).as_pymongo())
 
     @staticmethod
     def _update_asset_fields(asset: Asset, updated_asset: Asset) -> None:
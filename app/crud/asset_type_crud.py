@@ -1,8 +1,12 @@
 from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional
 
-from mongoengine import DoesNotExist, Q, QuerySet
+from mongoengine import DoesNotExist, Q
 
+from app.crud.predefined_registry import PredefinedRegistry
+from app.crud.reference_data_cache import ReferenceDataCache
+from database.async_database import find_documents, find_first_document, get_document
+from database.db_executor import run_in_db_executor
 from models.models import AssetType
 
 
@@ -10,28 +14,50 @@ class AssetTypeCRUD:
 
     @classmethod
     async def create_one(cls, asset_type: AssetType) -> AssetType:
-        asset_type.clean()
-        asset_type.save()
+        await run_in_db_executor(asset_type.clean)
+        await run_in_db_executor(asset_type.save)
         return asset_type
 
     @classmethod
     async def get_one_by_user(cls, asset_type_id: str, user_id: str) -> AssetType:
-        return AssetType.objects.get(
-            (Q(id=asset_type_id) & Q(user_id=user_id))
-            | Q(id=asset_type_id, is_predefined=True)
+        predefined = PredefinedRegistry.get_one(AssetType, asset_type_id)
+        if predefined is not None:
+            return predefined
+        return await get_document(
+            AssetType.objects(
+                (Q(id=asset_type_id) & Q(user_id=user_id))
+                | Q(id=asset_type_id, is_predefined=True)
+            )
+        )
+
+    @classmethod
+    async def get_one_by_user_cached(
+        cls, asset_type_id: str, user_id: str
+    ) -> AssetType:
+        """Like ``get_one_by_user``, served from ReferenceDataCache.
+
+        Meant for validation, don't save the returned document.
+        """
+        return await ReferenceDataCache.get_one_by_user(
+            AssetType, asset_type_id, user_id
         )
 
     @staticmethod
     async def get_one_by_user_and_name_optional(
         name: str, user_id: str
     ) -> Optional[AssetType]:
-        return AssetType.objects(
-            (Q(name=name) & Q(user_id=user_id)) | Q(name=name, is_predefined=True)
-        ).first()
+        return await find_first_document(
+            AssetType.objects(
+                (Q(name=name) & Q(user_id=user_id)) | Q(name=name, is_predefined=True)
+            )
+        )
 
     @classmethod
-    async def get_all_by_user_id(cls, user_id: str) -> QuerySet:
-        return AssetType.objects(Q(is_predefined=True) | Q(user_id=user_id))
+    async def get_all_raw_by_user_id(cls, user_id: str) -> List[dict]:
+        """Read-only: the predefined and the user's asset types as raw dicts."""
+        return await find_documents(
+            AssetType.objects(Q(is_predefined=True) | Q(user_id=user_id)).as_pymongo()
+        )
 
     @classmethod
     async def update_one_by_user(
@@ -40,12 +66,14 @@ class AssetTypeCRUD:
         asset_type = await cls.get_one_by_user(asset_type_id, user_id)
         cls._update_asset_type_fields(asset_type, updated_asset_type)
         cls._update_timestamp(asset_type)
-        asset_type.clean()
-        asset_type.save()
+        await run_in_db_executor(asset_type.clean)
+        await run_in_db_executor(asset_type.save)
 
     @classmethod
     async def delete_one_by_user(cls, asset_type_id: str, user_id: str) -> bool:
-        result = AssetType.objects(id=asset_type_id, user_id=user_id).delete()
+        result = await run_in_db_executor(
+            AssetType.objects(id=asset_type_id, user_id=user_id).delete
+        )
         if result == 0:
             raise DoesNotExist(
                 f"AssetType with id {asset_type_id} for user {user_id} does not exist"
@@ -1,47 +1,163 @@
-from typing import Optional
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 
-from mongoengine import DoesNotExist
+from bson import ObjectId
+from mongoengine import DoesNotExist, ValidationError
+from pymongo.asynchronous.client_session import AsyncClientSession
 
+from app.crud.wallet_aggregate import WalletAggregate
+from database.async_database import (
+    delete_documents,
+    find_documents,
+    find_first_document,
+    find_raw_documents,
+    get_document,
+    insert_documents,
+    rounded_increment,
+    update_document,
+)
+from database.db_executor import run_in_db_executor
 from models.models import Balance
 
 
 class BalanceCRUD:
 
     @classmethod
-    async def create_one(cls, balance: Balance) -> Balance:
-        balance.clean()
-        balance.save()
+    async def create_one(
+        cls, balance: Balance, session: Optional[AsyncClientSession] = None
+    ) -> Balance:
+        balance.validate()
+        await insert_documents([balance], session)
+        await WalletAggregate.balances_added(balance.wallet_id.pk, [balance], session)
         return balance
 
+    @classmethod
+    async def create_many(
+        cls, wallet_id: ObjectId, balances: List[Balance]
+    ) -> List[Balance]:
+        """Insert all balances of a wallet with one insert and one wallet update."""
+        currency_ids = [balance.currency_id.pk for balance in balances]
+        if len(set(currency_ids)) != len(currency_ids):
+            raise ValidationError("A wallet can't have two balances of one currency")
+
+        for balance in balances:
+            balance.wallet_id = wallet_id
+            balance.validate()
+        await insert_documents(balances)
+        await WalletAggregate.balances_added(wallet_id, balances)
+        return balances
+
     @classmethod
     async def update_one(cls, balance: Balance, update_data: dict) -> Balance:
         if not update_data:
             raise ValueError("No update parameters provided")
 
-        existing_balance: Balance = Balance.objects.get(id=balance.id)
+        existing_balance: Balance = await get_document(Balance.objects(id=balance.id))
+        previous_amount = existing_balance.amount
 
         # Update the fields of the existing balance
         for key, value in update_data.items():
             setattr(existing_balance, key, value)
 
-        existing_balance.save()
+        await run_in_db_executor(existing_balance.save)
+        await WalletAggregate.total_values_changed(
+            {existing_balance.wallet_id.pk: existing_balance.amount - previous_amount}
+        )
 
         # Return the updated balance
-        return Balance.objects.get(id=balance.id)
+        return await get_document(Balance.objects(id=balance.id))
 
     @classmethod
     async def get_one_by_wallet_and_currency_id_optional(
-        cls, wallet_id: str, currency_id: str
+        cls,
+        wallet_id: str,
+        currency_id: str,
+        session: Optional[AsyncClientSession] = None,
     ) -> Optional[Balance]:
-        return Balance.objects(wallet_id=wallet_id, currency_id=currency_id).first()
+        return await find_first_document(
+            Balance.objects(wallet_id=wallet_id, currency_id=currency_id), session
+        )
+
+    @classmethod
+    async def get_all_by_ids(cls, balance_ids: List[ObjectId]) -> List[Balance]:
+        """The balances with the ids in one query, in the order of ``balance_ids``."""
+        balances = await find_documents(Balance.objects(id__in=balance_ids))
+        balances_by_id = {balance.id: balance for balance in balances}
+        return [
+            balances_by_id[balance_id]
+            for balance_id in balance_ids
+            if balance_id in balances_by_id
+        ]
+
+    @classmethod
+    async def get_all_raw_by_wallet_ids(cls, wallet_ids: List[ObjectId]) -> List[dict]:
+        """Read-only: the balances of all the wallets as raw dicts, in one query."""
+        return await find_documents(
+            Balance.objects(wallet_id__in=wallet_ids).as_pymongo()
+        )
+
+    @classmethod
+    async def get_amounts_by_wallet_ids(
+        cls, wallet_ids: List[ObjectId]
+    ) -> Dict[Tuple[ObjectId, ObjectId], Decimal]:
+        """Map (wallet_id, currency_id) to the balance amount in one query."""
+        balances = await find_raw_documents(
+            Balance.objects(wallet_id__in=wallet_ids).only(
+                "wallet_id", "currency_id", "amount"
+            )
+        )
+        amount_field = Balance._fields["amount"]
+        return {
+            (balance["wallet_id"], balance["currency_id"]): amount_field.to_python(
+                balance["amount"]
+            )
+            for balance in balances
+        }
+
+    @classmethod
+    async def increment_amount(
+        cls,
+        wallet_id: ObjectId,
+        currency_id: ObjectId,
+        delta: Decimal,
+        session: Optional[AsyncClientSession] = None,
+    ) -> bool:
+        """Atomically add ``delta`` to a balance unless the result would be negative.
+
+        The new amount is rounded to the field precision, both when stored and
+        when checked, so the whole displayed amount can always be spent.
+
+        The wallet's ``total_value`` has to be adjusted by the caller through
+        ``WalletAggregate``, so increments of one wallet can be batched.
+        """
+        amount = rounded_increment(Balance, "amount", delta)
+        return await update_document(
+            Balance.objects(
+                wallet_id=wallet_id,
+                currency_id=currency_id,
+                __raw__={"$expr": {"$gte": [amount, 0]}},
+            ),
+            [{"$set": {"amount": amount}}],
+            session,
+        )
 
     @classmethod
     async def delete_one_by_wallet_and_currency_id(
-        cls, wallet_id: str, currency_id: str
+        cls,
+        wallet_id: str,
+        currency_id: str,
+        session: Optional[AsyncClientSession] = None,
     ) -> bool:
-        result = Balance.objects(wallet_id=wallet_id, currency_id=currency_id).delete()
-        if result == 0:
+        balance = await cls.get_one_by_wallet_and_currency_id_optional(
+            wallet_id, currency_id, session
+        )
+        if balance is None:
             raise DoesNotExist(
                 f"Balance with wallet_id of {wallet_id} and currency_id of {currency_id} does not exist"
             )
+        result = await delete_documents(Balance.objects(id=balance.id), session)
+        if result > 0:
+            await WalletAggregate.balances_removed(
+                balance.wallet_id.pk, [balance], session
+            )
         return result > 0
@@ -1,7 +1,17 @@
-from typing import Optional
+from typing import List, Optional, Set
 
-from mongoengine import DoesNotExist, Q, QuerySet
+from bson import ObjectId
+from mongoengine import DoesNotExist, Q
 
+from app.crud.predefined_registry import PredefinedRegistry
+from app.crud.reference_data_cache import ReferenceDataCache
+from database.async_database import (
+    find_documents,
+    find_first_document,
+    find_raw_documents,
+    get_document,
+)
+from database.db_executor import run_in_db_executor
 from models.models import Category
 
 
@@ -9,28 +19,59 @@ class CategoryCRUD:
 
     @classmethod
     async def create_one(cls, category: Category) -> Category:
-        category.clean()
-        category.save()
+        await run_in_db_executor(category.clean)
+        await run_in_db_executor(category.save)
         return category
 
     @classmethod
     async def get_one_by_user(cls, category_id: str, user_id: str) -> Category:
-        return Category.objects.get(
-            (Q(id=category_id) & Q(user_id=user_id))
-            | Q(id=category_id, is_predefined=True)
+        predefined = PredefinedRegistry.get_one(Category, category_id)
+        if predefined is not None:
+            return predefined
+        return await get_document(
+            Category.objects(
+                (Q(id=category_id) & Q(user_id=user_id))
+                | Q(id=category_id, is_predefined=True)
+            )
         )
 
+    @classmethod
+    async def get_one_by_user_cached(cls, category_id: str, user_id: str) -> Category:
+        """Like ``get_one_by_user``, served from ReferenceDataCache.
+
+        Meant for validation, don't save the returned document.
+        """
+        return await ReferenceDataCache.get_one_by_user(Category, category_id, user_id)
+
+    @classmethod
+    async def get_existing_ids_by_user(
+        cls, category_ids: List[str], user_id: str
+    ) -> Set[ObjectId]:
+        """Return which of the given categories the user may use, in one query."""
+        categories = await find_raw_documents(
+            Category.objects(
+                (Q(id__in=category_ids) & Q(user_id=user_id))
+                | Q(id__in=category_ids, is_predefined=True)
+            ).only("id")
+        )
+        return {category["_id"] for category in categories}
+
     @staticmethod
     async def get_one_by_user_and_name_optional(
         name: str, user_id: str
     ) -> Optional[Category]:
-        return Category.objects(
-            (Q(name=name) & Q(user_id=user_id)) | Q(name=name, is_predefined=True)
-        ).first()
+        return await find_first_document(
+            Category.objects(
+                (Q(name=name) & Q(user_id=user_id)) | Q(name=name, is_predefined=True)
+            )
+        )
 
     @classmethod
-    async def get_all_by_user_id(cls, user_id: str) -> QuerySet:
-        return Category.objects(Q(is_predefined=True) | Q(user_id=user_id))
+    async def get_all_raw_by_user_id(cls, user_id: str) -> List[dict]:
+        """Read-only: the predefined and the user's categories as raw dicts."""
+        return await find_documents(
+            Category.objects(Q(is_predefined=True) | Q(user_id=user_id)).as_pymongo()
+        )
 
     @classmethod
     async def update_one_by_user(
@@ -38,12 +79,14 @@ class CategoryCRUD:
     ) -> None:
         category = await cls.get_one_by_user(category_id, user_id)
         cls.__update_category_fields(category, updated_category)
-        category.clean()
-        category.save()
+        await run_in_db_executor(category.clean)
+        await run_in_db_executor(category.save)
 
     @classmethod
     async def delete_one_by_user(cls, category_id: str, user_id: str) -> bool:
-        result = Category.objects(id=category_id, user_id=user_id).delete()
+        result = await run_in_db_executor(
+            Category.objects(id=category_id, user_id=user_id).delete
+        )
         if result == 0:
             raise DoesNotExist(
                 f"Category with id {category_id} for user {user_id} does not exist"
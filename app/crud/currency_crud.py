@@ -1,8 +1,11 @@
-from typing import Optional
+from typing import List, Optional
 
-from bson import ObjectId
-from mongoengine import DoesNotExist, Q, QuerySet
+from mongoengine import DoesNotExist, Q
 
+from app.crud.predefined_registry import PredefinedEntities, PredefinedRegistry
+from app.crud.reference_data_cache import ReferenceDataCache
+from database.async_database import find_documents, find_first_document, get_document
+from database.db_executor import run_in_db_executor
 from models.models import Currency
 
 
@@ -10,36 +13,51 @@ class CurrencyCRUD:
 
     @classmethod
     async def create_one(cls, currency: Currency) -> Currency:
-        currency.clean()
-        currency.save()
+        await run_in_db_executor(currency.clean)
+        await run_in_db_executor(currency.save)
         return currency
 
-    @classmethod
-    async def get_one_by_id(cls, currency_id: str) -> Currency:
-        return Currency.objects.get(pk=ObjectId(currency_id))
-
     @classmethod
     async def get_one_by_user(cls, currency_id: str, user_id: str) -> Currency:
-        return Currency.objects.get(
-            (Q(id=currency_id) & Q(user_id=user_id))
-            | Q(id=currency_id, is_predefined=True)
+        predefined = PredefinedRegistry.get_one(Currency, currency_id)
+        if predefined is not None:
+            return predefined
+        return await get_document(
+            Currency.objects(
+                (Q(id=currency_id) & Q(user_id=user_id))
+                | Q(id=currency_id, is_predefined=True)
+            )
         )
 
+    @classmethod
+    async def get_one_by_user_cached(cls, currency_id: str, user_id: str) -> Currency:
+        """Like ``get_one_by_user``, served from ReferenceDataCache.
+
+        Meant for validation, don't save the returned document.
+        """
+        return await ReferenceDataCache.get_one_by_user(Currency, currency_id, user_id)
+
     @staticmethod
     async def get_one_by_user_and_code_optional(
         code: str, user_id: str
     ) -> Optional[Currency]:
-        return Currency.objects(
-            (Q(code=code) & Q(user_id=user_id)) | Q(code=code, is_predefined=True)
-        ).first()
+        return await find_first_document(
+            Currency.objects(
+                (Q(code=code) & Q(user_id=user_id)) | Q(code=code, is_predefined=True)
+            )
+        )
 
     @classmethod
-    async def get_all_by_user_id(cls, user_id: str) -> QuerySet:
-        return Currency.objects(Q(is_predefined=True) | Q(user_id=user_id))
+    async def get_all_raw_by_user_id(cls, user_id: str) -> List[dict]:
+        """Read-only: the predefined and the user's currencies as raw dicts."""
+        return await find_documents(
+            Currency.objects(Q(is_predefined=True) | Q(user_id=user_id)).as_pymongo()
+        )
 
     @classmethod
-    async def get_all_predefined(cls) -> QuerySet:
-        return Currency.objects(is_predefined=True)
+    async def get_all_predefined(cls) -> PredefinedEntities:
+        """Read-only: the predefined currencies, from the PredefinedRegistry."""
+        return await PredefinedRegistry.get_all(Currency)
 
     @classmethod
     async def update_one_by_user(
@@ -47,12 +65,14 @@ class CurrencyCRUD:
     ) -> None:
         currency = await cls.get_one_by_user(currency_id, user_id)
         cls.__update_currency_fields(currency, updated_currency)
-        currency.clean()
-        currency.save()
+        await run_in_db_executor(currency.clean)
+        await run_in_db_executor(currency.save)
 
     @classmethod
     async def delete_one_by_user(cls, currency_id: str, user_id: str) -> bool:
-        result = Currency.objects(id=currency_id, user_id=user_id).delete()
+        result = await run_in_db_executor(
+            Currency.objects(id=currency_id, user_id=user_id).delete
+        )
         if result == 0:
             raise DoesNotExist(
                 f"Currency with id {currency_id} for user {user_id} does not exist"
@@ -1,9 +1,12 @@
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, List
 
 from bson import ObjectId
-from mongoengine import DoesNotExist, QuerySet
+from mongoengine import DoesNotExist
 
+from app.crud.exchange_rate_graph import ExchangeRateGraphCache
+from database.async_database import find_documents, get_document
+from database.db_executor import run_in_db_executor
 from models.models import CurrencyExchange
 
 
@@ -11,16 +14,21 @@ class CurrencyExchangeCRUD:
 
     @classmethod
     async def create_one(cls, exchange: CurrencyExchange) -> CurrencyExchange:
-        exchange.save()
+        await run_in_db_executor(exchange.save)
         return exchange
 
     @classmethod
     async def get_one_by_user(cls, exchange_id: str, user_id: str) -> CurrencyExchange:
-        return CurrencyExchange.objects.get(id=exchange_id, user_id=user_id)
+        return await get_document(
+            CurrencyExchange.objects(id=exchange_id, user_id=user_id)
+        )
 
     @classmethod
-    async def get_all_by_user_id(cls, user_id: str) -> QuerySet:
-        return CurrencyExchange.objects(user_id=user_id)
+    async def get_all_raw_by_user_id(cls, user_id: str) -> List[dict]:
+        """Read-only: the user's exchange rates as raw dicts, for serialization."""
+        return await find_documents(
+            CurrencyExchange.objects(user_id=user_id).as_pymongo()
+        )
 
     @classmethod
     async def update_one_by_user(
@@ -28,11 +36,13 @@ class CurrencyExchangeCRUD:
     ) -> None:
         exchange = await cls.get_one_by_user(exchange_id, user_id)
         cls.__update_exchange_fields(exchange, updated_exchange)
-        exchange.save()
+        await run_in_db_executor(exchange.save)
 
     @classmethod
     async def delete_one_by_user(cls, exchange_id: str, user_id: str) -> bool:
-        result = CurrencyExchange.objects(id=exchange_id, user_id=user_id).delete()
+        result = await run_in_db_executor(
+            CurrencyExchange.objects(id=exchange_id, user_id=user_id).delete
+        )
         if result == 0:
             raise DoesNotExist(
                 f"CurrencyExchange with id {exchange_id} for user {user_id} does not exist"
@@ -43,20 +53,10 @@ class CurrencyExchangeCRUD:
     async def get_exchange_rate(
         cls, user_id: str, from_currency_id: ObjectId, to_currency_id: ObjectId
     ) -> Decimal:
-        direct_rate = await cls._get_direct_exchange_rate(
-            user_id, from_currency_id, to_currency_id
-        )
-        if direct_rate is not None:
-            return direct_rate
-
-        reverse_rate = await cls._get_reverse_exchange_rate(
-            user_id, from_currency_id, to_currency_id
-        )
-        if reverse_rate is not None:
-            return reverse_rate
-
-        if from_currency_id == to_currency_id:
-            return Decimal("1")
+        graph = await ExchangeRateGraphCache.get_graph(user_id)
+        rate = graph.get_rate(from_currency_id, to_currency_id)
+        if rate is not None:
+            return rate
 
         raise DoesNotExist(
             f"No exchange rate found for currencies {from_currency_id} and {to_currency_id} for user {user_id}."
@@ -66,18 +66,8 @@ class CurrencyExchangeCRUD:
     async def exchange_rate_exists(
         cls, user_id: str, from_currency_id: str, to_currency_id: str
     ) -> bool:
-        return (
-            CurrencyExchange.objects(
-                user_id=user_id,
-                from_currency_id=from_currency_id,
-                to_currency_id=to_currency_id,
-            ).first()
-            or CurrencyExchange.objects(
-                user_id=user_id,
-                from_currency_id=to_currency_id,
-                to_currency_id=from_currency_id,
-            ).first()
-        ) is not None
+        graph = await ExchangeRateGraphCache.get_graph(user_id)
+        return graph.get_rate(from_currency_id, to_currency_id) is not None
 
     @classmethod
     async def convert_value_to_base_currency(
@@ -95,36 +85,18 @@ class CurrencyExchangeCRUD:
         return amount * exchange_rate
 
     @classmethod
-    async def get_direct_exchange_optional(
-        cls, user_id: str, from_currency_id: ObjectId, to_currency_id: ObjectId
-    ) -> Optional[CurrencyExchange]:
-        return CurrencyExchange.objects(
-            user_id=user_id,
-            from_currency_id=from_currency_id,
-            to_currency_id=to_currency_id,
-        ).first()
-
-    @classmethod
-    async def _get_direct_exchange_rate(
-        cls, user_id: str, from_currency_id: ObjectId, to_currency_id: ObjectId
-    ) -> Optional[Decimal]:
-        direct_exchange = await cls.get_direct_exchange_optional(
-            user_id, from_currency_id, to_currency_id
-        )
-        if direct_exchange:
-            return Decimal(direct_exchange.rate)
-        return None
-
-    @classmethod
-    async def _get_reverse_exchange_rate(
-        cls, user_id: str, from_currency_id: str, to_currency_id: str
-    ) -> Optional[Decimal]:
-        reverse_exchange = await cls.get_direct_exchange_optional(
-            user_id, to_currency_id, from_currency_id
-        )
-        if reverse_exchange:
-            return Decimal("1") / Decimal(reverse_exchange.rate)
-        return None
+    async def convert_totals_to_base_currency(
+        cls,
+        totals_by_currency: Dict[ObjectId, Decimal],
+        base_currency_id: ObjectId,
+        user_id: str,
+    ) -> Decimal:
+        total_value = Decimal(0)
+        for currency_id, amount in totals_by_currency.items():
+            total_value += await cls.convert_value_to_base_currency(
+                amount, currency_id, base_currency_id, user_id
+            )
+        return total_value
 
     @staticmethod
     def __update_exchange_fields(
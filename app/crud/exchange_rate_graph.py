@@ -0,0 +1,134 @@
+import os
+import time
+from collections import OrderedDict, defaultdict, deque
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from bson import ObjectId
+from mongoengine import signals
+
+from database.async_database import find_raw_documents
+from models.models import CurrencyExchange
+
+EXCHANGE_RATE_CACHE_TTL_SECONDS = float(
+    os.getenv("EXCHANGE_RATE_CACHE_TTL_SECONDS", "300")
+)
+EXCHANGE_RATE_CACHE_MAX_SIZE = int(os.getenv("EXCHANGE_RATE_CACHE_MAX_SIZE", "10000"))
+
+
+def to_object_id(value) -> ObjectId:
+    """Normalize a currency/user reference (document, DBRef, str) to an ObjectId."""
+    value = getattr(value, "id", value)
+    return value if isinstance(value, ObjectId) else ObjectId(value)
+
+
+class ExchangeRateGraph:
+    """A user's exchange rates as a graph of currencies.
+
+    Every stored pair adds an edge in both directions (rate and 1/rate), so
+    conversions may follow any chain of pairs, e.g. BTC -> USD -> EUR.
+    """
+
+    def __init__(self, edges: Dict[ObjectId, Dict[ObjectId, Decimal]]):
+        self._edges = edges
+        self._resolved: Dict[Tuple[ObjectId, ObjectId], Optional[Decimal]] = {}
+
+    @classmethod
+    def from_exchanges(cls, exchanges: Iterable[dict]) -> "ExchangeRateGraph":
+        rate_field = CurrencyExchange._fields["rate"]
+        edges: Dict[ObjectId, Dict[ObjectId, Decimal]] = defaultdict(dict)
+        for exchange in exchanges:
+            from_id = exchange["from_currency_id"]
+            to_id = exchange["to_currency_id"]
+            rate = Decimal(rate_field.to_python(exchange["rate"]))
+            edges[from_id][to_id] = rate
+            edges[to_id][from_id] = Decimal("1") / rate
+        return cls(dict(edges))
+
+    def get_rate(self, from_currency_id, to_currency_id) -> Optional[Decimal]:
+        """Return the rate along the shortest chain of pairs, or None."""
+        from_id = to_object_id(from_currency_id)
+        to_id = to_object_id(to_currency_id)
+        if from_id == to_id:
+            return Decimal("1")
+        key = (from_id, to_id)
+        if key not in self._resolved:
+            self._resolved[key] = self._find_rate(from_id, to_id)
+        return self._resolved[key]
+
+    def _find_rate(self, from_id: ObjectId, to_id: ObjectId) -> Optional[Decimal]:
+        rates = {from_id: Decimal("1")}
+        queue = deque([from_id])
+        while queue:
+            current = queue.popleft()
+            for neighbour, rate in self._edges.get(current, {}).items():
+                if neighbour in rates:
+                    continue
+                rates[neighbour] = rates[current] * rate
+                if neighbour == to_id:
+                    return rates[neighbour]
+                queue.append(neighbour)
+        return None
+
+
+class ExchangeRateGraphCache:
+    """Process-local cache of one ExchangeRateGraph per user.
+
+    Entries are dropped whenever a CurrencyExchange of the user is saved or
+    deleted in this process. The TTL bounds staleness for writes made by
+    other worker processes. At most ``EXCHANGE_RATE_CACHE_MAX_SIZE`` graphs
+    are kept, the least recently used ones are evicted first.
+    """
+
+    _graphs: "OrderedDict[str, Tuple[float, ExchangeRateGraph]]" = OrderedDict()
+    _generation = 0
+
+    @classmethod
+    async def get_graph(cls, user_id) -> ExchangeRateGraph:
+        key = str(to_object_id(user_id))
+        cached = cls._graphs.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            cls._graphs.move_to_end(key)
+            return cached[1]
+
+        generation = cls._generation
+        exchanges = await find_raw_documents(
+            CurrencyExchange.objects(user_id=user_id).only(
+                "from_currency_id", "to_currency_id", "rate"
+            )
+        )
+        graph = ExchangeRateGraph.from_exchanges(exchanges)
+        # Don't cache a graph loaded while an invalidation happened
+        if generation == cls._generation:
+            expires_at = time.monotonic() + EXCHANGE_RATE_CACHE_TTL_SECONDS
+            cls._graphs[key] = (expires_at, graph)
+            cls._graphs.move_to_end(key)
+            while len(cls._graphs) > EXCHANGE_RATE_CACHE_MAX_SIZE:
+                cls._graphs.popitem(last=False)
+        return graph
+
+    @classmethod
+    def invalidate(cls, user_id) -> None:
+        cls._generation += 1
+        cls._graphs.pop(str(to_object_id(user_id)), None)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._generation += 1
+        cls._graphs.clear()
+
+    @classmethod
+    def on_exchange_change(cls, sender, document, **kwargs):
+        user_id = document._data.get("user_id")
+        if user_id is None:
+            cls.clear()
+        else:
+            cls.invalidate(user_id)
+
+
+signals.post_save.connect(
+    ExchangeRateGraphCache.on_exchange_change, sender=CurrencyExchange
+)
+signals.post_delete.connect(
+    ExchangeRateGraphCache.on_exchange_change, sender=CurrencyExchange
+)
@@ -0,0 +1,116 @@
+import hashlib
+import logging
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Type, TypeVar
+
+import orjson
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine import signals
+
+from app.crud.exchange_rate_graph import to_object_id
+from commons.logging_config import setup_logging
+from database.async_database import find_raw_documents
+from models.models import AssetType, Category, Currency, PredefinedEntity
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+PREDEFINED_DOCUMENTS = (Currency, Category, AssetType)
+
+E = TypeVar("E", bound=PredefinedEntity)
+
+
+class PredefinedEntities:
+    """Immutable snapshot of the predefined entities of one document class."""
+
+    def __init__(self, document_cls: Type[E], sons: List[dict]):
+        self.document_cls = document_cls
+        self._sons: Mapping[ObjectId, dict] = MappingProxyType(
+            {son["_id"]: son for son in sons}
+        )
+        self.dicts: Tuple[Dict, ...] = tuple(
+            document_cls.son_to_dict(son) for son in sons
+        )
+        digest = hashlib.sha256(
+            orjson.dumps(self.dicts, default=str, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+        self.etag = f'"{digest[:32]}"'
+
+    def get_one(self, entity_id) -> Optional[E]:
+        try:
+            son = self._sons.get(to_object_id(entity_id))
+        except InvalidId:
+            return None
+        # A fresh document each time, callers may modify it
+        return None if son is None else self.document_cls._from_son(son)
+
+
+class PredefinedRegistry:
+    """In-memory registry of the predefined currencies, categories and asset types.
+
+    They are seeded by ``database/initialize_db.py`` and don't change at
+    runtime, so they are loaded once, in the app lifespan or on first use, into
+    read-only snapshots. Lookups that miss the registry go to the database. A
+    predefined entity saved or deleted anyway drops the snapshot of its class
+    until the next ``load``.
+    """
+
+    _snapshots: Mapping[type, PredefinedEntities] = MappingProxyType({})
+
+    @classmethod
+    async def load(cls) -> None:
+        snapshots = {}
+        for document_cls in PREDEFINED_DOCUMENTS:
+            sons = await find_raw_documents(
+                document_cls.objects(is_predefined=True).order_by("id")
+            )
+            snapshots[document_cls] = PredefinedEntities(document_cls, sons)
+        cls._snapshots = MappingProxyType(snapshots)
+        logger.info(
+            " Predefined registry loaded: "
+            + ", ".join(
+                f"{len(snapshot.dicts)} {document_cls.__name__}"
+                for document_cls, snapshot in snapshots.items()
+            )
+        )
+
+    @classmethod
+    async def get_all(cls, document_cls: Type[E]) -> PredefinedEntities:
+        if document_cls not in cls._snapshots:
+            await cls.load()
+        return cls._snapshots[document_cls]
+
+    @classmethod
+    def get_one(cls, document_cls: Type[E], entity_id) -> Optional[E]:
+        """The predefined entity with the id, or None if it's not in the registry."""
+        snapshot = cls._snapshots.get(document_cls)
+        return None if snapshot is None else snapshot.get_one(entity_id)
+
+    @classmethod
+    def discard(cls, document_cls: type) -> None:
+        cls._snapshots = MappingProxyType(
+            {
+                cls_: snapshot
+                for cls_, snapshot in cls._snapshots.items()
+                if cls_ is not document_cls
+            }
+        )
+
+    @classmethod
+    def on_entity_change(cls, sender, document, **kwargs):
+        if document.is_predefined and sender in cls._snapshots:
+            logger.warning(
+                f" Predefined {sender.__name__} {document.pk} changed at runtime,"
+                " dropping its registry snapshot"
+            )
+            cls.discard(sender)
+
+
+for _document_cls in PREDEFINED_DOCUMENTS:
+    signals.post_save.connect(
+        PredefinedRegistry.on_entity_change, sender=_document_cls
+    )
+    signals.post_delete.connect(
+        PredefinedRegistry.on_entity_change, sender=_document_cls
+    )
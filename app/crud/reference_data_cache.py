@@ -0,0 +1,116 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple, Type, TypeVar
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from mongoengine import Q, signals
+
+from app.crud.exchange_rate_graph import to_object_id
+from app.crud.predefined_registry import PredefinedRegistry
+from database.async_database import find_raw_documents, get_document
+from models.models import AssetType, Category, Currency, PredefinedEntity
+
+REFERENCE_DATA_CACHE_TTL_SECONDS = float(
+    os.getenv("REFERENCE_DATA_CACHE_TTL_SECONDS", "300")
+)
+REFERENCE_DATA_CACHE_MAX_SIZE = int(
+    os.getenv("REFERENCE_DATA_CACHE_MAX_SIZE", "10000")
+)
+
+E = TypeVar("E", bound=PredefinedEntity)
+_Entities = Dict[ObjectId, dict]
+
+
+class ReferenceDataCache:
+    """Process-local cache of the reference entities a user may refer to.
+
+    Currencies, categories and asset types are looked up on every write that
+    uses them. Per document class and user, the raw documents of the
+    predefined entities and of the user's own are loaded with one query, and a
+    fresh document is built for every hit. Saving or deleting an entity in
+    this process drops the entries of its user, or of every user for a
+    predefined one. The TTL bounds staleness for writes made by other worker
+    processes, and an id missing from an entry is looked up in the database
+    before it's reported as not existing.
+    """
+
+    _entries: "OrderedDict[Tuple[type, str], Tuple[float, _Entities]]" = OrderedDict()
+    _generation = 0
+
+    @classmethod
+    async def get_one_by_user(cls, document_cls: Type[E], entity_id, user_id) -> E:
+        predefined = PredefinedRegistry.get_one(document_cls, entity_id)
+        if predefined is not None:
+            return predefined
+        try:
+            entities = await cls._get_entities(document_cls, user_id)
+            son = entities.get(to_object_id(entity_id))
+        except InvalidId:
+            son = None
+        if son is not None:
+            return document_cls._from_son(son)
+
+        # Raises DoesNotExist, unless another process created it meanwhile
+        entity = await get_document(
+            document_cls.objects(
+                (Q(id=entity_id) & Q(user_id=user_id))
+                | Q(id=entity_id, is_predefined=True)
+            )
+        )
+        cls.invalidate(document_cls, user_id)
+        return entity
+
+    @classmethod
+    def invalidate(cls, document_cls: type, user_id) -> None:
+        cls._generation += 1
+        cls._entries.pop((document_cls, str(to_object_id(user_id))), None)
+
+    @classmethod
+    def clear(cls, document_cls: type = None) -> None:
+        cls._generation += 1
+        if document_cls is None:
+            cls._entries.clear()
+            return
+        for key in [key for key in cls._entries if key[0] is document_cls]:
+            del cls._entries[key]
+
+    @classmethod
+    def on_entity_change(cls, sender, document, **kwargs):
+        user_id = document._data.get("user_id")
+        if document.is_predefined or user_id is None:
+            cls.clear(sender)
+        else:
+            cls.invalidate(sender, user_id)
+
+    @classmethod
+    async def _get_entities(cls, document_cls: type, user_id) -> _Entities:
+        key = (document_cls, str(to_object_id(user_id)))
+        cached = cls._entries.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            cls._entries.move_to_end(key)
+            return cached[1]
+
+        generation = cls._generation
+        sons = await find_raw_documents(
+            document_cls.objects(Q(is_predefined=True) | Q(user_id=user_id))
+        )
+        entities = {son["_id"]: son for son in sons}
+        # Don't cache entities loaded while an invalidation happened
+        if generation == cls._generation:
+            expires_at = time.monotonic() + REFERENCE_DATA_CACHE_TTL_SECONDS
+            cls._entries[key] = (expires_at, entities)
+            cls._entries.move_to_end(key)
+            while len(cls._entries) > REFERENCE_DATA_CACHE_MAX_SIZE:
+                cls._entries.popitem(last=False)
+        return entities
+
+
+for _document_cls in (Currency, Category, AssetType):
+    signals.post_save.connect(
+        ReferenceDataCache.on_entity_change, sender=_document_cls
+    )
+    signals.post_delete.connect(
+        ReferenceDataCache.on_entity_change, sender=_document_cls
+    )
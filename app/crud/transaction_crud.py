@@ -1,56 +1,138 @@
 from datetime import datetime, timezone
-from typing import List, Optional
+from decimal import Decimal
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
-from mongoengine import DoesNotExist, QuerySet
+from bson import ObjectId
+from mongoengine import DoesNotExist
+from mongoengine.context_managers import no_dereference
 from mongoengine.queryset.visitor import Q
+from pymongo.asynchronous.client_session import AsyncClientSession
 
+from commons.pagination import decode_cursor, encode_cursor
+from database.async_database import (
+    aggregate,
+    delete_documents,
+    find_documents,
+    find_raw_documents,
+    get_document,
+    insert_documents,
+    iter_raw_documents,
+    replace_document,
+)
+from models.enums import StatisticsIntervalEnum as I
 from models.models import Transaction
 
+LIST_FIELDS = (
+    "id",
+    "from_wallet_id",
+    "to_wallet_id",
+    "category_id",
+    "currency_id",
+    "type",
+    "amount",
+    "date",
+    "description",
+)
+
+PERIOD_FORMATS = {
+    I.DAY.value: "%Y-%m-%d",
+    I.WEEK.value: "%G-W%V",
+    I.MONTH.value: "%Y-%m",
+}
+
 
 class TransactionCRUD:
 
     @classmethod
-    async def create_one(cls, transaction: Transaction) -> Transaction:
-        transaction.clean()
-        transaction.save()
+    async def create_one(
+        cls, transaction: Transaction, session: Optional[AsyncClientSession] = None
+    ) -> Transaction:
+        await cls.create_many([transaction], session)
         return transaction
 
     @classmethod
-    async def get_one_by_user(cls, transaction_id: str, user_id: str) -> Transaction:
+    async def create_many(
+        cls,
+        transactions: List[Transaction],
+        session: Optional[AsyncClientSession] = None,
+    ) -> List[Transaction]:
+        """Validate and insert the transactions with a single insert_many."""
+        for transaction in transactions:
+            cls._validate(transaction)
+        return await insert_documents(transactions, session)
+
+    @classmethod
+    async def get_one_by_user(
+        cls,
+        transaction_id: str,
+        user_id: str,
+        session: Optional[AsyncClientSession] = None,
+    ) -> Transaction:
         try:
-            return Transaction.objects.get(id=transaction_id, user_id=user_id)
+            return await get_document(
+                Transaction.objects(id=transaction_id, user_id=user_id), session
+            )
         except DoesNotExist:
             raise DoesNotExist(
                 f"Transaction with id {transaction_id} for user {user_id} does not exist"
             )
 
     @classmethod
-    async def get_all_by_user_id(cls, user_id: str) -> QuerySet:
-        return Transaction.objects(user_id=user_id)
+    async def get_all_by_user_id(cls, user_id: str) -> List[Transaction]:
+        return await find_documents(Transaction.objects(user_id=user_id))
 
     @classmethod
     async def get_one_by_id(cls, transaction_id: str) -> Transaction:
-        return Transaction.objects.get(id=transaction_id)
+        return await get_document(Transaction.objects(id=transaction_id))
 
     @classmethod
     async def update_one_by_user(
-        cls, user_id: str, transaction_id: str, updated_transaction: Transaction
+        cls,
+        user_id: str,
+        transaction_id: str,
+        updated_transaction: Transaction,
+        session: Optional[AsyncClientSession] = None,
     ) -> None:
-        transaction = await cls.get_one_by_user(transaction_id, user_id)
+        transaction = await cls.get_one_by_user(transaction_id, user_id, session)
         cls._update_transaction_fields(transaction, updated_transaction)
         cls._update_timestamp(transaction)
-        transaction.clean()
-        transaction.save()
+        cls._validate(transaction)
+        await replace_document(transaction, session)
+
+    @classmethod
+    async def replace_one(
+        cls, transaction: Transaction, session: Optional[AsyncClientSession] = None
+    ) -> None:
+        """Store ``transaction`` as a whole, fields it doesn't set are removed."""
+        await replace_document(transaction, session)
 
     @classmethod
-    async def delete_one_by_user(cls, transaction_id: str, user_id: str) -> bool:
-        result = Transaction.objects(id=transaction_id, user_id=user_id).delete()
+    async def delete_one_by_user(
+        cls,
+        transaction_id: str,
+        user_id: str,
+        session: Optional[AsyncClientSession] = None,
+    ) -> bool:
+        result = await delete_documents(
+            Transaction.objects(id=transaction_id, user_id=user_id), session
+        )
         if result == 0:
             raise DoesNotExist(
                 f"Transaction with id {transaction_id} for user {user_id} does not exist"
             )
         return result > 0
 
+    @classmethod
+    async def delete_many_by_user(
+        cls,
+        transaction_ids: List[ObjectId],
+        user_id: str,
+        session: Optional[AsyncClientSession] = None,
+    ) -> int:
+        return await delete_documents(
+            Transaction.objects(id__in=transaction_ids, user_id=user_id), session
+        )
+
     @classmethod
     async def filter_transactions(
         cls,
@@ -62,6 +144,161 @@ class TransactionCRUD:
         from_wallet_id: Optional[str] = None,
         to_wallet_id: Optional[str] = None,
     ) -> List[Transaction]:
+        query = cls._build_filter_query(
+            user_id,
+            start_date,
+            end_date,
+            transaction_type,
+            category_id,
+            from_wallet_id,
+            to_wallet_id,
+        )
+        return await find_documents(Transaction.objects(query))
+
+    @classmethod
+    async def get_page(
+        cls,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        category_id: Optional[str] = None,
+        from_wallet_id: Optional[str] = None,
+        to_wallet_id: Optional[str] = None,
+    ) -> Tuple[List[dict], Optional[str]]:
+        """Return one page of raw transactions, newest first, and the next cursor.
+
+        Pages are keyed on (date, _id), so fetching a page costs the same no
+        matter how deep into the history it is. Only ``LIST_FIELDS`` are read.
+        """
+        query = cls._build_filter_query(
+            user_id,
+            start_date,
+            end_date,
+            transaction_type,
+            category_id,
+            from_wallet_id,
+            to_wallet_id,
+        )
+        if cursor:
+            last_date, last_id = decode_cursor(cursor)
+            query &= Q(date__lt=last_date) | Q(date=last_date, id__lt=last_id)
+
+        transactions = await find_raw_documents(
+            Transaction.objects(query)
+            .order_by("-date", "-id")
+            .limit(limit + 1)
+            .only(*LIST_FIELDS)
+        )
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            last = transactions[-1]
+            next_cursor = encode_cursor(last["date"], last["_id"])
+        return transactions, next_cursor
+
+    @classmethod
+    def iter_filtered(
+        cls,
+        user_id: str,
+        batch_size: int,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        category_id: Optional[str] = None,
+        from_wallet_id: Optional[str] = None,
+        to_wallet_id: Optional[str] = None,
+    ) -> AsyncIterator[dict]:
+        """Stream raw filtered transactions, newest first, ``batch_size`` at a time."""
+        query = cls._build_filter_query(
+            user_id,
+            start_date,
+            end_date,
+            transaction_type,
+            category_id,
+            from_wallet_id,
+            to_wallet_id,
+        )
+        return iter_raw_documents(
+            Transaction.objects(query).order_by("-date", "-id").only(*LIST_FIELDS),
+            batch_size,
+        )
+
+    @classmethod
+    async def get_totals_by_type(
+        cls,
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+    ) -> Dict[str, Decimal]:
+        """Sum transaction amounts per transaction type on the database side."""
+        query = cls._build_filter_query(user_id, start_date, end_date)
+        pipeline = [
+            {"$match": Transaction.objects(query)._query},
+            {
+                "$group": {
+                    "_id": "$type",
+                    "total": {"$sum": {"$toDecimal": "$amount"}},
+                }
+            },
+        ]
+        amount_field = Transaction._fields["amount"]
+        return {
+            row["_id"]: amount_field.to_python(row["total"])
+            for row in await aggregate(Transaction, pipeline)
+        }
+
+    @classmethod
+    async def get_totals_by_period(
+        cls,
+        user_id: str,
+        interval: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        split_by_category: bool = False,
+    ) -> List[Dict]:
+        """Sum transaction amounts per period and type (and category if split).
+
+        Periods are labelled with ``PERIOD_FORMATS`` so buckets sort
+        chronologically as strings.
+        """
+        query = cls._build_filter_query(user_id, start_date, end_date)
+        group_id = {
+            "period": {
+                "$dateToString": {"format": PERIOD_FORMATS[interval], "date": "$date"}
+            },
+            "type": "$type",
+        }
+        if split_by_category:
+            group_id["category_id"] = "$category_id"
+        pipeline = [
+            {"$match": Transaction.objects(query)._query},
+            {
+                "$group": {
+                    "_id": group_id,
+                    "total": {"$sum": {"$toDecimal": "$amount"}},
+                }
+            },
+            {"$sort": {"_id.period": 1}},
+        ]
+        amount_field = Transaction._fields["amount"]
+        return [
+            {**row["_id"], "total": amount_field.to_python(row["total"])}
+            for row in await aggregate(Transaction, pipeline)
+        ]
+
+    @staticmethod
+    def _build_filter_query(
+        user_id: str,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        transaction_type: Optional[str] = None,
+        category_id: Optional[str] = None,
+        from_wallet_id: Optional[str] = None,
+        to_wallet_id: Optional[str] = None,
+    ) -> Q:
         query = Q(user_id=user_id)
         if start_date:
             query &= Q(date__gte=start_date)
@@ -75,8 +312,7 @@ class TransactionCRUD:
             query &= Q(from_wallet_id=from_wallet_id)
         if to_wallet_id:
             query &= Q(to_wallet_id=to_wallet_id)
-
-        return list(Transaction.objects(query))
+        return query
 
     @staticmethod
     def _update_transaction_fields(
@@ -99,6 +335,13 @@ class TransactionCRUD:
         if updated_transaction.description is not None:
             transaction.description = updated_transaction.description
 
+    @staticmethod
+    def _validate(transaction: Transaction) -> None:
+        # References are only checked for their ids, don't load them one by one
+        with no_dereference(Transaction):
+            transaction.clean()
+            transaction.validate()
+
     @staticmethod
     def _update_timestamp(transaction: Transaction) -> None:
         transaction.updated_at = datetime.now(timezone.utc)
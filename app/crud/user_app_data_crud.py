@@ -1,24 +1,36 @@
 from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Optional
 
 from bson import ObjectId
-
+from pymongo.asynchronous.client_session import AsyncClientSession
+
+from database.async_database import (
+    get_document,
+    insert_documents,
+    rounded_increment,
+    update_document,
+)
+from database.db_executor import run_in_db_executor
 from models.models import UserAppData
 
 
 class UserAppDataCRUD:
     @classmethod
-    async def create_one(cls, user_data: UserAppData) -> UserAppData:
-        user_data.save()
+    async def create_one(
+        cls, user_data: UserAppData, session: Optional[AsyncClientSession] = None
+    ) -> UserAppData:
+        user_data.validate()
+        await insert_documents([user_data], session)
         return user_data
 
     @classmethod
     async def get_one_by_id(cls, _id: str) -> UserAppData:
-        return UserAppData.objects.get(pk=ObjectId(_id))
+        return await get_document(UserAppData.objects(pk=ObjectId(_id)))
 
     @classmethod
     async def get_one_by_user_id(cls, user_id: str) -> UserAppData:
-        return UserAppData.objects.get(user_id=user_id)
+        return await get_document(UserAppData.objects(user_id=user_id))
 
     @classmethod
     async def get_base_currency_id_by_user_id(cls, user_id: str) -> ObjectId:
@@ -30,7 +42,7 @@ class UserAppDataCRUD:
         cls, user_app_data: UserAppData, currency_id: str
     ) -> UserAppData:
         user_app_data.base_currency_id = ObjectId(currency_id)
-        user_app_data.save()
+        await run_in_db_executor(user_app_data.save)
         return user_app_data
 
     @classmethod
@@ -38,15 +50,15 @@ class UserAppDataCRUD:
         cls, current_user_app_data_id: str, updated_user_app_data: UserAppData
     ) -> UserAppData:
         user_app_data = await cls.get_one_by_id(current_user_app_data_id)
-        return cls.update_one(user_app_data, updated_user_app_data)
+        return await cls.update_one(user_app_data, updated_user_app_data)
 
     @classmethod
-    def update_one(
+    async def update_one(
         cls, current_user_app_data: UserAppData, updated_user_app_data: UserAppData
     ) -> UserAppData:
         cls.__update_user_app_data_fields(current_user_app_data, updated_user_app_data)
         cls.__update_timestamp(current_user_app_data)
-        current_user_app_data.save()
+        await run_in_db_executor(current_user_app_data.save)
         return current_user_app_data
 
     @classmethod
@@ -57,7 +69,22 @@ class UserAppDataCRUD:
         user_app_data.wallets_value = total_value
         user_app_data.net_worth = user_app_data.assets_value + total_value
         user_app_data.clean()
-        user_app_data.save()
+        await run_in_db_executor(user_app_data.save)
+
+    @classmethod
+    async def set_user_app_data_values(
+        cls,
+        user_app_data: UserAppData,
+        wallets_value: Decimal,
+        assets_value: Decimal,
+    ) -> UserAppData:
+        user_app_data.wallets_value = wallets_value
+        user_app_data.assets_value = assets_value
+        user_app_data.net_worth = wallets_value + assets_value
+        cls.__update_timestamp(user_app_data)
+        user_app_data.clean()
+        await run_in_db_executor(user_app_data.save)
+        return user_app_data
 
     @classmethod
     async def add_amount_to_user_app_data_wallets_value(
@@ -67,7 +94,7 @@ class UserAppDataCRUD:
         user_app_data.wallets_value += amount
         user_app_data.net_worth += amount
         user_app_data.clean()
-        user_app_data.save()
+        await run_in_db_executor(user_app_data.save)
 
     @classmethod
     async def reduce_amount_from_user_app_data_wallets_value(
@@ -77,7 +104,31 @@ class UserAppDataCRUD:
         user_app_data.wallets_value -= amount
         user_app_data.net_worth -= amount
         user_app_data.clean()
-        user_app_data.save()
+        await run_in_db_executor(user_app_data.save)
+
+    @classmethod
+    async def increment_wallets_value(
+        cls,
+        user_id: str,
+        delta: Decimal,
+        session: Optional[AsyncClientSession] = None,
+    ) -> None:
+        """Add ``delta`` to wallets value and net worth with one atomic update."""
+        await update_document(
+            UserAppData.objects(user_id=user_id),
+            [
+                {
+                    "$set": {
+                        "wallets_value": rounded_increment(
+                            UserAppData, "wallets_value", delta
+                        ),
+                        "net_worth": rounded_increment(UserAppData, "net_worth", delta),
+                        "updated_at": datetime.now(timezone.utc),
+                    }
+                }
+            ],
+            session,
+        )
 
     @classmethod
     async def add_amount_to_user_app_data_assets_value(
@@ -87,7 +138,7 @@ class UserAppDataCRUD:
         user_app_data.assets_value += amount
         user_app_data.net_worth += amount
         user_app_data.clean()
-        user_app_data.save()
+        await run_in_db_executor(user_app_data.save)
 
     @classmethod
     async def reduce_amount_from_user_app_data_assets_value(
@@ -97,7 +148,7 @@ class UserAppDataCRUD:
         user_app_data.assets_value -= amount
         user_app_data.net_worth -= amount
         user_app_data.clean()
-        user_app_data.save()
+        await run_in_db_executor(user_app_data.save)
 
     @staticmethod
     def __update_user_app_data_fields(
@@ -0,0 +1,68 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from mongoengine import signals
+
+from app.crud.user_crud import UserCRUD
+from models.models import User
+
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+USER_CACHE_MAX_SIZE = int(os.getenv("USER_CACHE_MAX_SIZE", "10000"))
+
+
+class UserCache:
+    """Process-local LRU cache of authenticated users keyed by username.
+
+    The raw document is cached and a fresh User is built for every hit, so a
+    request can't change the instance another request gets. Entries are
+    dropped when a user is updated or deleted in this process; the TTL bounds
+    staleness for writes made by other worker processes.
+    """
+
+    _users: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+    _generation = 0
+
+    @classmethod
+    async def get_user(cls, username: str) -> Optional[User]:
+        cached = cls._users.get(username)
+        if cached is not None and cached[0] > time.monotonic():
+            cls._users.move_to_end(username)
+            return User._from_son(cached[1])
+
+        generation = cls._generation
+        user = await UserCRUD.get_one_by_username_optional(username)
+        if user is None:
+            cls._users.pop(username, None)
+            return None
+        # Don't cache a user loaded while an invalidation happened
+        if generation == cls._generation:
+            expires_at = time.monotonic() + USER_CACHE_TTL_SECONDS
+            cls._users[username] = (expires_at, user.to_mongo())
+            cls._users.move_to_end(username)
+            while len(cls._users) > USER_CACHE_MAX_SIZE:
+                cls._users.popitem(last=False)
+        return user
+
+    @classmethod
+    def invalidate(cls, username: str) -> None:
+        cls._generation += 1
+        cls._users.pop(username, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._generation += 1
+        cls._users.clear()
+
+    @classmethod
+    def on_user_change(cls, sender, document, **kwargs):
+        username = document._data.get("username")
+        if username is None:
+            cls.clear()
+        else:
+            cls.invalidate(username)
+
+
+signals.post_save.connect(UserCache.on_user_change, sender=User)
+signals.post_delete.connect(UserCache.on_user_change, sender=User)
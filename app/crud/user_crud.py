@@ -1,30 +1,41 @@
 from typing import Optional
 
+from pymongo.asynchronous.client_session import AsyncClientSession
+
+from database.async_database import (
+    find_first_document,
+    get_document,
+    insert_documents,
+)
+from database.db_executor import run_in_db_executor
 from models.models import User
 
 
 class UserCRUD:
 
     @classmethod
-    async def create_one(cls, user: User) -> User:
-        user.save()
+    async def create_one(
+        cls, user: User, session: Optional[AsyncClientSession] = None
+    ) -> User:
+        user.validate()
+        await insert_documents([user], session)
         return user
 
     @classmethod
     async def get_one_by_username(cls, username: str) -> User:
-        return User.objects.get(username=username)
+        return await get_document(User.objects(username=username))
 
     @classmethod
     async def get_one_by_username_optional(cls, username: str) -> Optional[User]:
-        return User.objects(username=username).first()
+        return await find_first_document(User.objects(username=username))
 
     @classmethod
     async def update_one(cls, username: str, updated_user: User) -> int:
         user = await cls.get_one_by_username(username=username)
-        user.update(**updated_user)
-        return user.save()
+        await run_in_db_executor(user.update, **updated_user)
+        return await run_in_db_executor(user.save)
 
     @classmethod
     async def delete_one(cls, username: str) -> int:
         user = await cls.get_one_by_username(username=username)
-        return user.delete()
+        return await run_in_db_executor(user.delete)
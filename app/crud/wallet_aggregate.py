@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.asynchronous.client_session import AsyncClientSession
+
+from database.async_database import bulk_write, rounded_increment
+from models.models import Balance, Wallet
+
+
+class WalletAggregate:
+    """Maintains the fields a Wallet denormalizes from its Balances.
+
+    ``balances_ids`` and ``total_value`` are changed only through this class,
+    always with one update pipeline on the wallet document, so a change
+    covering any number of balances is one atomic update and the wallet is
+    never read back first. ``total_value`` is rounded to its precision on
+    every change. Callers report a change after the balances themselves were
+    written.
+    """
+
+    @classmethod
+    async def balances_added(
+        cls,
+        wallet_id: ObjectId,
+        balances: List[Balance],
+        session: Optional[AsyncClientSession] = None,
+    ) -> None:
+        await cls._update_wallets(
+            {
+                wallet_id: cls._build_update(
+                    cls._sum_amounts(balances),
+                    push_ids=[balance.id for balance in balances],
+                )
+            },
+            session,
+        )
+
+    @classmethod
+    async def balances_removed(
+        cls,
+        wallet_id: ObjectId,
+        balances: List[Balance],
+        session: Optional[AsyncClientSession] = None,
+    ) -> None:
+        await cls._update_wallets(
+            {
+                wallet_id: cls._build_update(
+                    -cls._sum_amounts(balances),
+                    pull_ids=[balance.id for balance in balances],
+                )
+            },
+            session,
+        )
+
+    @classmethod
+    async def total_values_changed(
+        cls,
+        deltas: Dict[ObjectId, Decimal],
+        session: Optional[AsyncClientSession] = None,
+    ) -> None:
+        """Add a delta to the total value of each wallet, in one round-trip."""
+        await cls._update_wallets(
+            {
+                wallet_id: cls._build_update(delta)
+                for wallet_id, delta in deltas.items()
+                if delta != 0
+            },
+            session,
+        )
+
+    @staticmethod
+    def _sum_amounts(balances: Iterable[Balance]) -> Decimal:
+        return sum((balance.amount for balance in balances), Decimal(0))
+
+    @staticmethod
+    def _build_update(
+        delta: Decimal, push_ids: List[ObjectId] = None, pull_ids: List[ObjectId] = None
+    ) -> List[dict]:
+        fields = {
+            "total_value": rounded_increment(Wallet, "total_value", delta),
+            "updated_at": datetime.now(timezone.utc),
+        }
+        balances_ids = {"$ifNull": ["$balances_ids", []]}
+        if push_ids:
+            fields["balances_ids"] = {"$concatArrays": [balances_ids, push_ids]}
+        if pull_ids:
+            fields["balances_ids"] = {
+                "$filter": {
+                    "input": balances_ids,
+                    "cond": {"$not": [{"$in": ["$$this", pull_ids]}]},
+                }
+            }
+        return [{"$set": fields}]
+
+    @staticmethod
+    async def _update_wallets(
+        updates: Dict[ObjectId, List[dict]], session: Optional[AsyncClientSession]
+    ) -> None:
+        if not updates:
+            return
+        operations = [
+            UpdateOne({"_id": ObjectId(wallet_id)}, update)
+            for wallet_id, update in updates.items()
+        ]
+        await bulk_write(Wallet, operations, session)
@@ -1,10 +1,20 @@
 from datetime import datetime, timezone
-from typing import List
+from decimal import Decimal
+from typing import Dict, List, Tuple
 
+from bson import ObjectId
 from fastapi import HTTPException, status
-from mongoengine import DoesNotExist, QuerySet
+from mongoengine import DoesNotExist
+from mongoengine.context_managers import no_dereference
 
 from app.crud.balance_crud import BalanceCRUD
+from database.async_database import (
+    aggregate,
+    find_documents,
+    find_raw_documents,
+    get_document,
+)
+from database.db_executor import run_in_db_executor
 from models.models import Balance, Wallet
 
 
@@ -13,13 +23,13 @@ class WalletCRUD:
     @classmethod
     async def create_one(cls, wallet: Wallet) -> Wallet:
         wallet.clean()
-        wallet.save()
+        await run_in_db_executor(wallet.save)
         return wallet
 
     @classmethod
     async def get_one_by_user(cls, wallet_id: str, user_id: str) -> Wallet:
         try:
-            return Wallet.objects.get(id=wallet_id, user_id=user_id)
+            return await get_document(Wallet.objects(id=wallet_id, user_id=user_id))
         except DoesNotExist:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -27,13 +37,85 @@ class WalletCRUD:
             )
 
     @classmethod
-    async def get_all_by_user_id_optional(cls, user_id: str) -> QuerySet:
-        return Wallet.objects(user_id=user_id)
+    async def get_all_raw_with_balances_by_user_id(
+        cls, user_id: str
+    ) -> List[Tuple[dict, List[dict]]]:
+        """Read-only: the user's raw wallets, each with its raw balances.
+
+        The balances of all the wallets are loaded with a single ``$in`` query
+        and matched to their wallet in ``balances_ids`` order, instead of
+        being dereferenced wallet by wallet.
+        """
+        wallets = await find_documents(Wallet.objects(user_id=user_id).as_pymongo())
+        balances = await BalanceCRUD.get_all_raw_by_wallet_ids(
+            [wallet["_id"] for wallet in wallets]
+        )
+        balances_by_id = {balance["_id"]: balance for balance in balances}
+        return [
+            (
+                wallet,
+                [
+                    balances_by_id[balance_id]
+                    for balance_id in wallet.get("balances_ids", [])
+                    if balance_id in balances_by_id
+                ],
+            )
+            for wallet in wallets
+        ]
+
+    @staticmethod
+    def get_balance_ids(wallet: Wallet) -> List[ObjectId]:
+        """The ids in ``balances_ids``, read without dereferencing the balances."""
+        with no_dereference(Wallet):
+            return [balance.id for balance in wallet.balances_ids]
+
+    @classmethod
+    async def get_balances(cls, wallet: Wallet) -> List[Balance]:
+        """The wallet's balances, loaded by the async client.
+
+        Iterating ``wallet.balances_ids`` would dereference them with a
+        blocking query on the event loop.
+        """
+        return await BalanceCRUD.get_all_by_ids(cls.get_balance_ids(wallet))
+
+    @classmethod
+    async def get_ids_by_user(cls, user_id: str) -> List[ObjectId]:
+        wallets = await find_raw_documents(Wallet.objects(user_id=user_id).only("id"))
+        return [wallet["_id"] for wallet in wallets]
+
+    @classmethod
+    async def get_balance_totals_by_currency(
+        cls, user_id: str
+    ) -> Dict[ObjectId, Decimal]:
+        """Sum the balances of all the user's wallets per currency in one query."""
+        pipeline = [
+            {"$match": Wallet.objects(user_id=user_id)._query},
+            {
+                "$lookup": {
+                    "from": Balance._get_collection_name(),
+                    "localField": "_id",
+                    "foreignField": "wallet_id",
+                    "as": "balances",
+                }
+            },
+            {"$unwind": "$balances"},
+            {
+                "$group": {
+                    "_id": "$balances.currency_id",
+                    "total": {"$sum": {"$toDecimal": "$balances.amount"}},
+                }
+            },
+        ]
+        amount_field = Balance._fields["amount"]
+        return {
+            row["_id"]: amount_field.to_python(row["total"])
+            for row in await aggregate(Wallet, pipeline)
+        }
 
     @classmethod
     async def get_one_by_id(cls, wallet_id: str) -> Wallet:
         try:
-            return Wallet.objects.get(id=wallet_id)
+            return await get_document(Wallet.objects(id=wallet_id))
         except DoesNotExist:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -49,7 +131,7 @@ class WalletCRUD:
         await cls.__update_balances(wallet, updated_wallet)
         cls.__update_timestamp(wallet)
         wallet.clean()
-        wallet.save()
+        await run_in_db_executor(wallet.save)
 
     @staticmethod
     def __update_wallet_fields(wallet: Wallet, updated_wallet: Wallet) -> None:
@@ -60,9 +142,9 @@ class WalletCRUD:
     async def __update_balances(wallet: Wallet, updated_wallet: Wallet) -> None:
         if updated_wallet.balances_ids is not None:
             updated_balances: List[Balance] = updated_wallet.balances_ids
+            balances = await WalletCRUD.get_balances(wallet)
             for updated_balance in updated_balances:
                 match_found = False
-                balances: List[Balance] = wallet.balances_ids
                 for existing_balance in balances:
                     if (
                         existing_balance.currency_id.pk
@@ -85,7 +167,9 @@ class WalletCRUD:
 
     @classmethod
     async def delete_one_by_user(cls, user_id: str, wallet_id: str) -> bool:
-        result = Wallet.objects(id=wallet_id, user_id=user_id).delete()
+        result = await run_in_db_executor(
+            Wallet.objects(id=wallet_id, user_id=user_id).delete
+        )
         if result == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -98,10 +182,11 @@ class WalletCRUD:
         cls, user_id: str, wallet_id: str, currency_id: str
     ) -> Balance:
         wallet = await cls.get_one_by_user(wallet_id, user_id)
-        balances: List[Balance] = wallet.balances_ids
-        for balance in balances:
-            if str(balance.currency_id.id) == currency_id:
-                return balance
+        balance = await BalanceCRUD.get_one_by_wallet_and_currency_id_optional(
+            wallet.id, currency_id
+        )
+        if balance is not None:
+            return balance
 
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -10,10 +10,13 @@ from app.api.endpoints.currency_exchange_routes import (
     router as currency_exchange_routes,
 )
 from app.api.endpoints.currency_routes import router as currency_routes
+from app.api.endpoints.health_routes import router as health_routes
 from app.api.endpoints.transaction_routes import router as transaction_routes
 from app.api.endpoints.user_app_data_routes import router as user_app_data_routes
 from app.api.endpoints.wallet_routes import router as wallet_routes
+from app.crud.predefined_registry import PredefinedRegistry
 from commons.exception_handlers import base_exception_handler, http_exception_handler
+from commons.password_executor import password_executor
 from database.database import connect_to_db
 
 # from models.models import AssetType
@@ -22,10 +25,12 @@ from database.database import connect_to_db
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     await connect_to_db()
+    await PredefinedRegistry.load()
     # # Fix indexes of collections if needed
     # AssetType._get_collection().drop_indexes()
     # AssetType.ensure_indexes()
     yield
+    password_executor.shutdown()
 
 
 app = FastAPI(
@@ -35,6 +40,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.include_router(health_routes)
 app.include_router(auth_routes)
 app.include_router(user_app_data_routes)
 app.include_router(currency_routes)
@@ -0,0 +1,140 @@
+import asyncio
+import functools
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+from zxcvbn import zxcvbn
+
+from commons.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+THREAD_MODE = "thread"
+PROCESS_MODE = "process"
+
+PASSWORD_EXECUTOR_MODE = os.getenv("PASSWORD_EXECUTOR_MODE", THREAD_MODE)
+PASSWORD_EXECUTOR_MAX_WORKERS = int(os.getenv("PASSWORD_EXECUTOR_MAX_WORKERS", "4"))
+PASSWORD_EXECUTOR_MAX_QUEUE = int(os.getenv("PASSWORD_EXECUTOR_MAX_QUEUE", "64"))
+
+_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Module level functions, so they can be pickled for the process pool
+def hash_password(password: str) -> str:
+    return _pwd_context.hash(password)
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _pwd_context.verify(plain_password, hashed_password)
+
+
+def check_password_strength(password: str, user_inputs: List[str]) -> Dict[str, Any]:
+    result = zxcvbn(password, user_inputs=user_inputs)
+    return {"score": result["score"], "feedback": result["feedback"]}
+
+
+class PasswordExecutor:
+    """Bounded pool for the CPU-bound password work of the auth endpoints.
+
+    Hashing and strength checks take 100-300 ms each and would stall the event
+    loop. They run in ``max_workers`` threads (bcrypt releases the GIL) or
+    processes, and at most ``max_queue`` calls may wait for a worker; further
+    calls are rejected with 503 instead of growing the backlog.
+    """
+
+    def __init__(self, mode: str, max_workers: int, max_queue: int):
+        if mode not in (THREAD_MODE, PROCESS_MODE):
+            raise ValueError(f"Unknown PASSWORD_EXECUTOR_MODE: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[Executor] = None
+        self._in_flight = 0
+        self._max_queue_depth = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._total_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Calls submitted but not picked up by a worker yet."""
+        return max(0, self._in_flight - self.max_workers)
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        # Only calls that would wait for a worker count against max_queue
+        if self._in_flight >= self.max_workers + self.max_queue:
+            self._rejected += 1
+            logger.warning(
+                f" Password executor queue is full ({self.queue_depth} waiting),"
+                f" rejecting {func.__name__}"
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server is busy, please try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight += 1
+        self._max_queue_depth = max(self._max_queue_depth, self.queue_depth)
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._get_executor(), functools.partial(func, *args)
+            )
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+        # Only successful calls, so failures don't skew the average
+        self._completed += 1
+        self._total_seconds += time.perf_counter() - start
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self._max_queue_depth,
+            "completed": self._completed,
+            "failed": self._failed,
+            "rejected": self._rejected,
+            "average_seconds": (
+                self._total_seconds / self._completed if self._completed else 0.0
+            ),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _get_executor(self) -> Executor:
+        # Created on first use, so importing the module never spawns processes
+        if self._executor is None:
+            if self.mode == PROCESS_MODE:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password"
+                )
+            logger.info(
+                f" Password executor running with {self.max_workers} {self.mode} workers"
+            )
+        return self._executor
+
+
+password_executor = PasswordExecutor(
+    PASSWORD_EXECUTOR_MODE, PASSWORD_EXECUTOR_MAX_WORKERS, PASSWORD_EXECUTOR_MAX_QUEUE
+)
@@ -0,0 +1,80 @@
+import functools
+from decimal import Decimal
+from typing import Any, Callable, Optional
+
+import orjson
+from bson import ObjectId
+from fastapi import status
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from models.schemas import ResponseSchema
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    # Types orjson doesn't encode, rendered the way pydantic renders them
+    if isinstance(value, (Decimal, ObjectId)):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header value matches the ETag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag.removeprefix("W/") in candidates
+
+
+class ResponseSchemaJSONResponse(Response):
+    """Renders a ResponseSchema envelope with orjson.
+
+    The fields of the schema are encoded as they are, so the untyped ``data``
+    dict is walked once, by orjson, instead of being validated and dumped by
+    pydantic first. Decimals become strings and UTC datetimes end in ``Z``,
+    like the output of the response model.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            fields = type(content).model_fields
+            content = {name: getattr(content, name) for name in fields}
+        return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class ResponseSchemaRoute(APIRoute):
+    """Route returning ResponseSchema results as ``ResponseSchemaJSONResponse``.
+
+    FastAPI sends a returned Response untouched, so the endpoint result skips
+    the response model validation and serialization. ``response_model`` is
+    still used for the OpenAPI schema.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        status_code = kwargs.get("status_code") or status.HTTP_200_OK
+        endpoint = _render_response_schema(endpoint, status_code)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def _render_response_schema(
+    endpoint: Callable[..., Any], status_code: int
+) -> Callable[..., Any]:
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        if isinstance(result, ResponseSchema):
+            return ResponseSchemaJSONResponse(result, status_code=status_code)
+        return result
+
+    return wrapper
@@ -0,0 +1,318 @@
+import asyncio
+import logging
+import weakref
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from mongoengine import Document, NotUniqueError
+from mongoengine.queryset import QuerySet
+from pymongo import AsyncMongoClient
+from pymongo.asynchronous.client_session import AsyncClientSession
+from pymongo.asynchronous.collection import AsyncCollection
+from pymongo.errors import BulkWriteError
+from pymongo.server_type import SERVER_TYPE
+
+from commons.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class AsyncDBConnector:
+    """Native async MongoDB client living next to the mongoengine connection.
+
+    pymongo's async client is bound to the event loop it was created in, so one
+    client is kept per running loop and created lazily on first use.
+    """
+
+    def __init__(self):
+        self.MONGO_DATABASE: Optional[str] = None
+        self._client_settings: dict = {}
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncMongoClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._transactions_supported: Optional[bool] = None
+
+    def configure(self, db_name: str, **client_settings) -> None:
+        self.MONGO_DATABASE = db_name
+        self._client_settings = client_settings
+        self._clients.clear()
+        self._transactions_supported = None
+
+    def get_client(self) -> AsyncMongoClient:
+        if not self._client_settings:
+            raise RuntimeError("Async database client is not configured")
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            client = AsyncMongoClient(**self._client_settings)
+            self._clients[loop] = client
+        return client
+
+    def get_collection(self, document_cls: Type[Document]) -> AsyncCollection:
+        database = self.get_client()[self.MONGO_DATABASE]
+        return database[document_cls._get_collection_name()]
+
+    async def supports_transactions(self) -> bool:
+        """Whether the deployment is a replica set or sharded cluster.
+
+        Standalone servers reject multi-document transactions.
+        """
+        if self._transactions_supported is None:
+            client = self.get_client()
+            await client.admin.command("ping")
+            servers = client.topology_description.server_descriptions().values()
+            self._transactions_supported = any(
+                server.replica_set_name or server.server_type == SERVER_TYPE.Mongos
+                for server in servers
+            )
+            if not self._transactions_supported:
+                logger.warning(
+                    " Standalone MongoDB server, multi-document writes fall back"
+                    " to compensating writes instead of transactions"
+                )
+        return self._transactions_supported
+
+    async def disconnect(self) -> None:
+        loop = asyncio.get_running_loop()
+        client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.close()
+            logger.info(f" Closed async client of {self.MONGO_DATABASE}")
+
+
+async_db_connector = AsyncDBConnector()
+
+
+def _find(queryset: QuerySet, projection: Optional[dict] = None):
+    collection = async_db_connector.get_collection(queryset._document)
+    cursor = collection.find(queryset._query, projection)
+    if queryset._ordering:
+        cursor = cursor.sort(queryset._ordering)
+    if queryset._limit is not None:
+        cursor = cursor.limit(queryset._limit)
+    return cursor
+
+
+async def find_documents(queryset: QuerySet) -> List[Union[Document, dict]]:
+    """Run a mongoengine queryset through the async driver.
+
+    The queryset is only used to compile the filter, so field names and
+    ObjectId conversion behave exactly like the synchronous API. Ordering and
+    limit set with ``order_by()`` and ``limit()`` are applied too.
+
+    A queryset marked with ``as_pymongo()`` is read-only: the raw dicts are
+    returned like ``find_raw_documents`` does, without building documents.
+    """
+    if queryset._as_pymongo:
+        return await find_raw_documents(queryset)
+    document_cls = queryset._document
+    return [document_cls._from_son(son) async for son in _find(queryset)]
+
+
+async def find_raw_documents(queryset: QuerySet) -> List[dict]:
+    """Like ``find_documents`` but returns the raw BSON dicts.
+
+    Fields restricted with ``only()`` are used as the projection.
+    """
+    projection = queryset._loaded_fields.as_dict() or None
+    return await _find(queryset, projection).to_list()
+
+
+async def iter_raw_documents(
+    queryset: QuerySet, batch_size: int
+) -> AsyncIterator[dict]:
+    """Yield raw BSON dicts one at a time, fetching ``batch_size`` per round-trip.
+
+    Unlike ``find_raw_documents`` the result set is never held in memory.
+    """
+    projection = queryset._loaded_fields.as_dict() or None
+    async with _find(queryset, projection).batch_size(batch_size) as cursor:
+        async for son in cursor:
+            yield son
+
+
+async def aggregate(document_cls: Type[Document], pipeline: List[dict]) -> List[dict]:
+    collection = async_db_connector.get_collection(document_cls)
+    cursor = await collection.aggregate(pipeline)
+    return await cursor.to_list()
+
+
+async def find_first_document(
+    queryset: QuerySet, session: Optional[AsyncClientSession] = None
+) -> Optional[Document]:
+    document_cls = queryset._document
+    collection = async_db_connector.get_collection(document_cls)
+    son = await collection.find_one(queryset._query, session=session)
+    if son is None:
+        return None
+    return document_cls._from_son(son)
+
+
+async def get_document(
+    queryset: QuerySet, session: Optional[AsyncClientSession] = None
+) -> Document:
+    """Async counterpart of ``QuerySet.get``."""
+    document_cls = queryset._document
+    collection = async_db_connector.get_collection(document_cls)
+    sons = await collection.find(queryset._query, session=session).limit(2).to_list()
+    if not sons:
+        raise document_cls.DoesNotExist(
+            f"{document_cls._class_name} matching query does not exist."
+        )
+    if len(sons) > 1:
+        raise document_cls.MultipleObjectsReturned(
+            "2 or more items returned, instead of 1"
+        )
+    return document_cls._from_son(sons[0])
+
+
+async def insert_documents(
+    documents: List[Document], session: Optional[AsyncClientSession] = None
+) -> List[Document]:
+    """Insert validated documents with one insert_many and set their ids.
+
+    Unlike ``Document.save`` no signals are sent. Duplicate keys raise
+    ``NotUniqueError`` like mongoengine does.
+    """
+    if not documents:
+        return documents
+    collection = async_db_connector.get_collection(type(documents[0]))
+    try:
+        result = await collection.insert_many(
+            [document.to_mongo() for document in documents], session=session
+        )
+    except BulkWriteError as e:
+        write_errors = e.details.get("writeErrors", [])
+        if write_errors and all(error["code"] == 11000 for error in write_errors):
+            raise NotUniqueError(f"Tried to save duplicate unique keys ({e})")
+        raise
+    for document, document_id in zip(documents, result.inserted_ids):
+        document.pk = document_id
+        document._created = False
+        document._clear_changed_fields()
+    return documents
+
+
+async def replace_document(
+    document: Document, session: Optional[AsyncClientSession] = None
+) -> None:
+    collection = async_db_connector.get_collection(type(document))
+    await collection.replace_one(
+        {"_id": document.pk}, document.to_mongo(), session=session
+    )
+    document._clear_changed_fields()
+
+
+async def update_document(
+    queryset: QuerySet,
+    update: Union[dict, List[dict]],
+    session: Optional[AsyncClientSession] = None,
+) -> bool:
+    """Apply a raw update or update pipeline to the first match.
+
+    Returns whether one matched.
+    """
+    collection = async_db_connector.get_collection(queryset._document)
+    result = await collection.update_one(queryset._query, update, session=session)
+    return result.matched_count == 1
+
+
+def rounded_increment(document_cls: Type[Document], field_name: str, delta) -> dict:
+    """Expression adding ``delta`` to a DecimalField, rounded to its precision.
+
+    DecimalFields are stored as doubles, so repeated ``$inc`` updates drift
+    away from the decimal value (0.1 + 0.2 is stored as 0.30000000000000004).
+    Set in an update pipeline, the stored value stays the one the field rounds
+    to. A missing field counts as 0, like for ``$inc``.
+    """
+    field = document_cls._fields[field_name]
+    current = {"$ifNull": [f"${field.db_field}", 0]}
+    rounded = {
+        "$round": [{"$add": [current, field.to_mongo(delta)]}, field.precision]
+    }
+    # Adding 0 turns the -0.0 left by rounding a tiny negative drift into 0.0
+    return {"$add": [rounded, 0]}
+
+
+async def delete_documents(
+    queryset: QuerySet, session: Optional[AsyncClientSession] = None
+) -> int:
+    """Delete all matches, returns the deleted count.
+
+    Delete rules registered on the document class are not applied.
+    """
+    collection = async_db_connector.get_collection(queryset._document)
+    result = await collection.delete_many(queryset._query, session=session)
+    return result.deleted_count
+
+
+async def bulk_write(
+    document_cls: Type[Document],
+    operations: list,
+    session: Optional[AsyncClientSession] = None,
+) -> None:
+    collection = async_db_connector.get_collection(document_cls)
+    await collection.bulk_write(operations, ordered=False, session=session)
+
+
+class TransactionContext:
+    """Passed to the callback of ``run_in_transaction``.
+
+    ``session`` has to be given to every write of the callback. It is None on
+    a standalone server, where each write commits on its own; callbacks then
+    register the write undoing each step with ``on_rollback`` and those run in
+    reverse order if the callback fails. Inside a real transaction the abort
+    already discards every write, so registered compensations are ignored.
+    """
+
+    def __init__(self, session: Optional[AsyncClientSession]):
+        self.session = session
+        self._compensations: List[tuple] = []
+
+    def on_rollback(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> None:
+        if self.session is None:
+            self._compensations.append((func, args, kwargs))
+
+    async def compensate(self) -> None:
+        for func, args, kwargs in reversed(self._compensations):
+            try:
+                await func(*args, **kwargs)
+            except Exception:
+                logger.exception(f" Compensating write {func.__qualname__} failed")
+        self._compensations.clear()
+
+
+async def run_in_transaction(
+    callback: Callable[[TransactionContext], Awaitable[T]]
+) -> T:
+    """Run ``callback`` in a multi-document transaction and commit once.
+
+    ``with_transaction`` retries the whole callback on TransientTransactionError
+    and the commit on UnknownTransactionCommitResult, so the callback must only
+    write through ``context.session``. On a standalone server the callback runs
+    once without a session and its compensations run if it raises.
+    """
+    if not await async_db_connector.supports_transactions():
+        context = TransactionContext(None)
+        try:
+            return await callback(context)
+        except Exception:
+            await context.compensate()
+            raise
+
+    async with async_db_connector.get_client().start_session() as session:
+        return await session.with_transaction(
+            lambda s: callback(TransactionContext(s))
+        )
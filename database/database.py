@@ -7,10 +7,28 @@ from dotenv import load_dotenv
 from mongoengine.connection import get_connection
 
 from commons.logging_config import setup_logging
-from database.initialize_db import (
-    initialize_common_asset_types,
-    initialize_common_categories,
-    initialize_fiat_and_crypto_currencies,
+from database.async_database import async_db_connector
+from database.db_executor import INLINE_MODE, db_executor, run_in_db_executor
+from database.initialize_db import initialize_predefined_entities
+from database.pool_metrics import async_pool_metrics, mongoengine_pool_metrics
+from database.readiness import (
+    DB_PING_TIMEOUT_SECONDS,
+    INDEXES_ENSURED,
+    SEED_COMPLETE,
+    Readiness,
+    ping_db,
+)
+from models.models import (
+    Asset,
+    AssetType,
+    Balance,
+    Category,
+    Currency,
+    CurrencyExchange,
+    Transaction,
+    User,
+    UserAppData,
+    Wallet,
 )
 
 load_dotenv()
@@ -25,12 +43,23 @@ class DBConnector:
         self.MONGO_LOCAL_HOST = os.getenv("MONGO_LOCAL_HOST")
         self.MONGO_ATLAS_CONNECTION_STRING = os.getenv("MONGO_ATLAS_CONNECTION_STRING")
         self.DB_MODE = os.getenv("DB_MODE")
+        self.DB_EXECUTOR_MODE = os.getenv("DB_EXECUTOR_MODE", INLINE_MODE)
+        self.DB_EXECUTOR_MAX_WORKERS = int(os.getenv("DB_EXECUTOR_MAX_WORKERS", "16"))
+        self.MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+        self.MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+        self.MONGO_MAX_IDLE_TIME_MS = os.getenv("MONGO_MAX_IDLE_TIME_MS")
+        self.MONGO_WAIT_QUEUE_TIMEOUT_MS = os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS")
+        self.MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS")
 
     async def connect(self):
+        Readiness.reset()
         try:
             self._establish_connection()
-            await self._initialize_db()
             await self._verify_connection()
+            await self._ensure_indexes()
+            Readiness.mark_done(INDEXES_ENSURED)
+            await self._initialize_db()
+            Readiness.mark_done(SEED_COMPLETE)
         except Exception as e:
             logger.exception(
                 f" An error occurred while connecting to {self.MONGO_DATABASE}"
@@ -38,57 +67,111 @@ class DBConnector:
             raise e
 
     def _establish_connection(self):
+        connection_settings = {
+            **self._get_connection_settings(),
+            **self._get_pool_settings(),
+        }
+        mongoengine.connect(
+            db=self.MONGO_DATABASE,
+            event_listeners=[mongoengine_pool_metrics],
+            **connection_settings,
+        )
+        async_db_connector.configure(
+            self.MONGO_DATABASE,
+            event_listeners=[async_pool_metrics],
+            **connection_settings,
+        )
+        db_executor.configure(self.DB_EXECUTOR_MODE, self.DB_EXECUTOR_MAX_WORKERS)
+
+    def _get_connection_settings(self) -> dict:
         if self.DB_MODE == "local":
-            mongoengine.connect(
-                db=self.MONGO_DATABASE,
-                host=self.MONGO_LOCAL_HOST,
-                port=27017,
-                serverSelectionTimeoutMS=10000,
-            )
+            return {
+                "host": self.MONGO_LOCAL_HOST,
+                "port": 27017,
+                "serverSelectionTimeoutMS": 10000,
+            }
         elif self.DB_MODE == "container":
-            mongoengine.connect(
-                db=self.MONGO_DATABASE,
-                host=self.MONGO_HOST,
-                port=27017,
+            return {
+                "host": self.MONGO_HOST,
+                "port": 27017,
                 # # Add username and pass if you want
                 # # But have to create user in mongodb too
-                # username=MONGO_ROOT_USERNAME,
-                # password=MONGO_ROOT_PASSWORD,
-                # authentication_source="admin",
-                serverSelectionTimeoutMS=10000,
-            )
+                # "username": MONGO_ROOT_USERNAME,
+                # "password": MONGO_ROOT_PASSWORD,
+                # "authSource": "admin",
+                "serverSelectionTimeoutMS": 10000,
+            }
         elif self.DB_MODE == "atlas":
             connection_string = self.MONGO_ATLAS_CONNECTION_STRING
             if self.MONGO_DATABASE not in connection_string:
                 connection_string = connection_string.replace(
                     "mongodb.net/", f"mongodb.net/{self.MONGO_DATABASE}?"
                 )
-            mongoengine.connect(
-                host=connection_string,
-                serverSelectionTimeoutMS=30000,
-            )
+            return {
+                "host": connection_string,
+                "serverSelectionTimeoutMS": 30000,
+            }
+        raise ValueError(f"Unknown DB_MODE: {self.DB_MODE}")
+
+    def _get_pool_settings(self) -> dict:
+        """Connection pool options, the same for every DB_MODE.
+
+        Each client of the worker gets its own pool of up to
+        ``MONGO_MAX_POOL_SIZE`` connections. Unset optional values keep the
+        driver defaults: idle connections are never closed, checkouts wait for
+        a free connection without a limit and the wire protocol is not
+        compressed.
+        """
+        settings = {
+            "maxPoolSize": self.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": self.MONGO_MIN_POOL_SIZE,
+        }
+        if self.MONGO_MAX_IDLE_TIME_MS:
+            settings["maxIdleTimeMS"] = int(self.MONGO_MAX_IDLE_TIME_MS)
+        if self.MONGO_WAIT_QUEUE_TIMEOUT_MS:
+            settings["waitQueueTimeoutMS"] = int(self.MONGO_WAIT_QUEUE_TIMEOUT_MS)
+        if self.MONGO_COMPRESSORS:
+            settings["compressors"] = self.MONGO_COMPRESSORS
+        return settings
+
+    async def _ensure_indexes(self):
+        for document_cls in (
+            User,
+            UserAppData,
+            Currency,
+            CurrencyExchange,
+            Balance,
+            Wallet,
+            Transaction,
+            AssetType,
+            Asset,
+            Category,
+        ):
+            await run_in_db_executor(document_cls.ensure_indexes)
 
     async def _initialize_db(self):
-        await initialize_fiat_and_crypto_currencies()
-        await initialize_common_asset_types()
-        await initialize_common_categories()
+        await initialize_predefined_entities()
 
     async def _verify_connection(self):
-        connection = get_connection()
+        """Fails fast if the database doesn't answer a ping within the deadline."""
         try:
-            if connection[self.MONGO_DATABASE].list_collection_names():
-                logger.info(
-                    f" Connected to {self.MONGO_DATABASE} successfully, mode: {self.DB_MODE}"
-                )
-            else:
-                logger.error(f" Failed to connect to {self.MONGO_DATABASE}")
+            await ping_db(DB_PING_TIMEOUT_SECONDS)
         except Exception as e:
-            logger.error(f" Failed to verify {self.MONGO_DATABASE} connection: %s", e)
+            raise ConnectionError(
+                f"{self.MONGO_DATABASE} didn't answer a ping"
+                f" within {DB_PING_TIMEOUT_SECONDS}s"
+            ) from e
+        logger.info(
+            f" Connected to {self.MONGO_DATABASE} successfully, mode: {self.DB_MODE}"
+        )
 
     async def disconnect(self):
+        Readiness.reset()
         try:
             connection = get_connection()
             if connection:
+                await async_db_connector.disconnect()
+                db_executor.shutdown()
                 mongoengine.disconnect()
                 logger.info(f" Disconnected from {self.MONGO_DATABASE}")
         except Exception as e:
@@ -0,0 +1,49 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from commons.logging_config import setup_logging
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+INLINE_MODE = "inline"
+THREADPOOL_MODE = "threadpool"
+
+
+class DBExecutor:
+    """Runs blocking mongoengine calls either inline or in a bounded thread pool."""
+
+    def __init__(self):
+        self.mode = INLINE_MODE
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def configure(self, mode: Optional[str], max_workers: int) -> None:
+        self.shutdown()
+        self.mode = mode or INLINE_MODE
+        if self.mode == THREADPOOL_MODE:
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="db-executor"
+            )
+            logger.info(f" DB executor running with {max_workers} threads")
+        elif self.mode != INLINE_MODE:
+            raise ValueError(f"Unknown DB_EXECUTOR_MODE: {self.mode}")
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        if self._executor is None:
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(func, *args, **kwargs)
+        )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+db_executor = DBExecutor()
+run_in_db_executor = db_executor.run
@@ -1,134 +1,187 @@
-from app.crud.asset_type_crud import AssetTypeCRUD
-from app.crud.category_crud import CategoryCRUD
-from app.crud.currency_crud import CurrencyCRUD
+import hashlib
+import logging
+from datetime import datetime, timezone
+from typing import List, Tuple, Type
+
+import orjson
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from commons.logging_config import setup_logging
+from database.async_database import bulk_write, find_first_document
 from models.enums import TransactionTypeEnum as T
-from models.models import AssetType, Category, Currency
-
-
-async def initialize_fiat_and_crypto_currencies():
-    currencies = [
-        # Fiat currencies
-        {"code": "USD", "name": "US Dollar", "symbol": "$", "currency_type": "fiat"},
-        {"code": "EUR", "name": "Euro", "symbol": "€", "currency_type": "fiat"},
-        {"code": "JPY", "name": "Japanese Yen", "symbol": "¥", "currency_type": "fiat"},
-        {
-            "code": "GBP",
-            "name": "British Pound",
-            "symbol": "£",
-            "currency_type": "fiat",
-        },
-        {
-            "code": "AUD",
-            "name": "Australian Dollar",
-            "symbol": "A$",
-            "currency_type": "fiat",
-        },
-        {
-            "code": "CAD",
-            "name": "Canadian Dollar",
-            "symbol": "C$",
-            "currency_type": "fiat",
-        },
-        {
-            "code": "CHF",
-            "name": "Swiss Franc",
-            "symbol": "CHF",
-            "currency_type": "fiat",
-        },
-        {
-            "code": "CNY",
-            "name": "Chinese Yuan",
-            "symbol": "CN¥",
-            "currency_type": "fiat",
-        },
-        {
-            "code": "SEK",
-            "name": "Swedish Krona",
-            "symbol": "kr",
-            "currency_type": "fiat",
-        },
-        {
-            "code": "NZD",
-            "name": "New Zealand Dollar",
-            "symbol": "NZ$",
-            "currency_type": "fiat",
-        },
-        # Crypto currencies
-        {"code": "BTC", "name": "Bitcoin", "symbol": "₿", "currency_type": "crypto"},
-        {"code": "ETH", "name": "Ethereum", "symbol": "Ξ", "currency_type": "crypto"},
-        {"code": "XRP", "name": "Ripple", "symbol": "XRP", "currency_type": "crypto"},
-        {"code": "LTC", "name": "Litecoin", "symbol": "Ł", "currency_type": "crypto"},
-        {
-            "code": "BCH",
-            "name": "Bitcoin Cash",
-            "symbol": "BCH",
-            "currency_type": "crypto",
-        },
-    ]
-
-    for currency_data in currencies:
-        existing_currency = await CurrencyCRUD.get_one_by_user_and_code_optional(
-            currency_data["code"], None
-        )
-        if not existing_currency:
-            currency = Currency(
-                user_id=None,
-                code=currency_data["code"],
-                name=currency_data["name"],
-                symbol=currency_data["symbol"],
-                currency_type=currency_data["currency_type"],
-                is_predefined=True,
-            )
-            await CurrencyCRUD.create_one(currency)
+from models.models import (
+    AssetType,
+    Category,
+    Currency,
+    PredefinedEntity,
+    SeedVersion,
+)
 
-    print("Currencies initialized")
+setup_logging()
+logger = logging.getLogger(__name__)
 
+PREDEFINED_SEED_NAME = "predefined_entities"
 
-async def initialize_common_categories():
-    categories = [
-        {"name": "Salary", "type": T.INCOME.value},
-        {"name": "Freelance", "type": T.INCOME.value},
-        {"name": "Groceries", "type": T.EXPENSE.value},
-        {"name": "Rent", "type": T.EXPENSE.value},
-        {"name": "Utilities", "type": T.EXPENSE.value},
-        {"name": "Bank Transfer", "type": T.TRANSFER.value},
-    ]
+PREDEFINED_CURRENCIES = [
+    # Fiat currencies
+    {"code": "USD", "name": "US Dollar", "symbol": "$", "currency_type": "fiat"},
+    {"code": "EUR", "name": "Euro", "symbol": "€", "currency_type": "fiat"},
+    {"code": "JPY", "name": "Japanese Yen", "symbol": "¥", "currency_type": "fiat"},
+    {
+        "code": "GBP",
+        "name": "British Pound",
+        "symbol": "£",
+        "currency_type": "fiat",
+    },
+    {
+        "code": "AUD",
+        "name": "Australian Dollar",
+        "symbol": "A$",
+        "currency_type": "fiat",
+    },
+    {
+        "code": "CAD",
+        "name": "Canadian Dollar",
+        "symbol": "C$",
+        "currency_type": "fiat",
+    },
+    {
+        "code": "CHF",
+        "name": "Swiss Franc",
+        "symbol": "CHF",
+        "currency_type": "fiat",
+    },
+    {
+        "code": "CNY",
+        "name": "Chinese Yuan",
+        "symbol": "CN¥",
+        "currency_type": "fiat",
+    },
+    {
+        "code": "SEK",
+        "name": "Swedish Krona",
+        "symbol": "kr",
+        "currency_type": "fiat",
+    },
+    {
+        "code": "NZD",
+        "name": "New Zealand Dollar",
+        "symbol": "NZ$",
+        "currency_type": "fiat",
+    },
+    # Crypto currencies
+    {"code": "BTC", "name": "Bitcoin", "symbol": "₿", "currency_type": "crypto"},
+    {"code": "ETH", "name": "Ethereum", "symbol": "Ξ", "currency_type": "crypto"},
+    {"code": "XRP", "name": "Ripple", "symbol": "XRP", "currency_type": "crypto"},
+    {"code": "LTC", "name": "Litecoin", "symbol": "Ł", "currency_type": "crypto"},
+    {
+        "code": "BCH",
+        "name": "Bitcoin Cash",
+        "symbol": "BCH",
+        "currency_type": "crypto",
+    },
+]
 
-    for category_data in categories:
-        existing_category = await CategoryCRUD.get_one_by_user_and_name_optional(
-            category_data["name"], None
-        )
-        if not existing_category:
-            category = Category(
-                user_id=None,
-                name=category_data["name"],
-                type=category_data["type"],
-                is_predefined=True,
-            )
-            await CategoryCRUD.create_one(category)
+PREDEFINED_CATEGORIES = [
+    {"name": "Salary", "type": T.INCOME.value},
+    {"name": "Freelance", "type": T.INCOME.value},
+    {"name": "Groceries", "type": T.EXPENSE.value},
+    {"name": "Rent", "type": T.EXPENSE.value},
+    {"name": "Utilities", "type": T.EXPENSE.value},
+    {"name": "Bank Transfer", "type": T.TRANSFER.value},
+]
 
-    print("Categories initialized")
+PREDEFINED_ASSET_TYPES = [
+    {"name": "Real Estate"},
+    {"name": "Vehicle"},
+    {"name": "Precious Metals"},
+    {"name": "Collectibles"},
+    {"name": "Art"},
+]
 
+# A document class, the fields identifying an entity among the predefined
+# ones, and the entities
+Seed = Tuple[Type[PredefinedEntity], Tuple[str, ...], List[dict]]
 
-async def initialize_common_asset_types():
-    asset_types = [
-        {"name": "Real Estate"},
-        {"name": "Vehicle"},
-        {"name": "Precious Metals"},
-        {"name": "Collectibles"},
-        {"name": "Art"},
-    ]
+PREDEFINED_SEEDS: Tuple[Seed, ...] = (
+    (Currency, ("code",), PREDEFINED_CURRENCIES),
+    (AssetType, ("name",), PREDEFINED_ASSET_TYPES),
+    (Category, ("name",), PREDEFINED_CATEGORIES),
+)
 
-    for asset_type_data in asset_types:
-        existing_asset_type = await AssetTypeCRUD.get_one_by_user_and_name_optional(
-            asset_type_data["name"], None
-        )
-        if not existing_asset_type:
-            asset_type = AssetType(
-                user_id=None,
-                name=asset_type_data["name"],
-                is_predefined=True,
+# Changes whenever the seed data above changes
+PREDEFINED_SEED_VERSION = hashlib.sha256(
+    orjson.dumps(
+        [
+            (document_cls.__name__, keys, seed)
+            for document_cls, keys, seed in PREDEFINED_SEEDS
+        ]
+    )
+).hexdigest()
+
+
+async def initialize_predefined_entities() -> None:
+    """Upsert the predefined currencies, asset types and categories.
+
+    Every collection is seeded with one unordered bulk write of upserts, so
+    restarts and workers booting at the same time are harmless. Nothing is
+    written when the stored seed version matches ``PREDEFINED_SEED_VERSION``.
+    """
+    seed_version = await find_first_document(
+        SeedVersion.objects(name=PREDEFINED_SEED_NAME)
+    )
+    if seed_version and seed_version.version == PREDEFINED_SEED_VERSION:
+        logger.info(" Predefined entities are up to date")
+        return
+
+    for document_cls, keys, seed in PREDEFINED_SEEDS:
+        await _upsert_predefined(document_cls, keys, seed)
+
+    await bulk_write(
+        SeedVersion,
+        [
+            UpdateOne(
+                {"_id": PREDEFINED_SEED_NAME},
+                {
+                    "$set": {
+                        "version": PREDEFINED_SEED_VERSION,
+                        "seeded_at": datetime.now(timezone.utc),
+                    }
+                },
+                upsert=True,
             )
-            await AssetTypeCRUD.create_one(asset_type)
+        ],
+    )
+    logger.info(" Predefined entities initialized")
 
-    print("Asset types initialized")
+
+async def _upsert_predefined(
+    document_cls: Type[PredefinedEntity], keys: Tuple[str, ...], seed: List[dict]
+) -> None:
+    operations = []
+    for entity_data in seed:
+        entity = document_cls(user_id=None, is_predefined=True, **entity_data)
+        # Field validation only: clean() would query for duplicates per entity
+        entity.validate(clean=False)
+        son = entity.to_mongo().to_dict()
+        seeded = {field: son.pop(field) for field in (*entity_data, "is_predefined")}
+        update = {"$set": seeded}
+        if son:
+            # Defaults like created_at, kept as they are on existing entities
+            update["$setOnInsert"] = son
+        operations.append(
+            UpdateOne(
+                {**{key: seeded[key] for key in keys}, "is_predefined": True},
+                update,
+                upsert=True,
+            )
+        )
+    try:
+        await bulk_write(document_cls, operations)
+    except BulkWriteError as e:
+        # Another worker inserted the same entities meanwhile
+        write_errors = e.details.get("writeErrors", [])
+        if not write_errors or any(error["code"] != 11000 for error in write_errors):
+            raise
+        logger.info(f" {document_cls.__name__} seed raced with another worker")
@@ -0,0 +1,114 @@
+import threading
+from typing import Any, Dict
+
+from pymongo import monitoring
+
+
+class _PoolStats:
+    def __init__(self):
+        self.open = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.checkouts = 0
+        self.checkout_failures: Dict[str, int] = {}
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.clears = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "open": self.open,
+            "in_use": self.in_use,
+            "max_in_use": self.max_in_use,
+            "checkouts": self.checkouts,
+            "checkout_failures": dict(self.checkout_failures),
+            "average_wait_seconds": (
+                self.total_wait_seconds / self.checkouts if self.checkouts else 0.0
+            ),
+            "max_wait_seconds": self.max_wait_seconds,
+            "clears": self.clears,
+        }
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Connection pool counters of a MongoDB client, fed by CMAP events.
+
+    Counters are kept per server address: open and checked out connections,
+    the peak of the latter, and how long checkouts waited for a connection,
+    which is what ``MONGO_MAX_POOL_SIZE`` has to be sized against. pymongo
+    calls the listener from every thread using the client, so they are updated
+    under a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: Dict[str, _PoolStats] = {}
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {address: stats.to_dict() for address, stats in self._pools.items()}
+
+    def _stats(self, event) -> _PoolStats:
+        address = "%s:%s" % event.address
+        stats = self._pools.get(address)
+        if stats is None:
+            stats = self._pools[address] = _PoolStats()
+        return stats
+
+    def pool_created(self, event):
+        with self._lock:
+            self._stats(event)
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self._stats(event).clears += 1
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        with self._lock:
+            self._stats(event).open += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self._stats(event).open -= 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            failures = self._stats(event).checkout_failures
+            failures[event.reason] = failures.get(event.reason, 0) + 1
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            stats = self._stats(event)
+            stats.in_use += 1
+            stats.max_in_use = max(stats.max_in_use, stats.in_use)
+            stats.checkouts += 1
+            stats.total_wait_seconds += event.duration
+            stats.max_wait_seconds = max(stats.max_wait_seconds, event.duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self._stats(event).in_use -= 1
+
+
+# One listener per client kind, the async clients of every event loop share one
+mongoengine_pool_metrics = PoolMetrics()
+async_pool_metrics = PoolMetrics()
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    return {
+        "mongoengine": mongoengine_pool_metrics.metrics(),
+        "async": async_pool_metrics.metrics(),
+    }
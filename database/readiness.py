@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import os
+from typing import Dict, Set
+
+from commons.logging_config import setup_logging
+from database.async_database import async_db_connector
+
+setup_logging()
+logger = logging.getLogger(__name__)
+
+DB_PING_TIMEOUT_SECONDS = float(os.getenv("DB_PING_TIMEOUT_SECONDS", "5"))
+
+INDEXES_ENSURED = "indexes_ensured"
+SEED_COMPLETE = "seed_complete"
+STARTUP_STEPS = (INDEXES_ENSURED, SEED_COMPLETE)
+
+
+async def ping_db(timeout: float = DB_PING_TIMEOUT_SECONDS) -> None:
+    """Round-trips a ping to the database.
+
+    Raises:
+        asyncio.TimeoutError: If the server didn't answer within ``timeout``
+            seconds, however long the client's server selection timeout is.
+    """
+    client = async_db_connector.get_client()
+    await asyncio.wait_for(client.admin.command("ping"), timeout)
+
+
+class Readiness:
+    """Startup steps this worker completed, reported by the readiness probe.
+
+    The database connector marks every step of ``STARTUP_STEPS`` as it
+    finishes them and resets them on connect and disconnect. The worker is
+    ready once all of them are done and the database answers a ping.
+    """
+
+    _completed: Set[str] = set()
+
+    @classmethod
+    def mark_done(cls, step: str) -> None:
+        cls._completed.add(step)
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._completed = set()
+
+    @classmethod
+    async def check(cls) -> Dict[str, bool]:
+        checks = {"db_reachable": await cls._db_reachable()}
+        checks.update({step: step in cls._completed for step in STARTUP_STEPS})
+        return checks
+
+    @staticmethod
+    async def _db_reachable() -> bool:
+        try:
+            await ping_db()
+        except Exception as e:
+            logger.warning(" Readiness ping failed: %r", e)
+            return False
+        return True
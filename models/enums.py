@@ -10,3 +10,14 @@ class TransactionTypeEnum(str, Enum):
 class RoleEnum(str, Enum):
     ADMIN = "admin"
     USER = "user"
+
+
+class StatisticsIntervalEnum(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class ExportFormatEnum(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
@@ -1,7 +1,8 @@
 from datetime import datetime, timezone
 from decimal import Decimal
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
 
-from bson import ObjectId
+from bson import Decimal128, ObjectId
 from mongoengine import (
     CASCADE,
     DENY,
@@ -9,15 +10,16 @@ from mongoengine import (
     PULL,
     BooleanField,
     DateTimeField,
+    Decimal128Field,
     DecimalField,
     Document,
     EmailField,
     LazyReferenceField,
     ListField,
+    ObjectIdField,
     ReferenceField,
     StringField,
     ValidationError,
-    signals,
 )
 
 from models.enums import TransactionTypeEnum as T
@@ -30,45 +32,133 @@ from models.validators import (
 
 PRECISION_LIMIT_IN_DB = 10
 
+# Per document class, the (key, converter) pairs of the fields needing a
+# conversion and the keys of all fields, see BaseDocument._get_son_conversion
+_SonConversion = Tuple[Tuple[Tuple[str, Callable], ...], FrozenSet[str]]
+_SON_CONVERSIONS: Dict[type, _SonConversion] = {}
+
+
+def _object_ids_to_str(values: list) -> list:
+    return [str(value) for value in values]
+
+
+def _decimal_to_float(field) -> Callable:
+    """Return the conversion of a decimal field's raw value to a float.
+
+    Stored floats are only rounded to the field precision with `round`, so
+    amounts that drifted in the database come out like `to_dict` returns them
+    without building a Decimal. Decimal128 values (e.g. aggregation results)
+    are quantized by the field.
+    """
+    to_python = field.to_python
+    precision = getattr(field, "precision", None)
+
+    def convert(value):
+        if isinstance(value, float):
+            return value if precision is None else round(value, precision)
+        if isinstance(value, Decimal128):
+            return float(to_python(value))
+        return float(value)
+
+    return convert
+
 
 class BaseDocument(Document):
     meta = {"abstract": True}
 
     def to_dict(self) -> dict:
         # Convert the document to a dictionary
-        doc_dict = self.to_mongo().to_dict()
+        return self.son_to_dict(self.to_mongo())
+
+    @classmethod
+    def son_to_dict(cls, doc_dict: dict) -> dict:
+        """Convert a raw document (e.g. read with a projection) like `to_dict`."""
+        conversion = _SON_CONVERSIONS.get(cls)
+        if conversion is None:
+            conversion = _SON_CONVERSIONS[cls] = cls._get_son_conversion()
+        converters, known_keys = conversion
+        result = dict(doc_dict)
+        for key, convert in converters:
+            value = result.get(key)
+            if value is not None:
+                result[key] = convert(value)
+        if not known_keys.issuperset(result):
+            for key in result.keys() - known_keys:
+                result[key] = cls._convert_value(result[key])
+        return result
 
-        # Process each key-value pair in the dictionary
-        for key, value in doc_dict.items():
-            doc_dict[key] = self._convert_value(value)
+    @classmethod
+    def _get_son_conversion(cls) -> _SonConversion:
+        """Precompute how raw documents of this class are converted.
+
+        Returns the (key, converter) pairs of the fields that need a
+        conversion, chosen from the field definitions so values aren't type
+        checked one by one, and the keys of all fields. Keys without a field
+        (e.g. computed by an aggregation) go through `_convert_value`.
+        """
+        converters = []
+        for field in cls._fields.values():
+            converter = cls._get_field_converter(field)
+            if converter is not None:
+                converters.append((field.db_field, converter))
+        known_keys = frozenset(field.db_field for field in cls._fields.values())
+        return tuple(converters), known_keys
 
-        return doc_dict
+    @classmethod
+    def _get_field_converter(cls, field) -> Optional[Callable]:
+        """Return the conversion of a field's raw value, None to keep it as is.
+
+        Converters are only called with values that aren't None.
+        """
+        if isinstance(field, ObjectIdField) or cls._is_object_id_reference(field):
+            return str
+        if isinstance(field, ListField) and (
+            isinstance(field.field, ObjectIdField)
+            or cls._is_object_id_reference(field.field)
+        ):
+            return _object_ids_to_str
+        if isinstance(field, (DecimalField, Decimal128Field)):
+            return _decimal_to_float(field)
+        if isinstance(field, (StringField, BooleanField, DateTimeField)):
+            return None
+        return cls._convert_value
+
+    @staticmethod
+    def _is_object_id_reference(field) -> bool:
+        # References stored as DBRef are left alone, like before
+        return (
+            isinstance(field, (ReferenceField, LazyReferenceField)) and not field.dbref
+        )
 
-    def _convert_value(self, value) -> object:
+    @classmethod
+    def _convert_value(cls, value) -> object:
         """Convert ObjectId or list of ObjectIds/dicts to strings."""
         if isinstance(value, ObjectId):
-            return self._convert_objectid_to_str(value)
+            return cls._convert_objectid_to_str(value)
         elif isinstance(value, list):
-            return self._convert_list(value)
+            return cls._convert_list(value)
         return value
 
-    def _convert_objectid_to_str(self, object_id: ObjectId) -> str:
+    @staticmethod
+    def _convert_objectid_to_str(object_id: ObjectId) -> str:
         """Convert an ObjectId to a string."""
         return str(object_id)
 
-    def _convert_list(self, value_list: list) -> list:
+    @classmethod
+    def _convert_list(cls, value_list: list) -> list:
         """Convert a list of ObjectIds or dicts with ObjectIds to strings."""
         if all(isinstance(item, ObjectId) for item in value_list):
-            return [self._convert_objectid_to_str(item) for item in value_list]
+            return [cls._convert_objectid_to_str(item) for item in value_list]
         elif all(isinstance(item, dict) for item in value_list):
-            return [self._convert_dict(item) for item in value_list]
+            return [cls._convert_dict(item) for item in value_list]
         return value_list
 
-    def _convert_dict(self, value_dict: dict) -> dict:
+    @classmethod
+    def _convert_dict(cls, value_dict: dict) -> dict:
         """Convert ObjectId values in a dictionary to strings."""
         for sub_key, sub_value in value_dict.items():
             if isinstance(sub_value, ObjectId):
-                value_dict[sub_key] = self._convert_objectid_to_str(sub_value)
+                value_dict[sub_key] = cls._convert_objectid_to_str(sub_value)
         return value_dict
 
 
@@ -135,42 +225,10 @@ class Balance(BaseDocument):
     amount = DecimalField(min_value=0, required=True, precision=PRECISION_LIMIT_IN_DB)
     meta = {"indexes": [{"fields": ("wallet_id", "currency_id"), "unique": True}]}
 
-    @classmethod
-    def pre_save(cls, sender, document, **kwargs):
-        # Check if the document is new and update wallets total-value
-        is_new = document.pk is None
-        wallet = Wallet.objects.get(id=document.wallet_id.id)
-        if is_new:
-            wallet.total_value += document.amount
-        else:
-            current_balance = Balance.objects.get(id=document.id)
-            difference = document.amount - current_balance.amount
-            wallet.total_value += difference
-        wallet.save()
-
-    @classmethod
-    def post_save(cls, sender, document, **kwargs):
-        # Update wallet's balance_ids if it's a new balance
-        is_new = kwargs.get("created", False)
-        wallet = Wallet.objects.get(id=document.wallet_id.id)
-        if is_new and document.id not in wallet.balances_ids:
-            wallet.balances_ids.append(document.id)
-            wallet.save()
-
-    @classmethod
-    def pre_delete(cls, sender, document, **kwargs):
-        # update wallets total-value
-        wallet = Wallet.objects.get(id=document.wallet_id.id)
-        wallet.total_value -= document.amount
-        wallet.save()
-
-
-signals.pre_save.connect(Balance.pre_save, sender=Balance)
-signals.post_save.connect(Balance.post_save, sender=Balance)
-signals.pre_delete.connect(Balance.pre_delete, sender=Balance)
-
 
 class Wallet(BaseDocument, TimestampMixin):
+    # balances_ids and total_value are denormalized from the wallet's balances
+    # and kept in sync by app.crud.wallet_aggregate.WalletAggregate
     user_id = ReferenceField("User", required=True, reverse_delete_rule=CASCADE)
     name = StringField(required=True, max_length=50)
     type = StringField(required=True, choices=["fiat", "crypto"])
@@ -189,6 +247,29 @@ class Wallet(BaseDocument, TimestampMixin):
         doc_dict["total_value"] = str(self.total_value)
         return doc_dict
 
+    def to_dict_with_balances(self, balances: List[Balance]) -> dict:
+        """Like `to_dict`, with the balances loaded by the caller.
+
+        `to_mongo` reads the stored ids of ``balances_ids``, so the balances
+        aren't dereferenced.
+        """
+        return self.son_to_dict_with_balances(
+            self.to_mongo(), [balance.to_mongo() for balance in balances]
+        )
+
+    @classmethod
+    def son_to_dict_with_balances(cls, doc_dict: dict, balances: List[dict]) -> dict:
+        """Convert a raw wallet and its raw balances like `to_dict`."""
+        total_value = cls._fields["total_value"].to_python(
+            doc_dict.get("total_value", cls._fields["total_value"].default)
+        )
+        wallet_dict = cls.son_to_dict(doc_dict)
+        wallet_dict["balances_ids"] = [
+            Balance.son_to_dict(balance) for balance in balances
+        ]
+        wallet_dict["total_value"] = str(total_value)
+        return wallet_dict
+
 
 Wallet.register_delete_rule(Balance, "wallet_id", CASCADE)
 
@@ -250,6 +331,18 @@ class Transaction(BaseDocument):
     date = DateTimeField(default=datetime.utcnow)
     description = StringField(max_length=255)
 
+    # Keyset pagination sorts on (-date, -_id) after the equality filters.
+    # Wallet and category lead their indexes so reverse delete rules use them too.
+    meta = {
+        "indexes": [
+            {"fields": ("user_id", "-date", "-id")},
+            {"fields": ("user_id", "type", "-date", "-id")},
+            {"fields": ("category_id", "user_id", "-date", "-id")},
+            {"fields": ("from_wallet_id", "user_id", "-date", "-id")},
+            {"fields": ("to_wallet_id", "user_id", "-date", "-id")},
+        ]
+    }
+
     def clean(self) -> None:
         super().clean()
         TransactionValidator.validate(self)
@@ -289,3 +382,10 @@ class Asset(BaseDocument, TimestampMixin):
             raise ValidationError("Name must be at least 3 characters long.")
 
     meta = {"indexes": [{"fields": ("user_id", "name"), "unique": True}]}
+
+
+class SeedVersion(BaseDocument):
+    # Version of the data seeded by database/initialize_db.py, one per seed
+    name = StringField(primary_key=True)
+    version = StringField(required=True)
+    seeded_at = DateTimeField(default=lambda: datetime.now(timezone.utc))
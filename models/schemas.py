@@ -3,9 +3,15 @@ from decimal import Decimal
 from typing import Any, List, Optional
 
 from fastapi import Query
+from mongoengine.context_managers import no_dereference
 from pydantic import BaseModel, EmailStr, Extra, Field, field_validator, model_validator
 
-from models.enums import TransactionTypeEnum
+from commons.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from models.enums import (
+    ExportFormatEnum,
+    StatisticsIntervalEnum,
+    TransactionTypeEnum,
+)
 from models.enums import TransactionTypeEnum as T
 from models.models import CurrencyExchange, Transaction
 from models.validators import (
@@ -17,6 +23,7 @@ from models.validators import (
 ZERO = Decimal("0")
 MAX_INTEGER_PART = Decimal("1e10")
 MAX_DECIMAL_PART = 8
+MAX_TRANSACTIONS_PER_IMPORT = 1000
 
 
 def create_decimal_field(required: bool = True, example: str = "100.00") -> Any:
@@ -169,15 +176,35 @@ class TransactionCreateSchema(TransactionBaseSchema):
     @model_validator(mode="after")
     def validate_transaction(cls, values):
         transaction = Transaction(**values.model_dump())
-        TransactionValidator.validate(transaction)
+        # Only the presence of the references is checked, don't fetch them
+        with no_dereference(Transaction):
+            TransactionValidator.validate(transaction)
         return values
 
 
+class TransactionImportSchema(BaseModel):
+    transactions: List[TransactionCreateSchema] = Field(
+        ..., min_length=1, max_length=MAX_TRANSACTIONS_PER_IMPORT
+    )
+
+
 class TransactionUpdateSchema(TransactionBaseSchema):
     pass
 
 
-class TransactionFilterParams(BaseModel):
+class PaginationParams(BaseModel):
+    limit: int = Query(
+        DEFAULT_PAGE_SIZE,
+        ge=1,
+        le=MAX_PAGE_SIZE,
+        description="Maximum number of items to return",
+    )
+    cursor: Optional[str] = Query(
+        None, description="The next_cursor value returned with the previous page"
+    )
+
+
+class TransactionQueryParams(BaseModel):
     start_date: Optional[datetime] = Query(
         None,
         description="Start date for filtering in ISO format (e.g., 2023-10-15T14:30:00Z)",
@@ -217,6 +244,16 @@ class TransactionFilterParams(BaseModel):
         return values
 
 
+class TransactionFilterParams(PaginationParams, TransactionQueryParams):
+    pass
+
+
+class TransactionExportParams(TransactionQueryParams):
+    format: ExportFormatEnum = Query(
+        ExportFormatEnum.NDJSON, description="Export format: ndjson or csv"
+    )
+
+
 class TransactionStatisticsParams(BaseModel):
     start_date: Optional[datetime] = Query(
         None,
@@ -228,6 +265,16 @@ class TransactionStatisticsParams(BaseModel):
     )
 
 
+class TransactionSeriesParams(TransactionStatisticsParams):
+    interval: StatisticsIntervalEnum = Query(
+        StatisticsIntervalEnum.MONTH,
+        description="Bucket size of the series: day, week (ISO week) or month",
+    )
+    split_by_category: bool = Query(
+        False, description="Return one series per category_id"
+    )
+
+
 class CategoryCreateSchema(BaseModel):
     name: str = Field(..., max_length=50, example="Groceries")
     type: str = Field(
@@ -0,0 +1,120 @@
+import pytest
+from mongoengine import ValidationError
+
+from app.api.controllers.auth_controller import AuthController
+from models.models import User
+from models.schemas import UserSchema
+
+PASSWORD = "TestPassword!@#123"
+NEW_PASSWORD = "NewTestPassword!@#456"
+
+
+@pytest.mark.asyncio
+class TestAuthenticationRoutesSetup:
+    async def _register_user(self, username: str, test_currency) -> dict:
+        """Register a user and return its authorization headers."""
+        access_token = await AuthController.register_user(
+            UserSchema(
+                username=username,
+                email=f"{username}@example.com",
+                password=PASSWORD,
+                base_currency_id=str(test_currency.id),
+            )
+        )
+        return {"Authorization": f"Bearer {access_token}"}
+
+
+@pytest.mark.asyncio
+class TestRegisterRoute(TestAuthenticationRoutesSetup):
+    """Tests for user registration"""
+
+    async def test_register_returns_working_token(self, client, test_currency):
+        """Test the token issued on registration authenticates the new user."""
+        user_data = {
+            "username": "registereduser",
+            "email": "registereduser@example.com",
+            "password": PASSWORD,
+            "base_currency_id": str(test_currency.id),
+        }
+
+        response = client.post("/register", json=user_data)
+
+        assert response.status_code == 201
+        token = response.json()["data"]
+        assert token["token_type"] == "bearer"
+        headers = {"Authorization": f"Bearer {token['access_token']}"}
+        response = client.get("/user", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["data"]["username"] == "registereduser"
+
+    async def test_register_with_invalid_base_currency_leaves_no_user(self, client):
+        """Test a failed registration rolls the created user back."""
+        user_data = {
+            "username": "rolledbackuser",
+            "email": "rolledbackuser@example.com",
+            "password": PASSWORD,
+            "base_currency_id": "invalid-id",
+        }
+
+        with pytest.raises(ValidationError):
+            client.post("/register", json=user_data)
+
+        assert User.objects(username="rolledbackuser").count() == 0
+
+
+@pytest.mark.asyncio
+class TestCachedUserInvalidation(TestAuthenticationRoutesSetup):
+    """The authenticated user cache never serves outdated users"""
+
+    async def test_token_rejected_after_user_deleted(self, client, test_currency):
+        """Test a token stops working right after its user is deleted."""
+        headers = await self._register_user("deleteduser", test_currency)
+        assert client.get("/user", headers=headers).status_code == 200
+
+        response = client.delete("/user", headers=headers)
+        assert response.status_code == 200
+
+        assert client.get("/user", headers=headers).status_code == 401
+
+    async def test_changed_password_used_on_next_request(self, client, test_currency):
+        """Test a password changed through the API is seen by the next request."""
+        headers = await self._register_user("passworduser", test_currency)
+        old_hash = client.get("/user", headers=headers).json()["data"][
+            "hashed_password"
+        ]
+
+        response = client.put(
+            "/update", json={"password": NEW_PASSWORD}, headers=headers
+        )
+        assert response.status_code == 200
+
+        response = client.get("/user", headers=headers)
+        assert response.status_code == 200
+        assert response.json()["data"]["hashed_password"] != old_hash
+        login = {"username": "passworduser", "password": PASSWORD}
+        assert client.post("/login", data=login).status_code == 401
+        login["password"] = NEW_PASSWORD
+        assert client.post("/login", data=login).status_code == 200
+
+    async def test_token_rejected_after_username_changed(self, client, test_currency):
+        """Test the cached user of the old username is dropped on update."""
+        headers = await self._register_user("renameduser", test_currency)
+        assert client.get("/user", headers=headers).status_code == 200
+
+        response = client.put(
+            "/update", json={"username": "renameduser2"}, headers=headers
+        )
+        assert response.status_code == 200
+
+        assert client.get("/user", headers=headers).status_code == 401
+
+    async def test_changed_role_used_on_next_request(self, client, test_currency):
+        """Test a role saved on the model is seen by the next request."""
+        headers = await self._register_user("roleuser", test_currency)
+        assert client.get("/metrics", headers=headers).status_code == 403
+
+        user = User.objects(username="roleuser").first()
+        user.role = "admin"
+        user.save()
+
+        assert client.get("/metrics", headers=headers).status_code == 200
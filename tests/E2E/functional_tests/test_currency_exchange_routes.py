@@ -2,8 +2,12 @@ from datetime import datetime, timezone
 from decimal import Decimal
 
 import pytest
+from bson import ObjectId
 from mongoengine import DoesNotExist
 
+from app.crud import exchange_rate_graph
+from app.crud.currency_exchange_crud import CurrencyExchangeCRUD
+from app.crud.exchange_rate_graph import ExchangeRateGraphCache
 from models.models import Currency, CurrencyExchange, User
 
 
@@ -507,3 +511,83 @@ class TestDeleteCurrencyExchangeRoutePositive(TestCurrencyExchangeRoutesSetup):
         assert response.status_code == 200
         assert response.json()["message"] == "Currency exchange deleted successfully"
         await self._verify_exchange_deleted(str(exchange.id))
+
+
+@pytest.mark.asyncio
+class TestExchangeRateGraphPositive(TestCurrencyExchangeRoutesSetup):
+    """Happy path tests for rate lookups through the exchange-rate graph"""
+
+    async def test_multi_hop_exchange_rate(self, test_user):
+        """Test resolving a rate through an intermediate currency."""
+        usd = Currency.objects(code="USD").first()
+        eur = Currency.objects(code="EUR").first()
+        gbp = Currency.objects(code="GBP").first()
+        await self._create_test_exchange(test_user)  # USD -> EUR at 0.85
+        await self._create_test_exchange(
+            test_user,
+            from_currency_id=gbp.id,
+            to_currency_id=usd.id,
+            rate=Decimal("1.25"),
+        )
+
+        rate = await CurrencyExchangeCRUD.get_exchange_rate(
+            test_user.id, gbp.id, eur.id
+        )
+        reverse_rate = await CurrencyExchangeCRUD.get_exchange_rate(
+            test_user.id, eur.id, gbp.id
+        )
+
+        assert rate == Decimal("1.25") * Decimal("0.85")
+        assert reverse_rate == (Decimal("1") / Decimal("0.85")) * (
+            Decimal("1") / Decimal("1.25")
+        )
+
+    async def test_missing_exchange_rate_path(self, test_user):
+        """Test that unconnected currencies have no rate."""
+        eur = Currency.objects(code="EUR").first()
+        gbp = Currency.objects(code="GBP").first()
+        await self._create_test_exchange(test_user)  # USD -> EUR only
+
+        with pytest.raises(DoesNotExist):
+            await CurrencyExchangeCRUD.get_exchange_rate(test_user.id, gbp.id, eur.id)
+
+    async def test_update_invalidates_cached_rate(
+        self, client, auth_headers, test_user
+    ):
+        """Test that updating a rate through the API drops the cached graph."""
+        usd = Currency.objects(code="USD").first()
+        eur = Currency.objects(code="EUR").first()
+        exchange = await self._create_test_exchange(test_user)
+        assert await CurrencyExchangeCRUD.get_exchange_rate(
+            test_user.id, usd.id, eur.id
+        ) == Decimal("0.85")
+
+        response = client.put(
+            f"/currency-exchanges/{str(exchange.id)}",
+            json={"rate": 0.95},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert await CurrencyExchangeCRUD.get_exchange_rate(
+            test_user.id, usd.id, eur.id
+        ) == Decimal("0.95")
+
+    async def test_least_recently_used_graph_evicted(self, monkeypatch, test_user):
+        """Test the cache keeps at most its max size of graphs, evicting LRU."""
+        monkeypatch.setattr(exchange_rate_graph, "EXCHANGE_RATE_CACHE_MAX_SIZE", 2)
+        ExchangeRateGraphCache.clear()
+        other_user_id = ObjectId()
+        new_user_id = ObjectId()
+        graph = await ExchangeRateGraphCache.get_graph(test_user.id)
+        await ExchangeRateGraphCache.get_graph(other_user_id)
+        # Used again, so the other user's graph is the least recently used
+        assert await ExchangeRateGraphCache.get_graph(test_user.id) is graph
+
+        await ExchangeRateGraphCache.get_graph(new_user_id)
+
+        assert list(ExchangeRateGraphCache._graphs) == [
+            str(test_user.id),
+            str(new_user_id),
+        ]
+        ExchangeRateGraphCache.clear()
@@ -131,6 +131,27 @@ class TestGetCurrencyRoutePositive(TestCurrencyRoutesSetup):
         assert currency1["_id"] in currency_ids
         assert currency2["_id"] in currency_ids
 
+    async def test_get_predefined_currencies(self, client):
+        """Test predefined currencies are served with an ETag."""
+        response = client.get("/currencies/predefined")
+
+        await self._verify_response(response)
+        codes = {curr["code"] for curr in response.json()["data"]["currencies"]}
+        assert {"USD", "EUR", "BTC"} <= codes
+        assert response.headers["ETag"]
+
+    async def test_get_predefined_currencies_not_modified(self, client):
+        """Test a matching If-None-Match gets 304 Not Modified."""
+        etag = client.get("/currencies/predefined").headers["ETag"]
+
+        response = client.get(
+            "/currencies/predefined", headers={"If-None-Match": etag}
+        )
+
+        assert response.status_code == 304
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+
 
 @pytest.mark.asyncio
 class TestUpdateCurrencyRoutePositive(TestCurrencyRoutesSetup):
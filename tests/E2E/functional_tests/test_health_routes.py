@@ -0,0 +1,61 @@
+import pytest
+
+from database.readiness import SEED_COMPLETE, STARTUP_STEPS, Readiness
+
+
+@pytest.mark.asyncio
+class TestHealthRoutes:
+    async def test_liveness(self, client):
+        """Test the liveness probe answers without checking the database."""
+        response = client.get("/healthz")
+
+        assert response.status_code == 200
+        assert response.json()["data"] == {"status": "alive"}
+
+    async def test_readiness_when_ready(self, client):
+        """Test the readiness probe once the database is connected and seeded."""
+        response = client.get("/readyz")
+
+        assert response.status_code == 200
+        response_data = response.json()
+        assert response_data["message"] == "Service is ready"
+        assert all(response_data["data"]["checks"].values())
+
+    async def test_readiness_while_booting(self, client):
+        """Test the readiness probe reports the startup steps still pending."""
+        Readiness.reset()
+        try:
+            response = client.get("/readyz")
+        finally:
+            for step in STARTUP_STEPS:
+                Readiness.mark_done(step)
+
+        assert response.status_code == 503
+        checks = response.json()["data"]["checks"]
+        assert checks["db_reachable"] is True
+        assert checks[SEED_COMPLETE] is False
+
+    async def test_metrics_forbidden_for_users(self, client, auth_headers):
+        """Test the metrics are only served to admins."""
+        response = client.get("/metrics", headers=auth_headers)
+
+        assert response.status_code == 403
+
+    async def test_metrics_for_admins(self, client, auth_headers, test_user):
+        """Test the metrics report the pools of both database clients."""
+        test_user.role = "admin"
+        test_user.save()
+        try:
+            response = client.get("/metrics", headers=auth_headers)
+        finally:
+            test_user.role = "user"
+            test_user.save()
+
+        assert response.status_code == 200
+        metrics = response.json()["data"]
+        assert metrics["db_pools"]["mongoengine"]
+        assert metrics["db_pools"]["async"]
+        assert any(
+            pool["checkouts"] > 0 for pool in metrics["db_pools"]["async"].values()
+        )
+        assert "queue_depth" in metrics["password_executor"]
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from commons.password_executor import THREAD_MODE, PasswordExecutor
+
+
+def _wait_for(event: threading.Event) -> str:
+    event.wait(timeout=10)
+    return "done"
+
+
+def _fail() -> None:
+    raise ValueError("hashing failed")
+
+
+@pytest.mark.asyncio
+class TestPasswordExecutor:
+    async def test_full_queue_rejected_with_retry_after(self):
+        """Test calls are rejected with 503 and Retry-After when the queue is full."""
+        executor = PasswordExecutor(THREAD_MODE, max_workers=1, max_queue=0)
+        release = threading.Event()
+        try:
+            blocking_call = asyncio.create_task(executor.run(_wait_for, release))
+            while executor.metrics()["in_flight"] == 0:
+                await asyncio.sleep(0.01)
+
+            with pytest.raises(HTTPException) as exc_info:
+                await executor.run(_wait_for, release)
+
+            assert exc_info.value.status_code == 503
+            assert exc_info.value.headers == {"Retry-After": "1"}
+            release.set()
+            assert await blocking_call == "done"
+        finally:
+            release.set()
+            executor.shutdown()
+
+        metrics = executor.metrics()
+        assert metrics["in_flight"] == 0
+        assert metrics["completed"] == 1
+        assert metrics["failed"] == 0
+        assert metrics["rejected"] == 1
+
+    async def test_failed_calls_not_counted_as_completed(self):
+        """Test failed calls are counted apart and left out of the average."""
+        executor = PasswordExecutor(THREAD_MODE, max_workers=1, max_queue=1)
+        try:
+            with pytest.raises(ValueError):
+                await executor.run(_fail)
+        finally:
+            executor.shutdown()
+
+        metrics = executor.metrics()
+        assert metrics["in_flight"] == 0
+        assert metrics["completed"] == 0
+        assert metrics["failed"] == 1
+        assert metrics["average_seconds"] == 0.0
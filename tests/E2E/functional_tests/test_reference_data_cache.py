@@ -0,0 +1,179 @@
+import pytest
+from mongoengine import DoesNotExist
+
+from app.api.controllers.auth_controller import AuthController
+from app.crud.asset_type_crud import AssetTypeCRUD
+from app.crud.category_crud import CategoryCRUD
+from app.crud.currency_crud import CurrencyCRUD
+from app.crud.reference_data_cache import ReferenceDataCache
+from app.crud.user_crud import UserCRUD
+from models.models import AssetType, Category, Currency, User, Wallet
+from models.schemas import UserSchema
+
+CACHED_LOOKUPS = [
+    (Currency, CurrencyCRUD),
+    (Category, CategoryCRUD),
+    (AssetType, AssetTypeCRUD),
+]
+
+
+@pytest.fixture(scope="module")
+async def other_user(db, test_currency):
+    await AuthController.register_user(
+        UserSchema(
+            username="otherreferenceuser",
+            email="otherreferenceuser@example.com",
+            password="TestPassword!@#123",
+            base_currency_id=str(test_currency.id),
+        )
+    )
+    yield await UserCRUD.get_one_by_username("otherreferenceuser")
+
+
+@pytest.fixture(scope="function", autouse=True)
+async def cleanup_reference_data(db):
+    yield
+    Wallet.objects(name="Cache Wallet").delete()
+    for document_cls, _ in CACHED_LOOKUPS:
+        document_cls.objects(name__startswith="Cache ").delete()
+    ReferenceDataCache.clear()
+
+
+@pytest.mark.asyncio
+class TestReferenceDataCacheSetup:
+    def _build_entity(self, document_cls: type, user: User, suffix: str):
+        """Build an unsaved user-owned currency, category or asset type."""
+        if document_cls is Currency:
+            return Currency(
+                user_id=user,
+                code=f"C{suffix}",
+                name=f"Cache Currency {suffix}",
+                symbol=f"c{suffix}",
+                currency_type="fiat",
+            )
+        if document_cls is Category:
+            return Category(
+                user_id=user, name=f"Cache Category {suffix}", type="expense"
+            )
+        return AssetType(user_id=user, name=f"Cache Asset Type {suffix}")
+
+    def _cached_ids(self, document_cls: type, user: User):
+        """The ids in the cache entry of the user, None without an entry."""
+        cached = ReferenceDataCache._entries.get((document_cls, str(user.id)))
+        return None if cached is None else set(cached[1])
+
+
+@pytest.mark.asyncio
+class TestReferenceDataOwnership(TestReferenceDataCacheSetup):
+    """Reference entities of other users are never accepted"""
+
+    async def test_wallet_with_other_users_currency_rejected(
+        self, client, auth_headers, test_user, other_user
+    ):
+        """Test a balance in another user's currency is rejected."""
+        currency = self._build_entity(Currency, other_user, "OA").save()
+        # Cached for its owner
+        owned = await CurrencyCRUD.get_one_by_user_cached(currency.id, other_user.id)
+        assert owned.id == currency.id
+        wallet_data = {
+            "name": "Cache Wallet",
+            "type": "fiat",
+            "balances_ids": [{"currency_id": str(currency.id), "amount": 10}],
+        }
+
+        with pytest.raises(DoesNotExist):
+            client.post("/wallets", json=wallet_data, headers=auth_headers)
+
+        assert Wallet.objects(name="Cache Wallet").count() == 0
+
+    @pytest.mark.parametrize("document_cls, crud", CACHED_LOOKUPS)
+    async def test_other_users_entity_rejected(
+        self, document_cls, crud, test_user, other_user
+    ):
+        """Test another user's entity isn't found from a warm cache entry."""
+        own_entity = self._build_entity(document_cls, test_user, "TA").save()
+        other_entity = self._build_entity(document_cls, other_user, "OB").save()
+        await crud.get_one_by_user_cached(own_entity.id, test_user.id)
+
+        with pytest.raises(DoesNotExist):
+            await crud.get_one_by_user_cached(other_entity.id, test_user.id)
+
+
+@pytest.mark.asyncio
+class TestReferenceDataInvalidation(TestReferenceDataCacheSetup):
+    """Saved and deleted entities are seen by the next validation"""
+
+    @pytest.mark.parametrize("document_cls, crud", CACHED_LOOKUPS)
+    async def test_created_entity_seen_on_next_validation(
+        self, document_cls, crud, test_user
+    ):
+        """Test creating an entity drops the cached entry of its user."""
+        first = self._build_entity(document_cls, test_user, "TB").save()
+        await crud.get_one_by_user_cached(first.id, test_user.id)
+        assert first.id in self._cached_ids(document_cls, test_user)
+
+        second = self._build_entity(document_cls, test_user, "TC").save()
+
+        assert self._cached_ids(document_cls, test_user) is None
+        found = await crud.get_one_by_user_cached(second.id, test_user.id)
+        assert found.id == second.id
+        assert second.id in self._cached_ids(document_cls, test_user)
+
+    @pytest.mark.parametrize("document_cls, crud", CACHED_LOOKUPS)
+    async def test_deleted_entity_rejected_on_next_validation(
+        self, document_cls, crud, test_user
+    ):
+        """Test a deleted entity isn't served from a stale cached entry."""
+        entity = self._build_entity(document_cls, test_user, "TD").save()
+        await crud.get_one_by_user_cached(entity.id, test_user.id)
+        assert entity.id in self._cached_ids(document_cls, test_user)
+
+        entity.delete()
+
+        with pytest.raises(DoesNotExist):
+            await crud.get_one_by_user_cached(entity.id, test_user.id)
+
+    async def test_deleted_currency_rejected_by_wallet_route(
+        self, client, auth_headers, test_user
+    ):
+        """Test a currency deleted through the API can't be used right after."""
+        currency = self._build_entity(Currency, test_user, "TE").save()
+        await CurrencyCRUD.get_one_by_user_cached(currency.id, test_user.id)
+
+        response = client.delete(f"/currencies/{currency.id}", headers=auth_headers)
+        assert response.status_code == 200
+
+        wallet_data = {
+            "name": "Cache Wallet",
+            "type": "fiat",
+            "balances_ids": [{"currency_id": str(currency.id), "amount": 10}],
+        }
+        with pytest.raises(DoesNotExist):
+            client.post("/wallets", json=wallet_data, headers=auth_headers)
+
+
+@pytest.mark.asyncio
+class TestReferenceDataFallback(TestReferenceDataCacheSetup):
+    """Ids missing from a cached entry are looked up in the database"""
+
+    @pytest.mark.parametrize("document_cls, crud", CACHED_LOOKUPS)
+    async def test_missing_id_falls_back_to_database(
+        self, document_cls, crud, test_user
+    ):
+        """Test an entity created by another worker is found and re-cached."""
+        first = self._build_entity(document_cls, test_user, "TF").save()
+        await crud.get_one_by_user_cached(first.id, test_user.id)
+        # Written without signals, like another worker process would
+        entity = self._build_entity(document_cls, test_user, "TG")
+        entity.validate()
+        entity.id = document_cls._get_collection().insert_one(
+            entity.to_mongo()
+        ).inserted_id
+        assert entity.id not in self._cached_ids(document_cls, test_user)
+
+        found = await crud.get_one_by_user_cached(entity.id, test_user.id)
+
+        assert found.id == entity.id
+        assert self._cached_ids(document_cls, test_user) is None
+        await crud.get_one_by_user_cached(entity.id, test_user.id)
+        assert entity.id in self._cached_ids(document_cls, test_user)
@@ -1,17 +1,23 @@
+import csv
+import io
+import json
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Optional
 import asyncio
 import pytest
+from bson import ObjectId
+from mongoengine.queryset.visitor import Q
 
 from app.api.controllers.category_controller import CategoryController
 from app.api.controllers.transaction_controller import TransactionController
 from app.api.controllers.user_app_data_controller import UserAppDataController
 from app.api.controllers.wallet_controller import WalletController
+from app.crud.transaction_crud import TransactionCRUD
 from app.crud.user_app_data_crud import UserAppDataCRUD
 from app.crud.wallet_crud import WalletCRUD
 from models.enums import TransactionTypeEnum as T
-from models.models import Transaction, User, UserAppData, Wallet
+from models.models import Balance, Transaction, User, UserAppData, Wallet
 from models.schemas import (
     BalanceSchema,
     CategoryCreateSchema,
@@ -343,6 +349,238 @@ class TestCreateTransactionRoutePositive(TestTransactionRoutesSetup):
             expected_change=Decimal(0),
         )
 
+    async def test_spend_whole_balance_after_fractional_expense(
+        self, client, auth_headers, test_user
+    ):
+        """Test the displayed balance can be spent after fractional updates."""
+        user_app_data = await UserAppDataCRUD.get_one_by_user_id(test_user.id)
+        currency_id = str(user_app_data.base_currency_id.id)
+        wallet = await WalletController.create_wallet(
+            WalletCreateSchema(
+                name="Fractional Wallet",
+                type="fiat",
+                balances_ids=[BalanceSchema(currency_id=currency_id, amount="0.3")],
+            ),
+            test_user,
+        )
+        category = await self._create_test_category(test_user)
+        # 0.3 - 0.1 is 0.19999999999999998 in floats
+        for amount in ("0.1", "0.2"):
+            transaction_data = self._get_test_transaction_data(
+                wallet, category, amount=amount
+            )
+            response = client.post(
+                "/transactions", json=transaction_data, headers=auth_headers
+            )
+            await self._verify_response(response)
+
+        wallet_id = ObjectId(wallet["_id"])
+        raw_balance = Balance._get_collection().find_one({"wallet_id": wallet_id})
+        raw_wallet = Wallet._get_collection().find_one({"_id": wallet_id})
+        assert raw_balance["amount"] == 0
+        assert raw_wallet["total_value"] == 0
+
+
+@pytest.mark.asyncio
+class TestCreateTransactionRouteNegative(TestTransactionRoutesSetup):
+    """Tests for transactions rejected by the balance guard"""
+
+    async def test_create_expense_transaction_insufficient_balance(
+        self, client, auth_headers, test_user
+    ):
+        """Test an expense larger than the balance leaves the balance untouched."""
+        user_app_data = await UserAppDataCRUD.get_one_by_user_id(test_user.id)
+        wallet = await self._create_test_wallet(test_user, user_app_data)
+        category = await self._create_test_category(test_user)
+        transaction_data = self._get_test_transaction_data(
+            wallet, category, amount="1000.01"
+        )
+
+        response = client.post(
+            "/transactions", json=transaction_data, headers=auth_headers
+        )
+
+        assert response.status_code == 422
+        assert "Insufficient balance" in response.json()["detail"]
+        assert Transaction.objects(user_id=test_user.id).count() == 0
+        await self._verify_transaction_impacts_on_wallet(
+            test_user=test_user,
+            wallet_id=transaction_data["from_wallet_id"],
+            transaction_currency_id=transaction_data["currency_id"],
+            initial_wallet_total=Decimal(wallet["total_value"]),
+            initial_wallet_balance=Decimal(1000),
+            expected_change=Decimal(0),
+        )
+
+
+@pytest.mark.asyncio
+class TestTransactionWritesRollback(TestTransactionRoutesSetup):
+    """Tests that failed updates and deletes leave no partial writes"""
+
+    async def test_update_amount_insufficient_balance(
+        self, client, auth_headers, test_user
+    ):
+        """Test a rejected amount update keeps the old amount and balance."""
+        user_app_data = await UserAppDataCRUD.get_one_by_user_id(test_user.id)
+        wallet = await self._create_test_wallet(test_user, user_app_data)
+        category = await self._create_test_category(test_user)
+        transaction_data = self._get_test_transaction_data(wallet, category)
+        response = client.post(
+            "/transactions", json=transaction_data, headers=auth_headers
+        )
+        await self._verify_response(response)
+        transaction_id = response.json()["data"]["result"]["_id"]
+
+        response = client.put(
+            f"/transactions/{transaction_id}",
+            json={"amount": "1000.01"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+        assert Transaction.objects.get(id=transaction_id).amount == Decimal("100.00")
+        await self._verify_transaction_impacts_on_wallet(
+            test_user=test_user,
+            wallet_id=transaction_data["from_wallet_id"],
+            transaction_currency_id=transaction_data["currency_id"],
+            initial_wallet_total=Decimal(wallet["total_value"]),
+            initial_wallet_balance=Decimal(1000),
+            expected_change=Decimal("-100.00"),
+        )
+
+    async def test_update_rollback_unsets_added_fields(
+        self, client, auth_headers, test_user
+    ):
+        """Test a rejected update doesn't keep a field the transaction lacked."""
+        user_app_data = await UserAppDataCRUD.get_one_by_user_id(test_user.id)
+        wallet = await self._create_test_wallet(test_user, user_app_data)
+        category = await self._create_test_category(test_user)
+        transaction_data = self._get_test_transaction_data(wallet, category)
+        del transaction_data["description"]
+        response = client.post(
+            "/transactions", json=transaction_data, headers=auth_headers
+        )
+        await self._verify_response(response)
+        transaction_id = response.json()["data"]["result"]["_id"]
+
+        response = client.put(
+            f"/transactions/{transaction_id}",
+            json={"amount": "1000.01", "description": "Never saved"},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+        transaction = Transaction.objects.get(id=transaction_id)
+        assert transaction.description is None
+        assert transaction.amount == Decimal("100.00")
+
+    async def test_delete_income_already_spent(self, client, auth_headers, test_user):
+        """Test a delete whose reversal would overdraw keeps the transaction."""
+        user_app_data = await UserAppDataCRUD.get_one_by_user_id(test_user.id)
+        wallet = await self._create_test_wallet(test_user, user_app_data)
+        category = await self._create_test_category(test_user)
+        income_data = self._get_test_transaction_data(
+            wallet, category, type=T.INCOME.value, amount="100.00"
+        )
+        response = client.post("/transactions", json=income_data, headers=auth_headers)
+        await self._verify_response(response)
+        income_id = response.json()["data"]["result"]["_id"]
+        expense_data = self._get_test_transaction_data(
+            wallet, category, amount="1100.00"
+        )
+        response = client.post(
+            "/transactions", json=expense_data, headers=auth_headers
+        )
+        await self._verify_response(response)
+
+        response = client.delete(f"/transactions/{income_id}", headers=auth_headers)
+
+        assert response.status_code == 422
+        assert Transaction.objects(id=income_id).count() == 1
+        await self._verify_transaction_impacts_on_wallet(
+            test_user=test_user,
+            wallet_id=income_data["to_wallet_id"],
+            transaction_currency_id=income_data["currency_id"],
+            initial_wallet_total=Decimal(wallet["total_value"]),
+            initial_wallet_balance=Decimal(1000),
+            expected_change=Decimal("-1000.00"),
+        )
+
+
+@pytest.mark.asyncio
+class TestImportTransactionsRoute(TestTransactionRoutesSetup):
+    """Tests for importing a batch of transactions"""
+
+    async def test_import_transactions(self, client, auth_headers, test_user):
+        """Test the summed amounts are applied to the balance and user app data."""
+        user_app_data = await UserAppDataCRUD.get_one_by_user_id(test_user.id)
+        wallet = await self._create_test_wallet(test_user, user_app_data)
+        category = await self._create_test_category(test_user)
+        currency_id = str(wallet["balances_ids"][0]["currency_id"])
+        initial_state = await self._get_user_app_data_state(test_user.id)
+
+        transactions = [
+            self._get_test_transaction_data(
+                wallet, category, type=T.INCOME.value, amount="300.00"
+            ),
+            self._get_test_transaction_data(wallet, category, amount="100.00"),
+            self._get_test_transaction_data(wallet, category, amount="50.00"),
+        ]
+        response = client.post(
+            "/transactions/import",
+            json={"transactions": transactions},
+            headers=auth_headers,
+        )
+
+        await self._verify_response(response)
+        response_data = response.json()
+        assert len(response_data["data"]["ids"]) == 3
+        assert response_data["message"] == "Transactions imported successfully"
+        await self._verify_transaction_impacts_on_wallet(
+            test_user,
+            wallet["_id"],
+            currency_id,
+            initial_wallet_total=Decimal("1000.00"),
+            initial_wallet_balance=Decimal("1000.00"),
+            expected_change=Decimal("150.00"),
+        )
+        await self._verify_transaction_impacts_on_user_app_data(
+            test_user.id,
+            base_app_data_wallets_value=initial_state.wallets_value,
+            base_app_data_net_worth=initial_state.net_worth,
+            expected_change=Decimal("150.00"),
+        )
+
+    async def test_import_transactions_insufficient_balance(
+        self, client, auth_headers, test_user
+    ):
+        """Test nothing is written when the batch would overdraw a balance."""
+        user_app_data = await UserAppDataCRUD.get_one_by_user_id(test_user.id)
+        wallet = await self._create_test_wallet(test_user, user_app_data)
+        category = await self._create_test_category(test_user)
+        currency_id = str(wallet["balances_ids"][0]["currency_id"])
+
+        transactions = [
+            self._get_test_transaction_data(wallet, category, amount="600.00"),
+            self._get_test_transaction_data(wallet, category, amount="600.00"),
+        ]
+        response = client.post(
+            "/transactions/import",
+            json={"transactions": transactions},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 422
+        assert Transaction.objects(user_id=test_user.id).count() == 0
+        await self._verify_transaction_impacts_on_wallet(
+            test_user,
+            wallet["_id"],
+            currency_id,
+            initial_wallet_total=Decimal("1000.00"),
+            initial_wallet_balance=Decimal("1000.00"),
+            expected_change=Decimal(0),
+        )
+
 
 @pytest.mark.asyncio
 class TestReadTransactionRoutePositive(TestTransactionRoutesSetup):
@@ -381,6 +619,53 @@ class TestReadAllTransactionsRoutePositive(TestTransactionRoutesSetup):
         assert len(response_data["data"]["transactions"]) == len(transactions)
         assert response_data["message"] == "Transactions retrieved successfully"
 
+    async def test_read_all_transactions_paginated(
+        self, client, auth_headers, test_user
+    ):
+        """Test reading transactions page by page with the cursor."""
+        transactions = [
+            await self._create_test_transaction_and_wallet(test_user),
+            await self._create_test_transaction_and_wallet(test_user),
+            await self._create_test_transaction_and_wallet(test_user),
+        ]
+
+        response = client.get(
+            "/transactions", params={"limit": 2}, headers=auth_headers
+        )
+        await self._verify_response(response)
+        first_page = response.json()["data"]
+        assert len(first_page["transactions"]) == 2
+        assert first_page["next_cursor"] is not None
+
+        response = client.get(
+            "/transactions",
+            params={"limit": 2, "cursor": first_page["next_cursor"]},
+            headers=auth_headers,
+        )
+        await self._verify_response(response)
+        second_page = response.json()["data"]
+        assert len(second_page["transactions"]) == 1
+        assert second_page["next_cursor"] is None
+
+        returned_ids = [
+            t["_id"] for t in first_page["transactions"] + second_page["transactions"]
+        ]
+        expected_ids = [
+            str(t.id)
+            for t in sorted(transactions, key=lambda t: (t.date, t.id), reverse=True)
+        ]
+        assert returned_ids == expected_ids
+
+    async def test_read_all_transactions_invalid_cursor(
+        self, client, auth_headers, test_user
+    ):
+        """Test an invalid cursor is rejected."""
+        response = client.get(
+            "/transactions", params={"cursor": "invalid"}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+
 
 @pytest.mark.asyncio
 class TestFilterTransactionsRoutePositive(TestTransactionRoutesSetup):
@@ -406,6 +691,45 @@ class TestFilterTransactionsRoutePositive(TestTransactionRoutesSetup):
         )
 
 
+@pytest.mark.asyncio
+class TestExportTransactionsRoutePositive(TestTransactionRoutesSetup):
+    """Happy path tests for exporting transactions"""
+
+    async def test_export_transactions_ndjson(self, client, auth_headers, test_user):
+        """Test exporting transactions as NDJSON."""
+        transactions = [
+            await self._create_test_transaction_and_wallet(test_user),
+            await self._create_test_transaction_and_wallet(test_user),
+        ]
+
+        response = client.get("/transactions/export", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert {row["_id"] for row in rows} == {str(t.id) for t in transactions}
+
+    async def test_export_transactions_csv_with_filter(
+        self, client, auth_headers, test_user
+    ):
+        """Test exporting filtered transactions as CSV."""
+        transaction = await self._create_test_transaction_and_wallet(test_user)
+        start_date = (transaction.date - timedelta(days=1)).isoformat()
+
+        response = client.get(
+            "/transactions/export",
+            params={"format": "csv", "start_date": start_date},
+            headers=auth_headers,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["_id"] == str(transaction.id)
+        assert rows[0]["type"] == T.INCOME.value
+
+
 @pytest.mark.asyncio
 class TestTransactionStatisticsRoutePositive(TestTransactionRoutesSetup):
     """Happy path tests for transaction statistics"""
@@ -429,6 +753,67 @@ class TestTransactionStatisticsRoutePositive(TestTransactionRoutesSetup):
             response_data["message"] == "Transaction statistics retrieved successfully"
         )
 
+    async def test_get_transaction_statistics_totals(self, test_user):
+        """Test statistics totals are summed by the aggregation."""
+        transaction = await self._create_test_transaction_and_wallet(test_user)
+        start_date = transaction.date - timedelta(days=1)
+        end_date = transaction.date + timedelta(days=1)
+
+        statistics = await TransactionController.calculate_statistics(
+            test_user.id, start_date, end_date
+        )
+
+        assert statistics["total_income"] == Decimal("100.00")
+        assert statistics["total_expense"] == Decimal(0)
+        assert statistics["net_balance"] == Decimal("100.00")
+
+
+@pytest.mark.asyncio
+class TestTransactionStatisticsSeriesRoutePositive(TestTransactionRoutesSetup):
+    """Happy path tests for transaction statistics series"""
+
+    async def test_get_transaction_statistics_series(
+        self, client, auth_headers, test_user
+    ):
+        """Test getting a daily statistics series."""
+        transaction = await self._create_test_transaction_and_wallet(test_user)
+
+        response = client.get(
+            "/transactions/statistics/series",
+            params={"interval": "day"},
+            headers=auth_headers,
+        )
+
+        await self._verify_response(response)
+        response_data = response.json()
+        series = response_data["data"]["series"]
+        assert len(series) == 1
+        assert series[0]["period"] == transaction.date.strftime("%Y-%m-%d")
+        assert Decimal(str(series[0]["total_income"])) == Decimal("100.00")
+        assert Decimal(str(series[0]["net_balance"])) == Decimal("100.00")
+        assert (
+            response_data["message"]
+            == "Transaction statistics series retrieved successfully"
+        )
+
+    async def test_get_transaction_statistics_series_split_by_category(
+        self, client, auth_headers, test_user
+    ):
+        """Test getting a monthly statistics series split by category."""
+        transaction = await self._create_test_transaction_and_wallet(test_user)
+
+        response = client.get(
+            "/transactions/statistics/series",
+            params={"interval": "month", "split_by_category": True},
+            headers=auth_headers,
+        )
+
+        await self._verify_response(response)
+        series = response.json()["data"]["series"]
+        assert len(series) == 1
+        assert series[0]["period"] == transaction.date.strftime("%Y-%m")
+        assert series[0]["category_id"] == transaction.to_dict()["category_id"]
+
 
 @pytest.mark.asyncio
 class TestUpdateTransactionRoutePositive(TestTransactionRoutesSetup):
@@ -719,3 +1104,50 @@ class TestDeleteTransactionRoutePositive(TestTransactionRoutesSetup):
             base_app_data_net_worth=Decimal("2000.00"),
             expected_change=Decimal(0),
         )
+
+
+def _get_plan_stages(plan: dict) -> set:
+    """Collect the stage names of a query plan tree."""
+    stages = {plan.get("stage")}
+    for key in ("inputStage", "queryPlan"):
+        if key in plan:
+            stages |= _get_plan_stages(plan[key])
+    for child in plan.get("inputStages", []):
+        stages |= _get_plan_stages(child)
+    return stages
+
+
+@pytest.mark.asyncio
+class TestTransactionIndexes(TestTransactionRoutesSetup):
+    """Every TransactionCRUD filter shape is served by an index"""
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {},
+            {"start_date": datetime(2024, 1, 1), "end_date": datetime(2024, 12, 31)},
+            {"transaction_type": T.EXPENSE.value},
+            {"category_id": str(ObjectId())},
+            {"from_wallet_id": str(ObjectId())},
+            {"to_wallet_id": str(ObjectId())},
+            {
+                "start_date": datetime(2024, 1, 1),
+                "transaction_type": T.INCOME.value,
+                "to_wallet_id": str(ObjectId()),
+            },
+        ],
+    )
+    async def test_filter_uses_index_scan(self, test_user, filters):
+        """Test the page query of each filter combination uses an IXSCAN."""
+        query = TransactionCRUD._build_filter_query(test_user.id, **filters)
+        query &= Q(date__lt=datetime(2024, 6, 1)) | Q(
+            date=datetime(2024, 6, 1), id__lt=ObjectId()
+        )
+
+        explain = (
+            Transaction.objects(query).order_by("-date", "-id").limit(10).explain()
+        )
+        stages = _get_plan_stages(explain["queryPlanner"]["winningPlan"])
+
+        assert "IXSCAN" in stages
+        assert "COLLSCAN" not in stages
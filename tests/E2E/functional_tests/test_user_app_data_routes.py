@@ -2,10 +2,12 @@ from decimal import Decimal
 
 import pytest
 
+from app.api.controllers.auth_controller import AuthController
 from app.api.controllers.wallet_controller import WalletController
 from app.crud.user_app_data_crud import UserAppDataCRUD
+from app.crud.user_crud import UserCRUD
 from models.models import Asset, Currency, CurrencyExchange, User, UserAppData
-from models.schemas import BalanceSchema, WalletCreateSchema
+from models.schemas import BalanceSchema, UserSchema, WalletCreateSchema
 
 
 @pytest.mark.asyncio
@@ -45,11 +47,11 @@ class TestUserAppDataRoutesSetup:
         return CurrencyExchange(**exchange_data).save()
 
     async def _create_test_asset(
-        self, test_user: User, currency: Currency, value: Decimal
+        self, test_user: User, currency: Currency, value: Decimal, name="Test Asset"
     ) -> Asset:
         """Helper method to create a test asset"""
         asset_data = {
-            "name": "Test Asset",
+            "name": name,
             "user_id": test_user.id,
             "currency_id": currency.id,
             "value": value,
@@ -144,6 +146,77 @@ class TestCalculateNetWorthRoutePositive(TestUserAppDataRoutesSetup):
         assert "net_worth" in response_data["data"]
         assert response_data["message"] == "Net worth calculated successfully"
 
+    async def test_calculate_net_worth_in_several_currencies(
+        self, client, test_currency
+    ):
+        """Test wallets and assets in several currencies are converted and summed,
+        and the stored wallets and assets values are recalculated too."""
+        access_token = await AuthController.register_user(
+            UserSchema(
+                username="networthuser",
+                email="networth@example.com",
+                password="TestPassword!@#123",
+                base_currency_id=str(test_currency.id),
+            )
+        )
+        headers = {"Authorization": f"Bearer {access_token}"}
+        user = await UserCRUD.get_one_by_username("networthuser")
+        usd_currency = test_currency
+        eur_currency = Currency.objects(code="EUR", is_predefined=True).first()
+        nwa_currency = await self._create_test_currency("NWA", "Net Worth A", user)
+        # 1 NWA = 2 USD, and 1 EUR = 2 USD through the reverse of USD -> EUR
+        await self._create_test_exchange(
+            user, nwa_currency, usd_currency, Decimal("2")
+        )
+        await self._create_test_exchange(
+            user, usd_currency, eur_currency, Decimal("0.5")
+        )
+
+        await WalletController.create_wallet(
+            WalletCreateSchema(
+                name="Mixed Wallet",
+                type="fiat",
+                balances_ids=[
+                    BalanceSchema(
+                        currency_id=str(usd_currency.id), amount=Decimal("100")
+                    ),
+                    BalanceSchema(
+                        currency_id=str(nwa_currency.id), amount=Decimal("50.25")
+                    ),
+                ],
+            ),
+            user,
+        )
+        await WalletController.create_wallet(
+            WalletCreateSchema(
+                name="Euro Wallet",
+                type="fiat",
+                balances_ids=[
+                    BalanceSchema(
+                        currency_id=str(eur_currency.id), amount=Decimal("30")
+                    )
+                ],
+            ),
+            user,
+        )
+        await self._create_test_asset(user, usd_currency, Decimal("10"), "USD Asset")
+        await self._create_test_asset(user, nwa_currency, Decimal("5"), "NWA Asset")
+        await self._create_test_asset(user, eur_currency, Decimal("1.5"), "EUR Asset")
+        # Stale stored values must be replaced, not added to
+        UserAppData.objects(user_id=user.id).update(
+            set__wallets_value=999, set__assets_value=999, set__net_worth=999
+        )
+
+        response = client.get("/user-app-data/net-worth", headers=headers)
+
+        assert response.status_code == 200
+        # Wallets: 100 + 50.25 * 2 + 30 * 2 = 260.5, assets: 10 + 5 * 2 + 1.5 * 2 = 23
+        assert Decimal(str(response.json()["data"]["net_worth"])) == Decimal("283.5")
+        user_app_data = await self._get_user_app_data_state(user.id)
+        assert user_app_data.wallets_value == Decimal("260.5")
+        assert user_app_data.assets_value == Decimal("23")
+        assert user_app_data.net_worth == Decimal("283.5")
+
 
 @pytest.mark.asyncio
 class TestGetUserAppDataRoutePositive(TestUserAppDataRoutesSetup):
@@ -133,6 +133,30 @@ class TestCreateWalletRoutePositive(TestWalletRoutesSetup):
         assert "id" in response_data["data"]
         assert response_data["message"] == "Wallet created successfully"
 
+    async def test_create_wallet_aggregates_balances(
+        self, test_currency, test_user, test_user_app_data
+    ):
+        """Test wallet total value and balance ids are set from all balances."""
+        second_currency = await self._create_test_currency(test_user, "GBB")
+        wallet_data = self._get_test_wallet_data(
+            currency_id=str(test_currency.id),
+            balances_ids=[
+                {"currency_id": str(test_currency.id), "amount": float("100.50")},
+                {"currency_id": str(second_currency.id), "amount": float("200.75")},
+            ],
+        )
+
+        created_wallet = await WalletController.create_wallet(
+            WalletCreateSchema(**wallet_data), test_user
+        )
+
+        wallet = Wallet.objects.get(id=created_wallet["_id"])
+        balances = Balance.objects(wallet_id=wallet.id)
+        assert wallet.total_value == Decimal("301.25")
+        assert {balance.id for balance in wallet.balances_ids} == {
+            balance.id for balance in balances
+        }
+
     async def test_create_wallet_with_different_types(
         self, client, auth_headers, test_currency, test_user
     ):
@@ -235,6 +259,69 @@ class TestListWalletsRoutePositive(TestWalletRoutesSetup):
         assert "wallets" in response_data["data"]
         assert len(response_data["data"]["wallets"]) >= len(wallet_names)
 
+    async def test_list_wallets_matches_get_wallet(
+        self, client, auth_headers, test_currency, test_user, test_user_app_data
+    ):
+        """Test listed wallets carry the same balances as a single wallet."""
+        second_currency = await self._create_test_currency(test_user, "GBB")
+        for name in ["Wallet 1", "Wallet 2"]:
+            wallet_data = self._get_test_wallet_data(
+                currency_id=str(test_currency.id),
+                name=name,
+                balances_ids=[
+                    {"currency_id": str(test_currency.id), "amount": float("100.50")},
+                    {"currency_id": str(second_currency.id), "amount": float("200.75")},
+                ],
+            )
+            await WalletController.create_wallet(
+                WalletCreateSchema(**wallet_data), test_user
+            )
+
+        response = client.get("/wallets", headers=auth_headers)
+
+        assert response.status_code == 200
+        wallets = response.json()["data"]["wallets"]
+        for wallet in wallets:
+            single = client.get(f"/wallets/{wallet['_id']}", headers=auth_headers)
+            assert wallet == single.json()["data"]["wallet"]
+        listed = [wallet for wallet in wallets if wallet["name"] == "Wallet 1"][0]
+        assert Decimal(listed["total_value"]) == Decimal("301.25")
+        assert [balance["currency_id"] for balance in listed["balances_ids"]] == [
+            str(test_currency.id),
+            str(second_currency.id),
+        ]
+
+    async def test_list_wallets_rounds_balances_updated_with_inc(
+        self, client, auth_headers, test_currency, test_user
+    ):
+        """Test listed balances are rounded like a single wallet's after drift."""
+        wallet_data = self._get_test_wallet_data(
+            currency_id=str(test_currency.id),
+            name="Drifted Wallet",
+            balances_ids=[{"currency_id": str(test_currency.id), "amount": 0.1}],
+        )
+        created_wallet = await WalletController.create_wallet(
+            WalletCreateSchema(**wallet_data), test_user
+        )
+        wallet_id = created_wallet["_id"]
+        balance_id = Wallet.objects(id=wallet_id).first().balances_ids[0].id
+        # A plain $inc stores 0.30000000000000004, like before amounts were rounded
+        Balance._get_collection().update_one(
+            {"_id": balance_id}, {"$inc": {"amount": 0.2}}
+        )
+
+        response = client.get("/wallets", headers=auth_headers)
+
+        assert response.status_code == 200
+        listed = [
+            wallet
+            for wallet in response.json()["data"]["wallets"]
+            if wallet["_id"] == wallet_id
+        ][0]
+        single = client.get(f"/wallets/{wallet_id}", headers=auth_headers)
+        assert listed == single.json()["data"]["wallet"]
+        assert listed["balances_ids"][0]["amount"] == 0.3
+
 
 @pytest.mark.asyncio
 class TestDeleteWalletRoutePositive(TestWalletRoutesSetup):
@@ -376,6 +463,9 @@ class TestRemoveBalanceRoutePositive(TestWalletRoutesSetup):
         response_data = response.json()
         assert "wallet" in response_data["data"]
         assert len(response_data["data"]["wallet"]["balances_ids"]) == 1
+        assert Decimal(response_data["data"]["wallet"]["total_value"]) == Decimal(
+            "100.50"
+        )
 
     async def test_remove_last_balance(
         self, client, auth_headers, test_user_app_data, test_user
@@ -0,0 +1,81 @@
+"""
+Compare concurrent read throughput of the blocking mongoengine path against the
+native async driver path used by the CRUD classes.
+
+Usage:
+    python -m tests.performance.async_crud_benchmark --username <user> \
+        --requests 500 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from app.crud.transaction_crud import TransactionCRUD
+from app.crud.user_crud import UserCRUD
+from database.database import db_connector
+from models.models import Transaction
+
+
+async def blocking_filter_transactions(user_id: str) -> list:
+    # What every CRUD method did before: a synchronous pymongo round-trip
+    # executed directly on the event loop.
+    return list(Transaction.objects(user_id=user_id))
+
+
+async def async_filter_transactions(user_id: str) -> list:
+    return await TransactionCRUD.filter_transactions(user_id)
+
+
+async def measure(
+    name: str,
+    call: Callable[[str], Awaitable[list]],
+    user_id: str,
+    total_requests: int,
+    concurrency: int,
+) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_request() -> None:
+        async with semaphore:
+            await call(user_id)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(total_requests)))
+    elapsed = time.perf_counter() - start
+    throughput = total_requests / elapsed
+    print(f"{name:<10} {total_requests} requests in {elapsed:.2f}s -> {throughput:.1f} req/s")
+    return throughput
+
+
+async def main(username: str, total_requests: int, concurrency: int) -> None:
+    await db_connector.connect()
+    try:
+        user = await UserCRUD.get_one_by_username(username)
+        before = await measure(
+            "blocking",
+            blocking_filter_transactions,
+            user.id,
+            total_requests,
+            concurrency,
+        )
+        after = await measure(
+            "async",
+            async_filter_transactions,
+            user.id,
+            total_requests,
+            concurrency,
+        )
+        print(f"speedup    {after / before:.2f}x")
+    finally:
+        await db_connector.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.username, args.requests, args.concurrency))
@@ -0,0 +1,151 @@
+"""
+Compare the response model serialization of FastAPI with ResponseSchemaRoute,
+which renders the ResponseSchema envelope with orjson.
+
+The payloads have the shape of the GET /transactions and GET /wallets
+responses and are served by two minimal apps, one per route class, so no
+database is needed. Both must produce the same bytes.
+
+Usage:
+    python -m tests.performance.response_benchmark --count 1000 --rounds 20
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Dict, List
+
+from bson import ObjectId
+from fastapi import APIRouter, FastAPI
+from fastapi.routing import APIRoute
+
+from commons.responses import ResponseSchemaRoute
+from models.models import Transaction
+from models.schemas import ResponseSchema
+from tests.performance.serializer_benchmark import build_transactions
+
+
+def build_wallets(count: int, balances_per_wallet: int = 5) -> List[Dict]:
+    user_id = str(ObjectId())
+    now = datetime.now(timezone.utc)
+    wallets = []
+    for i in range(count):
+        wallet_id = str(ObjectId())
+        balances = [
+            {
+                "_id": str(ObjectId()),
+                "wallet_id": wallet_id,
+                "currency_id": str(ObjectId()),
+                "amount": Decimal(i % 100) + Decimal("0.50"),
+                "created_at": now,
+                "updated_at": now,
+            }
+            for _ in range(balances_per_wallet)
+        ]
+        wallets.append(
+            {
+                "_id": wallet_id,
+                "user_id": user_id,
+                "name": f"Wallet {i}",
+                "type": "regular",
+                "balances_ids": balances,
+                "total_value": str(Decimal(i) + Decimal("0.25")),
+                "created_at": now - timedelta(days=i),
+                "updated_at": now,
+            }
+        )
+    return wallets
+
+
+def build_app(route_class: type, transactions: List[Dict], wallets: List[Dict]):
+    router = APIRouter(route_class=route_class)
+
+    @router.get("/transactions", response_model=ResponseSchema)
+    async def get_transactions() -> ResponseSchema:
+        return ResponseSchema(
+            data={"transactions": transactions, "next_cursor": None},
+            message="Transactions retrieved successfully",
+        )
+
+    @router.get("/wallets", response_model=ResponseSchema)
+    async def get_wallets() -> ResponseSchema:
+        return ResponseSchema(
+            data={"wallets": wallets}, message="Wallets retrieved successfully"
+        )
+
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def get(app: FastAPI, path: str) -> bytes:
+    body = []
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("benchmark", 0),
+        "server": ("benchmark", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(name: str, call: Callable, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await call()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<36} {best * 1000:9.2f} ms")
+    return best
+
+
+async def main(count: int, rounds: int) -> None:
+    transactions = [
+        Transaction.son_to_dict(transaction.to_mongo().to_dict())
+        for transaction in build_transactions(count)
+    ]
+    wallets = build_wallets(count)
+
+    response_model_app = build_app(APIRoute, transactions, wallets)
+    orjson_app = build_app(ResponseSchemaRoute, transactions, wallets)
+
+    print(f"{count} rows per response, best of {rounds} rounds")
+    for path in ("/transactions", "/wallets"):
+        # The envelope timestamp is the same for both, the bodies must match
+        assert await get(response_model_app, path) == await get(orjson_app, path)
+        before = await measure(
+            f"GET {path} response_model",
+            lambda: get(response_model_app, path),
+            rounds,
+        )
+        after = await measure(
+            f"GET {path} ResponseSchemaRoute", lambda: get(orjson_app, path), rounds
+        )
+        print(f"{'speedup':<36} {before / after:9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.count, args.rounds))
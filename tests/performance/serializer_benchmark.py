@@ -0,0 +1,117 @@
+"""
+Compare the per-model field converters of BaseDocument with the generic
+value walk it replaced, over raw transactions and Transaction documents, and
+the document read path of the list endpoints with the raw one.
+
+Needs no database, documents are built in memory.
+
+Usage:
+    python -m tests.performance.serializer_benchmark --count 10000 --rounds 5
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, List
+
+from bson import ObjectId
+
+from models.enums import TransactionTypeEnum as T
+from models.models import Transaction
+
+
+def generic_son_to_dict(doc_dict: dict) -> dict:
+    # What son_to_dict did before: isinstance checks on every value
+    for key, value in doc_dict.items():
+        doc_dict[key] = Transaction._convert_value(value)
+    return doc_dict
+
+
+def generic_to_dict(transaction: Transaction) -> dict:
+    return generic_son_to_dict(transaction.to_mongo().to_dict())
+
+
+def build_transactions(count: int) -> List[Transaction]:
+    user_id, wallet_id, category_id, currency_id = (ObjectId() for _ in range(4))
+    start = datetime.now(timezone.utc)
+    return [
+        Transaction(
+            id=ObjectId(),
+            user_id=user_id,
+            from_wallet_id=wallet_id,
+            category_id=category_id,
+            currency_id=currency_id,
+            type=T.EXPENSE.value,
+            amount=Decimal(i % 1000) + Decimal("0.25"),
+            date=start - timedelta(minutes=i),
+            description=f"Transaction {i}",
+        )
+        for i in range(count)
+    ]
+
+
+def measure(name: str, call: Callable[[], list], rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<22} {best * 1000:9.2f} ms")
+    return best
+
+
+def main(count: int, rounds: int) -> None:
+    transactions = build_transactions(count)
+    sons = [transaction.to_mongo().to_dict() for transaction in transactions]
+
+    assert [generic_son_to_dict(dict(son)) for son in sons] == [
+        Transaction.son_to_dict(son) for son in sons
+    ]
+
+    print(f"{count} transactions, best of {rounds} rounds")
+    before = measure(
+        "generic son_to_dict",
+        lambda: [generic_son_to_dict(dict(son)) for son in sons],
+        rounds,
+    )
+    after = measure(
+        "per-model son_to_dict",
+        lambda: [Transaction.son_to_dict(son) for son in sons],
+        rounds,
+    )
+    print(f"{'speedup':<22} {before / after:9.2f}x")
+
+    before = measure(
+        "generic to_dict",
+        lambda: [generic_to_dict(transaction) for transaction in transactions],
+        rounds,
+    )
+    after = measure(
+        "per-model to_dict",
+        lambda: [transaction.to_dict() for transaction in transactions],
+        rounds,
+    )
+    print(f"{'speedup':<22} {before / after:9.2f}x")
+
+    # Read path of the list endpoints: documents built from the raw dicts and
+    # serialized, against the raw dicts serialized directly (as_pymongo())
+    before = measure(
+        "document read path",
+        lambda: [Transaction._from_son(son).to_dict() for son in sons],
+        rounds,
+    )
+    after = measure(
+        "raw read path",
+        lambda: [Transaction.son_to_dict(son) for son in sons],
+        rounds,
+    )
+    print(f"{'speedup':<22} {before / after:9.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    main(args.count, args.rounds)
@@ -0,0 +1,133 @@
+"""
+Measure wallet creation with 1, 10 and 100 balances.
+
+Reports the mean latency and the number of database commands issued per
+created wallet. Temporary crypto currencies (with an exchange rate from the
+user's base currency) are created for the run and removed afterwards.
+
+Usage:
+    python -m tests.performance.wallet_creation_benchmark --username <user> \
+        --rounds 20
+"""
+
+import argparse
+import asyncio
+import time
+from decimal import Decimal
+from typing import List
+
+from pymongo import monitoring
+
+from app.api.controllers.wallet_controller import WalletController
+from app.crud.user_app_data_crud import UserAppDataCRUD
+from app.crud.user_crud import UserCRUD
+from database.database import db_connector
+from models.models import Currency, CurrencyExchange, User, Wallet
+from models.schemas import WalletCreateSchema
+
+BALANCE_COUNTS = (1, 10, 100)
+CURRENCY_CODE_PREFIX = "BNCH"
+WALLET_NAME_PREFIX = "Benchmark wallet"
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def create_currencies(user: User, base_currency_id, count: int) -> List[Currency]:
+    currencies = []
+    for i in range(count):
+        currency = Currency(
+            code=f"{CURRENCY_CODE_PREFIX}{i:03d}",
+            name=f"Benchmark currency {i}",
+            symbol=f"B{i:03d}",
+            currency_type="crypto",
+            user_id=user.id,
+        ).save()
+        CurrencyExchange(
+            user_id=user.id,
+            from_currency_id=base_currency_id,
+            to_currency_id=currency.id,
+            rate=Decimal("2.0"),
+        ).save()
+        currencies.append(currency)
+    return currencies
+
+
+def remove_benchmark_data(user: User) -> None:
+    Wallet.objects(user_id=user.id, name__startswith=WALLET_NAME_PREFIX).delete()
+    currencies = Currency.objects(
+        user_id=user.id, code__startswith=CURRENCY_CODE_PREFIX
+    )
+    CurrencyExchange.objects(
+        user_id=user.id, to_currency_id__in=[currency.id for currency in currencies]
+    ).delete()
+    currencies.delete()
+
+
+async def measure(
+    user: User,
+    currencies: List[Currency],
+    balance_count: int,
+    rounds: int,
+    counter: CommandCounter,
+) -> None:
+    balances = [
+        {"currency_id": str(currency.id), "amount": "10.00"}
+        for currency in currencies[:balance_count]
+    ]
+    elapsed = 0.0
+    commands = 0
+    for i in range(rounds):
+        wallet_schema = WalletCreateSchema(
+            name=f"{WALLET_NAME_PREFIX} {balance_count}-{i}",
+            type="crypto",
+            balances_ids=balances,
+        )
+        commands_before = counter.count
+        start = time.perf_counter()
+        wallet = await WalletController.create_wallet(wallet_schema, user)
+        elapsed += time.perf_counter() - start
+        commands += counter.count - commands_before
+        await WalletController.delete_wallet(wallet["_id"], user)
+
+    print(
+        f"{balance_count:>3} balances  {elapsed / rounds * 1000:8.2f} ms/wallet  "
+        f"{commands / rounds:6.1f} commands/wallet"
+    )
+
+
+async def main(username: str, rounds: int) -> None:
+    # Listeners must be registered before the clients are created
+    counter = CommandCounter()
+    monitoring.register(counter)
+
+    await db_connector.connect()
+    user = await UserCRUD.get_one_by_username(username)
+    base_currency_id = await UserAppDataCRUD.get_base_currency_id_by_user_id(user.id)
+    remove_benchmark_data(user)
+    try:
+        currencies = create_currencies(user, base_currency_id, max(BALANCE_COUNTS))
+        for balance_count in BALANCE_COUNTS:
+            await measure(user, currencies, balance_count, rounds, counter)
+    finally:
+        remove_benchmark_data(user)
+        await db_connector.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.username, args.rounds))